@@ -166,10 +166,12 @@ def main():
     print(f"\n🔐 Encrypting {len(sensitive_found)} sensitive variables...")
     encrypted_vars = env_vars.copy()
     
+    # Shared salt: the consumer then derives a single key at startup for all of them
+    salt = os.urandom(16)
     for key in sensitive_found:
         try:
             print(f"   Encrypting {key}...")
-            encrypted_value = secret_manager.encrypt_secret(env_vars[key])
+            encrypted_value = secret_manager.encrypt_secret(env_vars[key], salt)
             encrypted_vars[key] = encrypted_value
         except Exception as e:
             print(f"❌ Failed to encrypt {key}: {e}")
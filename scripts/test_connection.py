@@ -62,14 +62,14 @@ async def test_connection():
         if eth_positions:
             print("   🎯 ETH Positions:")
             for pos in eth_positions:
-                print(f"      {pos.symbol}: {pos.size} ({pos.side.value})")
+                print(f"      {pos.symbol}: {pos.size} ({pos.side})")
                 print(f"      Entry: ${pos.entry_price}, Current: ${pos.current_price}")
                 print(f"      PnL: ${pos.unrealized_pnl}")
         
         if all_positions:
             print("   📊 All Positions:")
             for pos in all_positions:
-                print(f"      {pos.symbol}: {pos.size} ({pos.side.value})")
+                print(f"      {pos.symbol}: {pos.size} ({pos.side})")
         
         if not all_positions:
             print("   📈 No active positions")
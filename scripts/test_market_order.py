@@ -108,7 +108,7 @@ async def test_market_order(execute_real_trade=False):
             if eth_position:
                 print(f"✅ Position opened:")
                 print(f"   Size: {eth_position.size} ETH")
-                print(f"   Side: {eth_position.side.value}")
+                print(f"   Side: {eth_position.side}")
                 print(f"   Entry Price: ${eth_position.entry_price}")
                 print(f"   Current Price: ${eth_position.current_price}")
                 print(f"   Unrealized PnL: ${eth_position.unrealized_pnl}")
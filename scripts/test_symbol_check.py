@@ -18,7 +18,7 @@ from trading_consumer.trading import HyperliquidExchange
 async def check_symbol_exists(exchange, symbol):
     """Check if a symbol exists on Hyperliquid."""
     try:
-        markets = exchange.exchange.load_markets()
+        markets = await exchange.exchange.load_markets()
         
         # Extract symbols (remove /USDC:USDC suffix)
         available_symbols = set()
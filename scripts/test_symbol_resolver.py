@@ -32,7 +32,7 @@ async def test_hyperliquid_markets():
         
         # Get raw markets
         print("\n📊 Loading raw markets...")
-        markets = exchange.exchange.load_markets()
+        markets = await exchange.exchange.load_markets()
         print(f"✅ Found {len(markets)} total markets")
         
         # Show sample markets
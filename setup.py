@@ -16,9 +16,12 @@ setup(
         "asyncio-mqtt>=0.13.0",
         "aiofiles>=23.0.0",
         "httpx>=0.25.0",
-        "tenacity>=8.0.0",
     ],
     extras_require={
+        "speedups": [
+            "orjson>=3.9.0",
+            "pycryptodome>=3.19.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",
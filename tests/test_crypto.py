@@ -0,0 +1,129 @@
+"""
+Unit tests for secret encryption formats and format detection.
+"""
+
+import base64
+import hashlib
+import os
+
+import pytest
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import padding
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from trading_consumer.utils import crypto
+from trading_consumer.utils.crypto import SecretManager
+
+
+def make_manager(**kwargs) -> SecretManager:
+    """SecretManager with a fixed password and a fast KDF."""
+    return SecretManager("test-password", kdf_iterations=1000, **kwargs)
+
+
+def legacy_key(salt: bytes) -> bytes:
+    """The PBKDF2 key make_manager() derives for ``salt``."""
+    return hashlib.pbkdf2_hmac("sha256", b"test-password", salt, 1000, dklen=32)
+
+
+def test_gcm_round_trip_and_layout():
+    manager = make_manager()
+    token = manager.encrypt_secret("0xdeadbeef")
+
+    assert token.startswith("~")
+    combined = base64.b64decode(token[1:])
+    # salt + nonce + ciphertext + tag
+    assert len(combined) == 16 + 12 + len("0xdeadbeef") + 16
+    assert manager.is_encrypted(token)
+    assert manager.decrypt_secret(token) == "0xdeadbeef"
+    # A fresh manager (no cached keys) decrypts it too
+    assert make_manager().decrypt_secret(token) == "0xdeadbeef"
+
+
+def test_gcm_rejects_tampered_token_and_wrong_password():
+    token = make_manager().encrypt_secret("secret")
+    combined = bytearray(base64.b64decode(token[1:]))
+    combined[-1] ^= 1
+    tampered = "~" + base64.b64encode(bytes(combined)).decode()
+
+    with pytest.raises(ValueError):
+        make_manager().decrypt_secret(tampered)
+    with pytest.raises(ValueError):
+        SecretManager("other-password", kdf_iterations=1000).decrypt_secret(token)
+
+
+def test_batch_shares_salt_and_key_derivation():
+    manager = make_manager()
+    tokens = manager.encrypt_batch(["a", "b", "a"])
+
+    salts = {base64.b64decode(t[1:])[:16] for t in tokens}
+    nonces = {base64.b64decode(t[1:])[16:28] for t in tokens}
+    assert len(salts) == 1
+    assert len(nonces) == 3  # Same salt, but a fresh nonce per value
+    assert len(manager._derived_keys) == 1
+
+    fresh = make_manager()
+    assert fresh.decrypt_batch(tokens) == ["a", "b", "a"]
+    assert len(fresh._derived_keys) == 1
+
+
+def test_legacy_cbc_value_decrypts():
+    salt, iv = os.urandom(16), os.urandom(16)
+    padder = padding.PKCS7(128).padder()
+    padded = padder.update(b"legacy-cbc-secret") + padder.finalize()
+    encryptor = Cipher(algorithms.AES(legacy_key(salt)), modes.CBC(iv)).encryptor()
+    value = base64.b64encode(salt + iv + encryptor.update(padded) + encryptor.finalize()).decode()
+
+    manager = make_manager()
+    assert manager.is_encrypted(value)
+    assert manager.decrypt_secret(value) == "legacy-cbc-secret"
+    with pytest.raises(ValueError):
+        SecretManager("other-password", kdf_iterations=1000).decrypt_secret(value)
+
+
+def test_legacy_fernet_value_decrypts():
+    salt = os.urandom(16)
+    token = Fernet(base64.urlsafe_b64encode(legacy_key(salt))).encrypt(b"legacy-fernet-secret")
+    value = base64.b64encode(salt).decode() + ":" + base64.b64encode(token).decode()
+
+    manager = make_manager()
+    assert manager.is_encrypted(value)
+    assert manager.decrypt_secret(value) == "legacy-fernet-secret"
+    # use_aes256=False still writes the same format
+    fernet_manager = make_manager(use_aes256=False)
+    written = fernet_manager.encrypt_secret("x")
+    assert written[24] == ":"
+    assert manager.decrypt_secret(written) == "x"
+
+
+def test_format_check_is_not_memoized():
+    """Plaintext secrets passed to is_encrypted must not be retained in a cache."""
+    manager = make_manager()
+    assert not manager.is_encrypted("plaintext-private-key")
+    assert not hasattr(crypto._looks_encrypted, "cache_info")
+
+
+def test_tilde_prefixed_plaintext_is_encrypted_by_config_dict():
+    """A long plaintext that starts with '~' is not mistaken for a GCM token."""
+    manager = make_manager()
+    plaintext = "~" + "not base64 at all! " * 4
+    assert len(plaintext) >= 61
+    assert not manager.is_encrypted(plaintext)
+
+    result = manager.encrypt_config_dict({"api_key": plaintext}, ["api_key"])
+    assert result["api_key"] != plaintext
+    assert manager.decrypt_secret(result["api_key"]) == plaintext
+
+
+def test_config_dict_leaves_gcm_tokens_alone():
+    """Values that already parse as GCM tokens are not encrypted twice."""
+    manager = make_manager()
+    token = manager.encrypt_secret("secret")
+
+    result = manager.encrypt_config_dict({"api_key": token}, ["api_key"])
+    assert result["api_key"] == token
+
+
+def test_truncated_gcm_token_is_not_encrypted():
+    """A '~' value too short to hold salt, nonce and tag fails the GCM check."""
+    assert not crypto._is_gcm_token("~" + "A" * 40)
+    assert crypto._is_gcm_token("~" + "A" * 60)
@@ -0,0 +1,342 @@
+"""
+Unit tests for HyperliquidExchange logic that runs against a stubbed ccxt client.
+"""
+
+import asyncio
+import time
+
+import aiohttp
+import pytest
+import pytest_asyncio
+
+from trading_consumer.models.config import HyperliquidConfig
+from trading_consumer.models.trading import OrderStatus
+from trading_consumer.trading import HyperliquidExchange
+
+
+class FakeCcxt:
+    """Minimal stand-in for the ccxt Hyperliquid client; records every call."""
+
+    def __init__(self):
+        self.has = {}
+        self.calls = []
+        self.order_status = "open"
+        self.positions = []
+        self.closed = False
+
+    async def fetch_order(self, order_id, symbol, params=None):
+        self.calls.append(("fetch_order", order_id))
+        return {"id": order_id, "status": self.order_status}
+
+    async def fetch_positions(self, symbols=None, params=None):
+        self.calls.append(("fetch_positions", tuple(symbols or ())))
+        await asyncio.sleep(0.01)  # Lets concurrent callers pile up on one request
+        return [p for p in self.positions if symbols is None or p["symbol"] in symbols]
+
+    async def fetch_ticker(self, symbol):
+        self.calls.append(("fetch_ticker", symbol))
+        await asyncio.sleep(0.01)
+        return {"symbol": symbol, "info": {"midPx": "100.5"}, "last": 100.0}
+
+    async def close(self):
+        self.closed = True
+
+    def count(self, name):
+        return sum(1 for call in self.calls if call[0] == name)
+
+
+def make_exchange(fake: FakeCcxt) -> HyperliquidExchange:
+    config = HyperliquidConfig(wallet_address="0x" + "1" * 40, private_key="0x" + "2" * 64)
+    exchange = HyperliquidExchange(config)
+    exchange.exchange = fake
+    exchange._connected = True
+    return exchange
+
+
+@pytest_asyncio.fixture
+async def fake():
+    return FakeCcxt()
+
+
+@pytest_asyncio.fixture
+async def exchange(fake):
+    exchange = make_exchange(fake)
+    yield exchange
+    await exchange.close()
+
+
+@pytest.mark.asyncio
+async def test_fill_detected_from_positions_before_fetch_order_reports_it(exchange, fake):
+    """A market fill that fetch_order still reports as open is picked up from positions."""
+    fake.positions = [{"symbol": "BTC/USDC:USDC", "contracts": 0.5, "side": "long"}]
+
+    started = time.monotonic()
+    assert await exchange.wait_for_order_fill("1", "BTC", timeout_seconds=10) is True
+    # Well under the timeout: detected once the poll backoff reaches its cap
+    assert time.monotonic() - started < 3
+    assert fake.count("fetch_positions") >= 1
+
+
+@pytest.mark.asyncio
+async def test_fill_reported_by_fetch_order_skips_position_check(exchange, fake):
+    fake.order_status = "closed"
+
+    assert await exchange.wait_for_order_fill("1", "BTC", timeout_seconds=5) is True
+    assert fake.count("fetch_positions") == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_order_stops_waiting(exchange, fake):
+    fake.order_status = "canceled"
+
+    assert await exchange.wait_for_order_fill("1", "BTC", timeout_seconds=5) is False
+
+
+@pytest.mark.asyncio
+async def test_close_releases_client_and_owned_session(exchange, fake):
+    session = aiohttp.ClientSession()
+    exchange._session = session
+
+    await exchange.close()
+    assert fake.closed
+    assert session.closed
+    assert exchange._session is None
+    assert not exchange._connected
+
+
+@pytest.mark.asyncio
+async def test_positions_are_shared_between_concurrent_callers_and_cached(exchange, fake):
+    fake.positions = [{"symbol": "BTC/USDC:USDC", "contracts": 1}]
+
+    results = await asyncio.gather(*(exchange._get_symbol_positions("BTC/USDC:USDC") for _ in range(5)))
+    assert all(r == fake.positions for r in results)
+    assert fake.count("fetch_positions") == 1
+
+    # Served from the cache within POSITIONS_TTL
+    await exchange._get_symbol_positions("BTC/USDC:USDC")
+    assert fake.count("fetch_positions") == 1
+
+    # Other markets are fetched independently
+    assert await exchange._get_symbol_positions("ETH/USDC:USDC") == []
+    assert fake.count("fetch_positions") == 2
+
+
+@pytest.mark.asyncio
+async def test_positions_cache_expires_and_is_invalidated(exchange, fake):
+    exchange.POSITIONS_TTL = 0.02
+    await exchange._get_symbol_positions("BTC/USDC:USDC")
+    await asyncio.sleep(0.03)
+    await exchange._get_symbol_positions("BTC/USDC:USDC")
+    assert fake.count("fetch_positions") == 2
+
+    exchange._invalidate_positions("BTC/USDC:USDC")
+    await exchange._get_symbol_positions("BTC/USDC:USDC")
+    assert fake.count("fetch_positions") == 3
+
+
+@pytest.mark.asyncio
+async def test_quotes_are_shared_between_concurrent_callers_and_cached(exchange, fake):
+    quotes = await asyncio.gather(*(exchange._get_quote("BTC/USDC:USDC") for _ in range(5)))
+    assert {exchange._mid_from_quote("BTC/USDC:USDC", q) for q in quotes} == {100.5}
+    assert fake.count("fetch_ticker") == 1
+
+    await exchange._get_quote("BTC/USDC:USDC")
+    assert fake.count("fetch_ticker") == 1
+
+    exchange.QUOTE_TTL = 0
+    await exchange._get_quote("BTC/USDC:USDC")
+    assert fake.count("fetch_ticker") == 2
+
+
+def test_mid_from_quote_falls_back_to_last_trade():
+    assert HyperliquidExchange._mid_from_quote("X", {"info": None, "last": 3.5}) == 3.5
+    with pytest.raises(ValueError):
+        HyperliquidExchange._mid_from_quote("X", {"info": {}})
+
+
+@pytest.mark.asyncio
+async def test_order_status_is_served_from_cache_within_ttl(exchange, fake):
+    assert await exchange.get_order_status("7", "BTC") == OrderStatus.OPEN
+    assert await exchange.get_order_status("7", "BTC") == OrderStatus.OPEN
+    assert fake.count("fetch_order") == 1
+
+    # The REST path always asks the exchange, and refreshes the cache
+    fake.order_status = "closed"
+    assert await exchange._fetch_order_status("7", "BTC") == OrderStatus.FILLED
+    assert await exchange.get_order_status("7", "BTC") == OrderStatus.FILLED
+    assert fake.count("fetch_order") == 2
+
+
+def test_order_status_cache_prunes_stale_entries(exchange):
+    stale = time.monotonic() - 120
+    exchange._order_status_cache.update({str(i): (OrderStatus.OPEN, stale) for i in range(300)})
+
+    exchange._remember_order_status("fresh", OrderStatus.FILLED)
+    assert list(exchange._order_status_cache) == ["fresh"]
+
+
+class WatchingFakeCcxt(FakeCcxt):
+    """Stub client that pushes order updates like ccxt.pro's watch_orders."""
+
+    def __init__(self, updates):
+        super().__init__()
+        self.has = {"watchOrders": True}
+        self._updates = list(updates)
+
+    async def watch_orders(self, symbol=None, params=None):
+        self.calls.append(("watch_orders", symbol))
+        if not self._updates:
+            await asyncio.sleep(60)
+        update = self._updates.pop(0)
+        if isinstance(update, Exception):
+            raise update
+        return update
+
+
+@pytest.mark.asyncio
+async def test_pushed_fill_ends_the_wait_without_polling():
+    fake = WatchingFakeCcxt([[{"id": "other", "status": "closed"}], [{"id": "1", "status": "closed"}]])
+    exchange = make_exchange(fake)
+    exchange._watch_orders = True
+
+    assert await exchange.wait_for_order_fill("1", "BTC", timeout_seconds=5) is True
+    assert fake.count("fetch_order") == 1  # Only the initial REST check
+    assert exchange._order_status_cache["1"][0] == OrderStatus.FILLED
+
+
+@pytest.mark.asyncio
+async def test_watch_failure_falls_back_to_polling():
+    fake = WatchingFakeCcxt([RuntimeError("socket closed")])
+    exchange = make_exchange(fake)
+    exchange._watch_orders = True
+
+    async def fill_later():
+        await asyncio.sleep(0.1)
+        fake.order_status = "closed"
+
+    filler = asyncio.create_task(fill_later())
+    assert await exchange.wait_for_order_fill("1", "BTC", timeout_seconds=5) is True
+    await filler
+    assert exchange._watch_orders is False
+    assert fake.count("fetch_order") >= 2
+
+
+def test_rate_limiter_gates_requests_and_observes_responses(exchange, fake):
+    seen = []
+    fake.on_rest_response = lambda code, *args: seen.append(code) or "body"
+
+    exchange._install_rate_limiter()
+    assert fake.throttle is exchange._limiter
+    assert fake.on_rest_response(429, "reason") == "body"
+    assert seen == [429]
+    assert exchange._limiter.successive_errors == 1
+
+
+class StopLossFakeCcxt(FakeCcxt):
+    """Stub client with the order endpoints used by the stop-loss updates."""
+
+    def __init__(self, batch=True):
+        super().__init__()
+        self.has = {"createOrders": batch}
+        self.open_orders = []
+        self.batch_result = None
+        self.batch_error = None
+        self._next_id = 0
+
+    def _order_id(self):
+        self._next_id += 1
+        return f"sl-{self._next_id}"
+
+    async def fetch_open_orders(self, symbol=None):
+        self.calls.append(("fetch_open_orders", symbol))
+        return [o for o in self.open_orders if symbol is None or o["symbol"] == symbol]
+
+    async def cancel_order(self, order_id, symbol=None):
+        self.calls.append(("cancel_order", order_id))
+
+    async def create_order(self, symbol, type, side, amount, price=None, params=None):
+        self.calls.append(("create_order", (symbol, side, amount, params["stopPrice"])))
+        return {"id": self._order_id()}
+
+    async def create_orders(self, orders):
+        self.calls.append(("create_orders", [(o["symbol"], o["side"], o["amount"], o["params"]["stopPrice"]) for o in orders]))
+        if self.batch_error:
+            raise self.batch_error
+        if self.batch_result is not None:
+            return self.batch_result
+        return [{"id": self._order_id()} for _ in orders]
+
+    def args(self, name):
+        return [call[1] for call in self.calls if call[0] == name]
+
+
+def make_sl_exchange(batch=True):
+    fake = StopLossFakeCcxt(batch)
+    fake.positions = [
+        {"symbol": "BTC/USDC:USDC", "contracts": 0.5, "side": "long"},
+        {"symbol": "ETH/USDC:USDC", "contracts": -2, "side": "short"},
+    ]
+    fake.open_orders = [
+        {"id": "old-btc", "symbol": "BTC/USDC:USDC", "info": {"reduceOnly": True, "stopPrice": "90"}},
+        {"id": "tp-btc", "symbol": "BTC/USDC:USDC", "info": {"reduceOnly": True, "takeProfitPrice": "150"}},
+    ]
+    return make_exchange(fake), fake
+
+
+@pytest.mark.asyncio
+async def test_bulk_stop_loss_update_batches_cancels_and_creates():
+    exchange, fake = make_sl_exchange()
+
+    results = await exchange.bulk_update_stop_loss({"BTC": 95.0, "ETH": 3500.0})
+    assert results == {"BTC": True, "ETH": True}
+    assert fake.args("cancel_order") == ["old-btc"]
+    assert fake.args("create_orders") == [[
+        ("BTC/USDC:USDC", "sell", 0.5, 95.0),
+        ("ETH/USDC:USDC", "buy", 2, 3500.0),
+    ]]
+    assert fake.count("fetch_positions") == 1
+    assert fake.count("create_order") == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_stop_loss_retries_rejected_legs_one_by_one():
+    exchange, fake = make_sl_exchange()
+    fake.batch_result = [{"id": "sl-batch"}, {"id": None}]
+
+    results = await exchange.bulk_update_stop_loss({"BTC": 95.0, "ETH": 3500.0})
+    assert results == {"BTC": True, "ETH": True}
+    assert fake.args("create_order") == [("ETH/USDC:USDC", "buy", 2, 3500.0)]
+
+
+@pytest.mark.asyncio
+async def test_bulk_stop_loss_falls_back_per_symbol_when_the_batch_fails():
+    exchange, fake = make_sl_exchange()
+    fake.batch_error = RuntimeError("batch endpoint down")
+
+    results = await exchange.bulk_update_stop_loss({"BTC": 95.0, "ETH": 3500.0})
+    assert results == {"BTC": True, "ETH": True}
+    assert sorted(fake.args("create_order")) == [
+        ("BTC/USDC:USDC", "sell", 0.5, 95.0),
+        ("ETH/USDC:USDC", "buy", 2, 3500.0),
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch, updates", [(False, {"BTC": 95.0, "ETH": 3500.0}), (True, {"BTC": 95.0})])
+async def test_bulk_stop_loss_uses_single_updates_without_a_batch(batch, updates):
+    exchange, fake = make_sl_exchange(batch)
+
+    results = await exchange.bulk_update_stop_loss(updates)
+    assert results == {symbol: True for symbol in updates}
+    assert fake.count("create_orders") == 0
+    assert fake.count("create_order") == len(updates)
+    assert fake.args("cancel_order") == ["old-btc"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_stop_loss_skips_symbols_without_a_position():
+    exchange, fake = make_sl_exchange()
+
+    results = await exchange.bulk_update_stop_loss({"BTC": 95.0, "SOL": 150.0})
+    assert results == {"BTC": True, "SOL": False}
+    assert fake.args("create_orders") == [[("BTC/USDC:USDC", "sell", 0.5, 95.0)]]
@@ -0,0 +1,125 @@
+"""
+Unit tests for the TradingConsumer signal pipeline.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from loguru import logger
+
+from trading_consumer import main
+from trading_consumer.main import TradingConsumer
+from trading_consumer.models.trading import TradingSignal
+
+
+def make_signal(symbol: str = "BTC", signal_type: str = "buy") -> TradingSignal:
+    return TradingSignal(signal_type=signal_type, symbol=symbol, source_message=f"{signal_type} {symbol}")
+
+
+def make_consumer(queue_size: int = 8) -> TradingConsumer:
+    consumer = TradingConsumer()
+    consumer.config = SimpleNamespace(trading=SimpleNamespace(trailing_stop_enabled=False))
+    consumer._signal_q = asyncio.Queue(maxsize=queue_size)
+    return consumer
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_newest_signal_and_keeps_queued_ones():
+    consumer = make_consumer(queue_size=2)
+    assert consumer._enqueue_signal(make_signal("BTC"))
+    assert consumer._enqueue_signal(make_signal("ETH"))
+    assert not consumer._enqueue_signal(make_signal("SOL"))
+
+    queued = [consumer._signal_q.get_nowait().symbol for _ in range(consumer._signal_q.qsize())]
+    assert queued == ["BTC", "ETH"]
+
+
+@pytest.mark.asyncio
+async def test_signal_worker_executes_queued_signals_in_order():
+    consumer = make_consumer()
+    executed = []
+
+    async def fake_execute(signal):
+        executed.append(signal.symbol)
+        if signal.symbol == "ETH":
+            raise RuntimeError("exchange down")
+
+    consumer._execute_signal = fake_execute
+    for symbol in ("BTC", "ETH", "SOL"):
+        consumer._enqueue_signal(make_signal(symbol))
+
+    worker = asyncio.create_task(consumer._signal_worker())
+    try:
+        # A failing signal must not stall the queue
+        await asyncio.wait_for(consumer._signal_q.join(), timeout=1)
+    finally:
+        worker.cancel()
+        await asyncio.gather(worker, return_exceptions=True)
+    assert executed == ["BTC", "ETH", "SOL"]
+
+
+@pytest.mark.asyncio
+async def test_symbol_locks_serialize_and_are_pruned_when_idle():
+    consumer = make_consumer()
+    running = {"BTC": 0}
+    overlapped = []
+
+    async def fake_execute_locked(signal):
+        running["BTC"] += 1
+        overlapped.append(running["BTC"] > 1)
+        await asyncio.sleep(0.01)
+        signal.symbol = "KBTC"  # Symbol resolution may rewrite the signal
+        running["BTC"] -= 1
+
+    consumer._execute_signal_locked = fake_execute_locked
+    await asyncio.gather(*(consumer._execute_signal(make_signal("BTC")) for _ in range(3)))
+
+    assert overlapped == [False, False, False]
+    assert consumer._symbol_locks == {}
+    assert not consumer._symbol_lock_users
+
+
+def test_span_records_latency_even_on_error_and_summarizes_periodically():
+    records = []
+    sink_id = logger.add(lambda message: records.append(message.record), level="INFO")
+    try:
+        with pytest.raises(RuntimeError):
+            with main._span("test_stage_error"):
+                raise RuntimeError("boom")
+        assert len(main._span_samples["test_stage_error"]) == 1
+
+        for _ in range(main._SPAN_SUMMARY_EVERY):
+            with main._span("test_stage"):
+                pass
+    finally:
+        logger.remove(sink_id)
+        main._span_samples.pop("test_stage_error", None)
+
+    summaries = [r["message"] for r in records if "test_stage latency over" in r["message"]]
+    assert len(summaries) == 1
+    assert f"over {main._SPAN_SUMMARY_EVERY} calls" in summaries[0]
+    assert main._span_samples["test_stage"] == []
+
+
+@pytest.mark.asyncio
+async def test_stop_shuts_trailing_down_before_closing_the_exchange():
+    consumer = make_consumer()
+    consumer._signal_q = None
+    order = []
+
+    class Recorder:
+        def __init__(self, name):
+            self.name = name
+
+        async def stop(self):
+            order.append(self.name)
+
+        async def close(self):
+            order.append(self.name)
+
+    consumer._trailing_service = Recorder("trailing")
+    consumer.exchange = Recorder("exchange")
+
+    await consumer.stop()
+    assert order == ["trailing", "exchange"]
@@ -0,0 +1,71 @@
+"""
+Unit tests for trading models.
+"""
+
+import pytest
+
+from trading_consumer.models.trading import SignalMetadata, TradingSignal
+
+
+def make_metadata(**overrides) -> SignalMetadata:
+    values = dict(
+        sender="trader",
+        chat_id=-100,
+        message_id=1,
+        timestamp=0.0,
+        source="telegram",
+        original_symbol="BTC",
+    )
+    values.update(overrides)
+    return SignalMetadata(**values)
+
+
+def test_signal_metadata_is_slotted():
+    metadata = make_metadata()
+    assert not hasattr(metadata, "__dict__")
+    with pytest.raises(AttributeError):
+        metadata.unknown_field = 1
+
+
+def test_signal_metadata_defaults_are_per_instance():
+    first, second = make_metadata(), make_metadata(trade_type="swing")
+    first.target_price.append(1.0)
+    assert second.target_price == []
+    assert first.trade_type is None and second.trade_type == "swing"
+    assert first.symbol_needs_resolution is True
+
+
+def test_trading_signal_accepts_signal_metadata():
+    signal = TradingSignal(
+        signal_type="buy", symbol="btc", source_message="buy btc", metadata=make_metadata(),
+    )
+    assert signal.metadata.original_symbol == "BTC"
+
+
+def test_set_metadata_on_every_lazy_metadata_model():
+    """Every model using the mixin must accept set_metadata (i.e. is not frozen)."""
+    from trading_consumer.models.trading import TradeOrder, _LazyMetadata
+
+    factories = {
+        TradeOrder: lambda: TradeOrder(symbol="BTC", side="buy", quantity=1.0),
+    }
+    assert set(_LazyMetadata.__subclasses__()) == set(factories)
+
+    for make in factories.values():
+        model = make()
+        assert model.metadata is None
+        assert dict(model.metadata_or_empty) == {}
+        model.set_metadata("error", "boom")
+        model.set_metadata("attempt", 2)
+        assert model.metadata == {"error": "boom", "attempt": 2}
+
+
+def test_position_is_frozen_without_lazy_metadata():
+    from pydantic import ValidationError
+    from trading_consumer.models.trading import Position, _LazyMetadata
+
+    position = Position(symbol="BTC", side="long", size=1.0, entry_price=100.0, metadata={"raw": 1})
+    assert not isinstance(position, _LazyMetadata)
+    assert position.metadata == {"raw": 1}
+    with pytest.raises(ValidationError):
+        position.metadata = {}
@@ -0,0 +1,34 @@
+"""
+Unit tests for the PatternMatcher utility.
+"""
+
+import pytest
+from loguru import logger
+
+from trading_consumer.parsers.pattern_matcher import PatternMatcher
+
+
+@pytest.fixture
+def log_records():
+    records = []
+    sink_id = logger.add(lambda message: records.append(message.record), level="DEBUG")
+    yield records
+    logger.remove(sink_id)
+
+
+def test_invalid_pattern_is_skipped_and_logged_once_per_lookup(log_records):
+    matcher = PatternMatcher()
+    assert matcher.find_first_match("long BTC at 100", ["(unclosed", r"at (\d+)"]) == "100"
+    assert matcher.find_matches("tp 1 tp 2", ["(unclosed", r"tp (\d)"]) == ["1", "2"]
+
+    messages = [r["message"] for r in log_records if r["level"].name in ("WARNING", "ERROR")]
+    assert len(messages) == 2
+    assert all("(unclosed" in m for m in messages)
+
+
+def test_lookups_reuse_compiled_patterns():
+    matcher = PatternMatcher()
+    matcher.find_first_match("buy ETH", [r"buy (\w+)"])
+    compiled = matcher._compiled_patterns[r"buy (\w+)"]
+    assert matcher.find_matches("buy SOL", [r"buy (\w+)"]) == ["SOL"]
+    assert matcher._compiled_patterns[r"buy (\w+)"] is compiled
@@ -0,0 +1,52 @@
+"""
+Unit tests for the adaptive REST rate limiter.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from trading_consumer.trading.rate_limiter import AdaptiveRateLimiter
+
+
+def test_throttling_responses_widen_the_gap_up_to_the_cap():
+    limiter = AdaptiveRateLimiter(0.1, max_interval=0.3)
+    limiter.record(429)
+    assert limiter.interval == pytest.approx(0.2)
+    limiter.record(429)
+    limiter.record(429)
+    assert limiter.interval == pytest.approx(0.3)
+    assert limiter.successive_errors == 3
+
+
+def test_successes_relax_the_gap_back_to_the_minimum():
+    limiter = AdaptiveRateLimiter(0.1, max_interval=1.0, recover_after=3)
+    limiter.record(429)
+    limiter.record(429)
+    assert limiter.interval == pytest.approx(0.4)
+
+    for _ in range(2):
+        limiter.record(200)
+    assert limiter.interval == pytest.approx(0.4)  # Not enough successes yet
+    limiter.record(200)
+    assert limiter.interval == pytest.approx(0.2)
+    assert limiter.successive_errors == 0
+
+    for _ in range(9):
+        limiter.record(200)
+    assert limiter.interval == pytest.approx(0.1)
+
+
+@pytest.mark.asyncio
+async def test_throttle_spaces_requests_by_interval_and_cost():
+    limiter = AdaptiveRateLimiter(0.02)
+    started = time.monotonic()
+    await asyncio.gather(*(limiter() for _ in range(4)))
+    # Slots at 0, 20, 40 and 60ms: the last caller waits for three gaps
+    assert time.monotonic() - started >= 0.055
+
+    await limiter.throttle(cost=3)
+    started = time.monotonic()
+    await limiter.throttle()
+    assert time.monotonic() - started >= 0.055
@@ -0,0 +1,48 @@
+"""
+Unit tests for the Telegram client message dispatcher.
+"""
+
+import asyncio
+
+import pytest
+
+from trading_consumer.models.config import TelegramConfig
+from trading_consumer.telegram import TelegramClient
+
+
+def make_client(callback) -> TelegramClient:
+    client = TelegramClient(TelegramConfig(bot_token="123:abc", chat_ids=[-100]))
+    client.message_callback = callback
+    client._inbox = asyncio.Queue(maxsize=client.INBOX_SIZE)
+    client._dispatcher = asyncio.create_task(client._dispatch_messages())
+    return client
+
+
+@pytest.mark.asyncio
+async def test_stop_dispatches_accepted_messages_before_cancelling():
+    delivered = []
+
+    async def slow_callback(message):
+        await asyncio.sleep(0.005)
+        delivered.append(message)
+
+    client = make_client(slow_callback)
+    for i in range(20):
+        client._inbox.put_nowait(i)
+
+    await client.stop()
+    assert delivered == list(range(20))
+    assert client._dispatcher is None
+
+
+@pytest.mark.asyncio
+async def test_stop_gives_up_on_a_stuck_callback_after_drain_timeout():
+    async def stuck_callback(message):
+        await asyncio.sleep(60)
+
+    client = make_client(stuck_callback)
+    client.DRAIN_TIMEOUT = 0.05
+    client._inbox.put_nowait("message")
+
+    await asyncio.wait_for(client.stop(), timeout=2)
+    assert client._dispatcher is None
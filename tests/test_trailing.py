@@ -0,0 +1,245 @@
+"""
+Unit tests for the trailing stop service.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from trading_consumer.models.config import TradingConfig
+from trading_consumer.models.trading import Position
+from trading_consumer.utils.trailing import (
+    TrailingState, TrailingStopService, _compute_desired_sl, _scan_stops,
+)
+
+
+class FakeExchange:
+    """Stand-in for HyperliquidExchange covering the calls the service makes."""
+
+    def __init__(self, positions=(), open_orders=(), bulk_result=None):
+        self.positions = list(positions)
+        self.open_orders = list(open_orders)
+        self.bulk_result = bulk_result
+        self.bulk_calls = []
+        self.calls = []
+        self.can_stream_prices = False
+        self.price_updates = []
+        self.positions_delay = 0.0
+        self.bulk_delay = 0.0
+        self.bulk_done = []
+        self.position_fetches = []
+
+    async def get_positions(self):
+        self.calls.append("get_positions")
+        self.position_fetches.append(time.monotonic())
+        await asyncio.sleep(self.positions_delay)
+        return self.positions
+
+    async def get_open_orders(self, symbol=None):
+        self.calls.append("get_open_orders")
+        return self.open_orders
+
+    async def watch_mid_prices(self, symbols):
+        self.calls.append("watch_mid_prices")
+        update = self.price_updates.pop(0) if self.price_updates else RuntimeError("stream closed")
+        if isinstance(update, Exception):
+            raise update
+        return update
+
+    async def bulk_update_stop_loss(self, updates):
+        self.bulk_calls.append(dict(updates))
+        await asyncio.sleep(self.bulk_delay)
+        self.bulk_done.append(dict(updates))
+        if isinstance(self.bulk_result, Exception):
+            raise self.bulk_result
+        if self.bulk_result is not None:
+            return self.bulk_result
+        return {symbol: True for symbol in updates}
+
+
+def make_position(symbol="BTC", side="long", entry=100.0, current=None):
+    return Position(symbol=symbol, side=side, size=1.0, entry_price=entry, current_price=current)
+
+
+def make_service(exchange, **overrides) -> TrailingStopService:
+    config = TradingConfig()
+    for name, value in overrides.items():
+        setattr(config, name, value)
+    return TrailingStopService(exchange, config)
+
+
+def test_trailing_state_is_slotted():
+    state = TrailingState(highest_price=1.0, lowest_price=1.0)
+    assert not hasattr(state, "__dict__")
+    with pytest.raises(AttributeError):
+        state.extreme = 1.0
+
+
+def test_scan_stops_last_sl_and_first_tp_win():
+    orders = [
+        {"info": {"stopPrice": "95.5", "takeProfitPrice": "120"}},
+        {"info": {}},
+        {"info": {"triggerPx": "1"}},
+        {"info": {"stopLossPrice": 97, "takeProfitPrice": "125"}},
+        {"info": None},
+    ]
+    assert _scan_stops(orders) == (97.0, 120.0)
+
+
+def test_scan_stops_handles_missing_and_malformed_values():
+    assert _scan_stops(None) == (None, None)
+    assert _scan_stops([{"info": {"stopPrice": "n/a", "takeProfitPrice": ""}}]) == (None, None)
+
+
+@pytest.mark.asyncio
+async def test_sl_updates_are_batched_and_outcomes_recorded_per_symbol():
+    exchange = FakeExchange(bulk_result={"BTC": True, "ETH": False})
+    service = make_service(exchange)
+    service._last_sl = {"BTC": (90.0, 150.0, time.monotonic()), "ETH": (3600.0, None, time.monotonic())}
+
+    await service._apply_sl_updates({"BTC": 95.0, "ETH": 3500.0})
+    assert exchange.bulk_calls == [{"BTC": 95.0, "ETH": 3500.0}]
+    # The new SL is remembered with the known TP; a failed symbol is rescanned next time
+    assert service._last_sl["BTC"][:2] == (95.0, 150.0)
+    assert "ETH" not in service._last_sl
+
+
+@pytest.mark.asyncio
+async def test_failed_sl_batch_forgets_every_symbol():
+    exchange = FakeExchange(bulk_result=RuntimeError("exchange down"))
+    service = make_service(exchange)
+    service._last_sl = {"BTC": (90.0, None, time.monotonic())}
+
+    await service._apply_sl_updates({"BTC": 95.0})
+    assert service._last_sl == {}
+
+
+@pytest.mark.asyncio
+async def test_tick_pushes_all_due_stops_in_one_batch():
+    exchange = FakeExchange(positions=[
+        make_position("BTC", "long", entry=100.0, current=110.0),
+        make_position("ETH", "short", entry=100.0, current=90.0),
+        make_position("SOL", "long", entry=100.0, current=100.5),  # Not activated yet
+    ])
+    service = make_service(exchange)
+
+    await service._tick()
+    assert len(exchange.bulk_calls) == 1
+    assert exchange.bulk_calls[0] == pytest.approx({"BTC": 110.0 * 0.995, "ETH": 90.0 * 1.005})
+    # Open orders were read once for every symbol, not once per position
+    assert exchange.calls.count("get_open_orders") == 1
+
+
+@pytest.mark.parametrize("is_long, current, extreme, expected", [
+    # Long: below activation (entry +2%) there is no SL yet, but the high still moves
+    (True, 101.0, 100.0, (101.0, 102.0, None)),
+    # Long: activated, trailing 0.5% under the highest price seen
+    (True, 110.0, 108.0, (110.0, 102.0, 110.0 * 0.995)),
+    # Long: a pullback keeps the earlier high
+    (True, 105.0, 110.0, (110.0, 102.0, 110.0 * 0.995)),
+    # Short: mirror image around the lowest price
+    (False, 99.0, 100.0, (99.0, 98.0, None)),
+    (False, 90.0, 92.0, (90.0, 98.0, 90.0 * 1.005)),
+    (False, 95.0, 90.0, (90.0, 98.0, 90.0 * 1.005)),
+])
+def test_compute_desired_sl(is_long, current, extreme, expected):
+    result = _compute_desired_sl(is_long, 100.0, current, extreme, 0.02, 0.005)
+    assert result[:2] == pytest.approx(expected[:2])
+    if expected[2] is None:
+        assert result[2] is None
+    else:
+        assert result[2] == pytest.approx(expected[2])
+
+
+def test_compute_desired_sl_activates_exactly_at_threshold():
+    assert _compute_desired_sl(True, 100.0, 102.0, 102.0, 0.02, 0.005)[2] == pytest.approx(101.49)
+    assert _compute_desired_sl(False, 100.0, 98.0, 98.0, 0.02, 0.005)[2] == pytest.approx(98.49)
+
+
+@pytest.mark.asyncio
+async def test_streamed_prices_only_move_stops_when_the_extreme_advances():
+    exchange = FakeExchange()
+    exchange.price_updates = [{"BTC": 109.0}, {"BTC": 112.0, "ETH": 1.0}]
+    service = make_service(exchange)
+    service._running = True
+    service._streaming = True
+    service._positions = {"BTC": make_position("BTC", "long", entry=100.0)}
+    service._state["BTC"] = TrailingState(highest_price=110.0, lowest_price=100.0)
+
+    # Runs until the fake stream fails after its two updates
+    await asyncio.wait_for(service._stream_prices(), timeout=1)
+    assert exchange.bulk_calls == [pytest.approx({"BTC": 112.0 * 0.995})]
+    assert service._state["BTC"].highest_price == 112.0
+    assert service._streaming is False
+
+
+@pytest.mark.asyncio
+async def test_streaming_service_polls_at_the_reconcile_interval():
+    exchange = FakeExchange()
+    exchange.can_stream_prices = True
+    service = make_service(exchange, trailing_check_interval_seconds=0.01)
+    service.RECONCILE_INTERVAL = 0.2
+
+    service.start()
+    try:
+        assert service._stream_task is not None
+        await asyncio.sleep(0.1)
+        # One tick at start, then waiting out the reconcile interval
+        assert exchange.calls.count("get_positions") == 1
+    finally:
+        await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_stalled_ticks_get_one_catch_up_then_a_full_interval():
+    exchange = FakeExchange()
+    exchange.positions_delay = 0.08  # Every tick overruns the interval
+    service = make_service(exchange, trailing_check_interval_seconds=0.05)
+
+    service.start()
+    try:
+        await asyncio.sleep(0.4)
+    finally:
+        await service.stop()
+
+    starts = exchange.position_fetches
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert len(gaps) >= 2
+    # First overrun: the catch-up tick starts as soon as the slow one ends
+    assert gaps[0] < 0.08 + 0.03
+    # Still stalled: rest a full interval before the next tick
+    assert all(gap >= 0.08 + 0.05 - 0.01 for gap in gaps[1:])
+
+
+@pytest.mark.asyncio
+async def test_position_change_wakes_the_loop_early():
+    exchange = FakeExchange()
+    service = make_service(exchange, trailing_check_interval_seconds=60)
+
+    service.start()
+    try:
+        await asyncio.sleep(0.02)
+        assert exchange.calls.count("get_positions") == 1
+        service.notify_position_change()
+        await asyncio.sleep(0.02)
+        assert exchange.calls.count("get_positions") == 2
+    finally:
+        await service.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_lets_a_started_sl_update_finish():
+    exchange = FakeExchange()
+    exchange.bulk_delay = 0.05
+    service = make_service(exchange)
+    service._running = True
+    service._task = asyncio.create_task(service._process([("BTC", 95.0, True, 100.0)], {}))
+    while not exchange.bulk_calls:
+        await asyncio.sleep(0)
+
+    await service.stop()
+    # Stopped mid-batch, but the new stops were still placed before stop() returned
+    assert exchange.bulk_done == [{"BTC": 95.0}]
+    assert service._last_sl["BTC"][0] == 95.0
+    assert service._sl_update is None
@@ -3,10 +3,14 @@ Main entry point for the trading consumer - Production Pipeline.
 """
 
 import asyncio
+import contextlib
+import functools
 import signal
 import sys
+import time
+from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Dict
 # Removed Decimal import - using float throughout
 from loguru import logger
 
@@ -15,16 +19,68 @@ from .telegram import TelegramClient
 from .parsers import SignalParser
 from .trading import HyperliquidExchange
 from .models.telegram import TelegramMessage
-from .models.trading import TradingSignal, TradeOrder, OrderType, SignalType, OrderStatus
+from .models.trading import TradingSignal, TradeOrder, OrderType, SignalType, SignalTypeLit, OrderStatus
 from .utils.symbol_resolver import resolve_symbol_for_trading
-from decimal import Decimal
 from .utils import TrailingStopService
 
 
+# Signal types that open a position on each side
+_BUY = frozenset({SignalType.BUY, SignalType.LONG})
+_SELL = frozenset({SignalType.SELL, SignalType.SHORT})
+
+# Stage latency tracing. Signal execution is I/O bound (Hyperliquid and Telegram
+# round-trips dominate), so these spans - not CPU profiling - should decide where
+# concurrency and caching work pays off.
+_SPAN_SUMMARY_EVERY = 20  # Log a latency summary after this many calls per stage
+_span_samples: Dict[str, List[float]] = defaultdict(list)
+
+
+@contextlib.contextmanager
+def _span(name: str):
+    """Time a pipeline stage and periodically log its latency distribution."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.debug("⏱️ {} took {:.1f}ms", name, elapsed_ms)
+        samples = _span_samples[name]
+        samples.append(elapsed_ms)
+        if len(samples) >= _SPAN_SUMMARY_EVERY:
+            samples.sort()
+            logger.info(
+                "⏱️ {} latency over {} calls: p50={:.1f}ms p90={:.1f}ms max={:.1f}ms",
+                name, len(samples), samples[len(samples) // 2],
+                samples[int(len(samples) * 0.9)], samples[-1],
+            )
+            samples.clear()
+
+
+# Owner notification templates, filled with str.format_map
+_SIGNAL_HEADER = "📊 <b>Signal Received</b>"
+_SUCCESS_TMPL = (
+    "✅ <b>Trade Executed</b>\n\n"
+    "🎯 <b>Signal:</b> {sig} {sym}\n"
+    "📈 <b>Confidence:</b> {confidence:.2f}\n"
+    "💰 <b>Order ID:</b> {order_id}\n"
+    "📊 <b>Status:</b> {status}\n"
+    "💵 <b>Entry Price:</b> ${entry:.4f}\n"
+    "🎯 <b>Take Profit:</b> ${tp:.4f}\n"
+    "🛑 <b>Stop Loss:</b> ${sl:.4f}\n"
+    "⚡ <b>Leverage:</b> {leverage}x"
+)
+_FAILURE_TMPL = (
+    "❌ <b>Trade Failed</b>\n\n"
+    "🎯 <b>Signal:</b> {sig} {sym}\n"
+    "📈 <b>Confidence:</b> {confidence:.2f}\n"
+    "💥 <b>Error:</b> {error}"
+)
+
+
 class RecentTrade:
     """Recent trade data for deduplication."""
     
-    def __init__(self, symbol: str, signal_type: SignalType, entry_price: Optional[float], 
+    def __init__(self, symbol: str, signal_type: SignalTypeLit, entry_price: Optional[float], 
                  leverage: Optional[int], timestamp: datetime):
         self.symbol = symbol
         self.signal_type = signal_type
@@ -36,6 +92,8 @@ class RecentTrade:
 class TradingConsumer:
     """Main trading consumer application - Production Pipeline."""
     
+    SIGNAL_QUEUE_SIZE = 256  # Max signals waiting for an execution worker
+    
     def __init__(self):
         """Initialize trading consumer."""
         self.config = None
@@ -46,6 +104,18 @@ class TradingConsumer:
         self._recent_trades: List[RecentTrade] = []  # Track recent trades for deduplication
         self._trade_dedupe_window = timedelta(minutes=10)  # 10 minute window
         self._trailing_service: Optional[TrailingStopService] = None
+        self._signal_q: Optional[asyncio.Queue] = None  # Parsed signals awaiting execution
+        self._workers: List[asyncio.Task] = []
+        self._symbol_locks: Dict[str, asyncio.Lock] = {}  # Serialize signals per symbol
+        self._symbol_lock_users: Dict[str, int] = defaultdict(int)  # Holders + waiters per lock
+        # Signal type → execution coroutine
+        buy = functools.partial(self._execute_directional_signal, side=SignalType.BUY, direction=1)
+        sell = functools.partial(self._execute_directional_signal, side=SignalType.SELL, direction=-1)
+        self._dispatch = {
+            **{t: buy for t in _BUY},
+            **{t: sell for t in _SELL},
+            SignalType.CLOSE: self._execute_close_signal,
+        }
     
     async def initialize(self) -> None:
         """Initialize all components."""
@@ -69,6 +139,13 @@ class TradingConsumer:
             if self.config.trading.trailing_stop_enabled:
                 self._trailing_service.start()
             
+            # Start signal execution workers so Telegram intake never waits on the exchange
+            self._signal_q = asyncio.Queue(maxsize=self.SIGNAL_QUEUE_SIZE)
+            self._workers = [
+                asyncio.create_task(self._signal_worker())
+                for _ in range(self.config.trading.executor_concurrency)
+            ]
+            
             logger.info("🚀 Trading Consumer Production Pipeline Initialized")
             logger.info(
                 f"📊 Default Settings: {self.config.trading.default_leverage}x leverage, "
@@ -137,12 +214,22 @@ class TradingConsumer:
         if self.telegram_client:
             await self.telegram_client.stop()
         
-        if self.exchange:
-            await self.exchange.close()
+        # Let queued signals finish before tearing down the exchange
+        if self._signal_q:
+            await self._signal_q.join()
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
         
+        # Trailing ticks use the exchange, so they must be done before it is closed
         if self._trailing_service:
             await self._trailing_service.stop()
         
+        if self.exchange:
+            await self.exchange.close()
+        
         logger.info("✅ Trading consumer stopped")
     
     def _setup_signal_handlers(self) -> None:
@@ -157,11 +244,11 @@ class TradingConsumer:
     async def _handle_message(self, message: TelegramMessage) -> None:
         """Handle incoming Telegram message."""
         try:
-            user_info = ""
-            if message.from_user:
-                user_info = f" (User ID: {message.from_user.id})"
-            
-            logger.info(f"📨 Processing message from {message.sender_name}{user_info}")
+            logger.opt(lazy=True).info(
+                "📨 Processing message from {}{}",
+                lambda: message.sender_name,
+                lambda: f" (User ID: {message.from_user.id})" if message.from_user else "",
+            )
             
             # Parse message for trading signals
             signal = self.signal_parser.parse_message(message)
@@ -180,20 +267,48 @@ class TradingConsumer:
                 logger.info(f"🚀 Bypassing confidence filter for chat {bypass_chat_id}")
             elif signal.confidence < self.config.trading.min_confidence:
                 logger.info(
-                    f"⚠️ Signal confidence {signal.confidence:.2f} below threshold "
-                    f"{self.config.trading.min_confidence:.2f}, skipping"
+                    "⚠️ Signal confidence {:.2f} below threshold {:.2f}, skipping",
+                    signal.confidence, self.config.trading.min_confidence
                 )
                 return
             
-            # Execute trade
-            await self._execute_signal(signal)
-            # Ensure trailing service is running
-            if self._trailing_service and self.config.trading.trailing_stop_enabled:
-                self._trailing_service.start()
+            # Hand off to the execution workers
+            self._enqueue_signal(signal)
             
         except Exception as e:
             logger.error(f"❌ Error handling message: {e}")
-            
+    
+    def _enqueue_signal(self, signal: TradingSignal) -> bool:
+        """Queue a signal for execution.
+
+        Signals already queued are never discarded; if the queue is full the new signal
+        is rejected and logged as an error instead.
+        """
+        try:
+            self._signal_q.put_nowait(signal)
+        except asyncio.QueueFull:
+            logger.error(
+                f"❌ Signal queue full ({self._signal_q.qsize()} pending), rejecting signal: "
+                f"{signal.signal_type} {signal.symbol}"
+            )
+            return False
+        return True
+    
+    async def _signal_worker(self) -> None:
+        """Drain the signal queue, executing one signal at a time."""
+        while True:
+            signal = await self._signal_q.get()
+            try:
+                await self._execute_signal(signal)
+                # Ensure trailing service is running, and let it pick up the new position now
+                if self._trailing_service and self.config.trading.trailing_stop_enabled:
+                    self._trailing_service.start()
+                    self._trailing_service.notify_position_change()
+            except Exception as e:
+                logger.error(f"❌ Error in signal worker: {e}")
+            finally:
+                self._signal_q.task_done()
+    
     def _cleanup_old_trades(self) -> None:
         """Remove trades older than the deduplication window."""
         cutoff_time = datetime.now() - self._trade_dedupe_window
@@ -223,7 +338,7 @@ class TradingConsumer:
                 if price_match and leverage_match:
                     time_diff = datetime.now() - recent_trade.timestamp
                     logger.info(
-                        f"⚠️ Duplicate trade detected: {signal.symbol} {signal.signal_type.value} "
+                        f"⚠️ Duplicate trade detected: {signal.symbol} {signal.signal_type} "
                         f"(last trade {time_diff.total_seconds():.0f}s ago)"
                     )
                     return True
@@ -240,14 +355,34 @@ class TradingConsumer:
             timestamp=datetime.now()
         )
         self._recent_trades.append(trade)
-        logger.debug(f"📝 Recorded trade: {signal.symbol} {signal.signal_type.value}")
+        logger.debug(f"📝 Recorded trade: {signal.symbol} {signal.signal_type}")
 
     async def _execute_signal(self, signal: TradingSignal) -> None:
+        """Execute trading signal, serialized against other signals for the same symbol.
+
+        A symbol's lock is dropped once no signal holds or waits on it, so the lock table
+        only ever covers symbols currently being executed.
+        """
+        symbol = signal.symbol  # Execution may rewrite signal.symbol to the resolved symbol
+        lock = self._symbol_locks.get(symbol)
+        if lock is None:
+            lock = self._symbol_locks[symbol] = asyncio.Lock()
+        self._symbol_lock_users[symbol] += 1
+        try:
+            async with lock:
+                await self._execute_signal_locked(signal)
+        finally:
+            self._symbol_lock_users[symbol] -= 1
+            if not self._symbol_lock_users[symbol]:
+                del self._symbol_lock_users[symbol]
+                del self._symbol_locks[symbol]
+    
+    async def _execute_signal_locked(self, signal: TradingSignal) -> None:
         """Execute trading signal - Full Production Implementation."""
         try:
             conviction_info = f", conviction: {signal.trader_conviction}" if signal.trader_conviction else ""
             logger.info(
-                f"🎯 Executing Signal: {signal.signal_type.value} {signal.symbol} "
+                f"🎯 Executing Signal: {signal.signal_type} {signal.symbol} "
                 f"(confidence: {signal.confidence:.2f}{conviction_info})"
             )
             
@@ -261,7 +396,7 @@ class TradingConsumer:
             
             # Resolve symbol if needed
             resolved_symbol = signal.symbol
-            if signal.metadata.get("symbol_needs_resolution", False):
+            if getattr(signal.metadata, "symbol_needs_resolution", False):
                 logger.info(f"🔍 Resolving symbol: {signal.symbol}")
                 resolved_symbol = await resolve_symbol_for_trading(
                     signal.symbol, self.exchange.exchange
@@ -308,12 +443,9 @@ class TradingConsumer:
             self._record_trade(signal)
             
             # Handle different signal types
-            if signal.signal_type in [SignalType.BUY, SignalType.LONG]:
-                await self._execute_buy_signal(signal)
-            elif signal.signal_type in [SignalType.SELL, SignalType.SHORT]:
-                await self._execute_sell_signal(signal)
-            elif signal.signal_type == SignalType.CLOSE:
-                await self._execute_close_signal(signal)
+            handler = self._dispatch.get(signal.signal_type)
+            if handler:
+                await handler(signal)
             else:
                 logger.warning(f"⚠️ Unknown signal type: {signal.signal_type}")
                 
@@ -322,13 +454,19 @@ class TradingConsumer:
             # Notify owner about execution error
             await self._notify_owner_trade_failed(signal, str(e))
     
-    async def _execute_buy_signal(self, signal: TradingSignal) -> None:
-        """Execute buy/long signal."""
+    async def _execute_directional_signal(self, signal: TradingSignal, side: SignalTypeLit, direction: int) -> None:
+        """Execute an opening signal.
+
+        ``direction`` is ``+1`` for BUY/LONG and ``-1`` for SELL/SHORT; it flips the
+        TP/SL offsets so both sides share the same ticker/leverage/order/TP-SL pipeline.
+        """
+        side_label = "BUY/LONG" if direction > 0 else "SELL/SHORT"
         try:
             symbol = signal.symbol
             
             # Get current price
-            ticker = await self.exchange.get_ticker(symbol)
+            with _span("get_ticker"):
+                ticker = await self.exchange.get_ticker(symbol)
             if not ticker:
                 logger.error(f"❌ Failed to get ticker for {symbol}")
                 return
@@ -349,11 +487,13 @@ class TradingConsumer:
             conviction_info = f" (conviction: {signal.trader_conviction})" if signal.trader_conviction else ""
             logger.info(f"💰 Position size: {quantity} {symbol} (~${usd_amount:.2f} USD{conviction_info})")
             
-            # Set leverage (use signal leverage or default)
+            # Set leverage (use signal leverage or default) only once the price is known, so an
+            # aborted trade never leaves the account's leverage changed
             leverage = signal.leverage if signal.leverage else self.config.trading.default_leverage
             logger.info(f"⚡ Setting {leverage}x leverage...")
             
-            leverage_set = await self.exchange.set_leverage(symbol, leverage, "cross")
+            with _span("set_leverage"):
+                leverage_set = await self.exchange.set_leverage(symbol, leverage, "cross")
             if not leverage_set:
                 logger.error(f"❌ Failed to set leverage for {symbol}")
                 return
@@ -366,44 +506,47 @@ class TradingConsumer:
                 # Both TP and SL provided in signal
                 tp_price = float(signal.take_profit)
                 sl_price = float(signal.stop_loss)
-                logger.info("🎯 Using TP/SL from signal")
+                logger.info(f"🎯 Using TP/SL from signal ({side_label})")
             elif signal.stop_loss and not signal.take_profit:
                 # Only SL provided - calculate TP as 2x SL percent based on CURRENT market price
                 sl_price = float(signal.stop_loss)
                 sl_percent = abs(sl_price - current_price) / current_price
                 tp_percent = sl_percent * 2
-                tp_price = current_price * (1 + tp_percent)  # TP above market for LONG
-                logger.info(f"🎯 Using SL from signal, calculated TP as 2x SL percentage from market ({tp_percent*100:.1f}%)")
+                tp_price = current_price * (1 + direction * tp_percent)  # TP on the profit side of market
+                logger.info(
+                    f"🎯 Using SL from signal, calculated TP as 2x SL percentage from market "
+                    f"({tp_percent*100:.1f}%) ({side_label})"
+                )
             elif signal.take_profit and not signal.stop_loss:
                 # Only TP provided - use default SL
                 tp_price = float(signal.take_profit)
-                sl_price = entry_price * (1 - self.config.trading.default_sl_percent)
-                logger.info("🎯 Using TP from signal, default SL")
+                sl_price = entry_price * (1 - direction * self.config.trading.default_sl_percent)
+                logger.info(f"🎯 Using TP from signal, default SL ({side_label})")
             else:
                 # Use default TP/SL percentages
-                tp_price = entry_price * (1 + self.config.trading.default_tp_percent)  # 5% profit
-                sl_price = entry_price * (1 - self.config.trading.default_sl_percent)  # 2% loss
-                logger.info("🎯 Using default TP/SL percentages")
+                tp_price = entry_price * (1 + direction * self.config.trading.default_tp_percent)
+                sl_price = entry_price * (1 - direction * self.config.trading.default_sl_percent)
+                logger.info(f"🎯 Using default TP/SL percentages ({side_label})")
             
-            logger.info("🎯 TP/SL Prices:")
+            logger.info(f"🎯 TP/SL Prices ({side_label}):")
             percent_base = entry_price
             if signal.stop_loss and not signal.take_profit:
                 percent_base = current_price  # ensure 2:1 asymmetry based on market as requested
             logger.info(
-                f"   📈 Take Profit: ${tp_price:,.2f} (+{((tp_price/percent_base)-1)*100:.1f}%)"
+                f"   📈 Take Profit: ${tp_price:,.2f} ({((tp_price/percent_base)-1)*100:+.1f}%)"
             )
             logger.info(
-                f"   📉 Stop Loss: ${sl_price:,.2f} ({((sl_price/percent_base)-1)*100:.1f}%)"
+                f"   📉 Stop Loss: ${sl_price:,.2f} ({((sl_price/percent_base)-1)*100:+.1f}%)"
             )
             
             # Determine order type based on execution_type & price difference
             use_limit_order = False
             order_price = None
             target_prices = []
-            exec_type = str(signal.metadata.get("execution_type") or "").lower()
+            exec_type = str(getattr(signal.metadata, "execution_type", None) or "").lower()
             if exec_type == "limit_order":
                 # Force LIMIT order(s) at target price(s)
-                raw_targets = signal.metadata.get("target_price")
+                raw_targets = getattr(signal.metadata, "target_price", None)
                 if isinstance(raw_targets, list):
                     target_prices = [float(p) for p in raw_targets if p is not None]
                 elif raw_targets is not None:
@@ -444,50 +587,51 @@ class TradingConsumer:
                 if target_prices:
                     # Split quantity equally across target prices
                     per_order_qty = round(quantity / len(target_prices), 6)
-                    results = []
                     for tp in target_prices:
-                        logger.info(f"🎯 Creating LIMIT BUY order @ ${tp:.3f} (qty {per_order_qty})...")
+                        logger.info(f"🎯 Creating LIMIT {side_label} order @ ${tp:.3f} (qty {per_order_qty})...")
                         order = TradeOrder(
                             symbol=symbol,
-                            side=SignalType.BUY,
+                            side=side,
                             order_type=OrderType.LIMIT,
                             quantity=per_order_qty,
-                            price=Decimal(str(tp)),
+                            price=tp,
                             leverage=leverage
                         )
-                        res = await self.exchange.create_order(order)
-                        results.append(res)
+                        with _span("create_order"):
+                            res = await self.exchange.create_order(order)
                         logger.info(f"✅ Limit order created: {res.id} @ ${tp:.3f}")
                     # For forced limit orders, skip immediate TP/SL (until fills happen)
                     logger.info("⏳ Skipping TP/SL creation until fills occur for forced limit orders")
                     return
                 else:
-                    logger.info(f"🎯 Creating LIMIT BUY order @ ${order_price:.3f}...")
+                    logger.info(f"🎯 Creating LIMIT {side_label} order @ ${order_price:.3f}...")
                     
                     order = TradeOrder(
                         symbol=symbol,
-                        side=SignalType.BUY,
+                        side=side,
                         order_type=OrderType.LIMIT,
                         quantity=quantity,
-                        price=Decimal(str(order_price)),
+                        price=order_price,
                         leverage=leverage
                     )
                     
-                    result = await self.exchange.create_order(order)
+                    with _span("create_order"):
+                        result = await self.exchange.create_order(order)
                     logger.info(f"✅ Limit order created: {result.id} @ ${order_price:.3f}")
                 
             else:
-                logger.info("🚀 Creating MARKET BUY order...")
+                logger.info(f"🚀 Creating MARKET {side_label} order...")
                 
                 order = TradeOrder(
                     symbol=symbol,
-                    side=SignalType.BUY,
+                    side=side,
                     order_type=OrderType.MARKET,
                     quantity=quantity,
                     leverage=leverage
                 )
                 
-                result = await self.exchange.create_order(order)
+                with _span("create_order"):
+                    result = await self.exchange.create_order(order)
                 logger.info(f"✅ Market order created: {result.id}")
             
             # Order execution successful - wait for fill and continue with TP/SL and notifications
@@ -498,7 +642,8 @@ class TradingConsumer:
                 # Wait for order to be filled before creating TP/SL orders
                 if result.status != OrderStatus.FILLED:
                     logger.info("⏳ Waiting for order to be filled...")
-                    order_filled = await self.exchange.wait_for_order_fill(result.id, symbol, timeout_seconds=30)
+                    with _span("wait_for_order_fill"):
+                        order_filled = await self.exchange.wait_for_order_fill(result.id, symbol, timeout_seconds=30)
                     
                     if not order_filled:
                         logger.error(f"❌ Order {result.id} was not filled within timeout")
@@ -510,229 +655,14 @@ class TradingConsumer:
                     logger.info("✅ Order already filled")
                 
                 # Create TP/SL orders after confirming order is filled
-                logger.info("🎯 Creating TP/SL orders...")
-                
-                tp_sl_orders = await self.exchange.create_tp_sl_orders(
-                    symbol=symbol,
-                    tp_price=tp_price,
-                    sl_price=sl_price
-                )
-                
-                if tp_sl_orders:
-                    logger.info(f"✅ Created {len(tp_sl_orders)} TP/SL orders:")
-                    for order in tp_sl_orders:
-                        logger.info(f"   Order {order['id']}: {order['side']} @ ${order.get('price', 'conditional')}")
-                else:
-                    logger.warning("⚠️ No TP/SL orders created")
-                
-                # Log trade summary
-                logger.info("📋 Trade Summary:")
-                logger.info(f"   Symbol: {symbol}")
-                logger.info("   Side: BUY/LONG")
-                logger.info(f"   Size: {quantity} {symbol}")
-                logger.info(f"   Entry: ${entry_price:,.2f}")
-                logger.info(f"   Leverage: {leverage}x")
-                logger.info(f"   TP: ${tp_price:,.2f}")
-                logger.info(f"   SL: ${sl_price:,.2f}")
-                
-                # Notify owner about successful trade
-                await self._notify_owner_trade_success(signal, result, tp_price, sl_price)
-                
-            else:
-                logger.error("❌ Failed to create market order")
-                await self._notify_owner_trade_failed(signal, "Failed to create market order")
+                logger.info(f"🎯 Creating TP/SL orders ({side_label})...")
                 
-        except Exception as e:
-            logger.error(f"❌ Error executing buy signal: {e}")
-            await self._notify_owner_trade_failed(signal, str(e))
-    
-    async def _execute_sell_signal(self, signal: TradingSignal) -> None:
-        """Execute sell/short signal."""
-        try:
-            symbol = signal.symbol
-            
-            # Get current price
-            ticker = await self.exchange.get_ticker(symbol)
-            if not ticker:
-                logger.error(f"❌ Failed to get ticker for {symbol}")
-                return
-            
-            current_price = float(ticker['mid_price'])
-            logger.info(f"📊 Current {symbol} price: ${current_price:,.2f}")
-            
-            # Calculate position size based on trader conviction
-            if signal.quantity:
-                quantity = float(signal.quantity)
-                usd_amount = quantity * current_price
-            else:
-                # Use conviction-based position sizing
-                usd_amount = self.config.trading.get_position_size_for_conviction(signal.trader_conviction)
-                quantity = round(usd_amount / current_price, 6)
-            
-            # Log position sizing with conviction info
-            conviction_info = f" (conviction: {signal.trader_conviction})" if signal.trader_conviction else ""
-            logger.info(f"💰 Position size: {quantity} {symbol} (~${usd_amount:.2f} USD{conviction_info})")
-            
-            # Set leverage (use signal leverage or default)
-            leverage = signal.leverage if signal.leverage else self.config.trading.default_leverage
-            logger.info(f"⚡ Setting {leverage}x leverage...")
-            
-            leverage_set = await self.exchange.set_leverage(symbol, leverage, "cross")
-            if not leverage_set:
-                logger.error(f"❌ Failed to set leverage for {symbol}")
-                return
-            
-            # Calculate TP/SL prices for SHORT using signal values if provided, otherwise defaults
-            entry_price = float(signal.price) if signal.price else current_price
-            
-            # Use signal TP/SL if provided (for SHORT positions)
-            if signal.take_profit and signal.stop_loss:
-                # Both TP and SL provided in signal
-                tp_price = float(signal.take_profit)
-                sl_price = float(signal.stop_loss)
-                logger.info("🎯 Using TP/SL from signal (SHORT)")
-            elif signal.stop_loss and not signal.take_profit:
-                # Only SL provided - calculate TP as 2x SL percent based on CURRENT market price (SHORT)
-                sl_price = float(signal.stop_loss)
-                sl_percent = abs(sl_price - current_price) / current_price
-                tp_percent = sl_percent * 2
-                tp_price = current_price * (1 - tp_percent)  # TP below market for SHORT
-                logger.info(f"🎯 Using SL from signal, calculated TP as 2x SL percentage from market ({tp_percent*100:.1f}%) (SHORT)")
-            elif signal.take_profit and not signal.stop_loss:
-                # Only TP provided - use default SL
-                tp_price = float(signal.take_profit)
-                sl_price = entry_price * (1 + self.config.trading.default_sl_percent)
-                logger.info("🎯 Using TP from signal, default SL (SHORT)")
-            else:
-                # Use default TP/SL percentages for SHORT positions
-                tp_price = entry_price * (1 - self.config.trading.default_tp_percent)  # 5% profit (price goes down)
-                sl_price = entry_price * (1 + self.config.trading.default_sl_percent)  # 2% loss (price goes up)
-                logger.info("🎯 Using default TP/SL percentages (SHORT)")
-            
-            logger.info("🎯 TP/SL Prices (SHORT):")
-            percent_base_short = entry_price
-            if signal.stop_loss and not signal.take_profit:
-                percent_base_short = current_price  # ensure 2:1 asymmetry based on market
-            logger.info(
-                f"   📈 Take Profit: ${tp_price:,.2f} ({((tp_price/percent_base_short)-1)*100:.1f}%)"
-            )
-            logger.info(
-                f"   📉 Stop Loss: ${sl_price:,.2f} (+{((sl_price/percent_base_short)-1)*100:.1f}%)"
-            )
-            
-            # Determine order type based on execution_type & price difference
-            use_limit_order = False
-            order_price = None
-            target_prices = []
-            exec_type = str(signal.metadata.get("execution_type") or "").lower()
-            logger.info(f"execution_type={exec_type}, targets={signal.metadata.get('target_price')}")
-            if exec_type == "limit_order":
-                raw_targets = signal.metadata.get("target_price")
-                if isinstance(raw_targets, list):
-                    target_prices = [float(p) for p in raw_targets if p is not None]
-                elif raw_targets is not None:
-                    target_prices = [float(raw_targets)]
-                if not target_prices and signal.price:
-                    target_prices = [float(signal.price)]
-                if target_prices:
-                    use_limit_order = True
-                    logger.info(f"🎯 Forcing LIMIT order(s) at target price(s): {target_prices}")
-                else:
-                    logger.info("⚠️ execution_type=limit_order but no target price provided; falling back to price logic")
-
-            if not use_limit_order:
-                if signal.price:
-                    signal_price = float(signal.price)
-                    price_diff_pct = abs(current_price - signal_price) / signal_price
-                    if price_diff_pct <= 0.05:
-                        logger.info(
-                            f"📊 Signal price ${signal_price:.3f} within 5% of market ${current_price:.3f} "
-                            f"({price_diff_pct*100:.1f}% diff) - using MARKET order"
-                        )
-                        use_limit_order = False
-                    else:
-                        logger.info(
-                            f"📊 Signal price ${signal_price:.3f} differs {price_diff_pct*100:.1f}% from market "
-                            f"${current_price:.3f} - using LIMIT order at signal price"
-                        )
-                        use_limit_order = True
-                        order_price = signal_price
-                else:
-                    logger.info("📊 No signal price provided - using MARKET order")
-                    use_limit_order = False
-            
-            # Create order based on price difference
-            if use_limit_order:
-                if target_prices:
-                    per_order_qty = round(quantity / len(target_prices), 6)
-                    for tp in target_prices:
-                        logger.info(f"🎯 Creating LIMIT SELL (SHORT) @ ${tp:.3f} (qty {per_order_qty})...")
-                        order = TradeOrder(
-                            symbol=symbol,
-                            side=SignalType.SELL,
-                            order_type=OrderType.LIMIT,
-                            quantity=per_order_qty,
-                            price=Decimal(str(tp)),
-                            leverage=leverage
-                        )
-                        res = await self.exchange.create_order(order)
-                        logger.info(f"✅ Limit order created: {res.id} @ ${tp:.3f}")
-                    logger.info("⏳ Skipping TP/SL creation until fills occur for forced limit orders")
-                    return
-                else:
-                    logger.info(f"🎯 Creating LIMIT SELL order (SHORT) @ ${order_price:.3f}...")
-                    order = TradeOrder(
+                with _span("create_tp_sl_orders"):
+                    tp_sl_orders = await self.exchange.create_tp_sl_orders(
                         symbol=symbol,
-                        side=SignalType.SELL,
-                        order_type=OrderType.LIMIT,
-                        quantity=quantity,
-                        price=Decimal(str(order_price)),
-                        leverage=leverage
+                        tp_price=tp_price,
+                        sl_price=sl_price
                     )
-                    result = await self.exchange.create_order(order)
-                    logger.info(f"✅ Limit order created: {result.id} @ ${order_price:.3f}")
-                
-            else:
-                logger.info("🚀 Creating MARKET SELL order (SHORT)...")
-                
-                order = TradeOrder(
-                    symbol=symbol,
-                    side=SignalType.SELL,
-                    order_type=OrderType.MARKET,
-                    quantity=quantity,
-                    leverage=leverage
-                )
-                
-                result = await self.exchange.create_order(order)
-                logger.info(f"✅ Market order created: {result.id}")
-            
-            if result and result.id:
-                logger.info(f"✅ Market order created: {result.id}")
-                logger.info(f"   Status: {result.status.value}")
-                logger.info(f"   Filled: {result.filled_quantity}")
-                
-                # Wait for order to be filled before creating TP/SL orders
-                if result.status != OrderStatus.FILLED:
-                    logger.info("⏳ Waiting for order to be filled...")
-                    order_filled = await self.exchange.wait_for_order_fill(result.id, symbol, timeout_seconds=30)
-                    
-                    if not order_filled:
-                        logger.error(f"❌ Order {result.id} was not filled within timeout")
-                        await self._notify_owner_trade_failed(signal, "Order was not filled within timeout")
-                        return
-                    else:
-                        logger.info(f"✅ Order {result.id} filled successfully")
-                else:
-                    logger.info("✅ Order already filled")
-                
-                # Create TP/SL orders for SHORT position after confirming order is filled
-                logger.info("🎯 Creating TP/SL orders for SHORT...")
-                
-                tp_sl_orders = await self.exchange.create_tp_sl_orders(
-                    symbol=symbol,
-                    tp_price=tp_price,
-                    sl_price=sl_price
-                )
                 
                 if tp_sl_orders:
                     logger.info(f"✅ Created {len(tp_sl_orders)} TP/SL orders:")
@@ -744,7 +674,7 @@ class TradingConsumer:
                 # Log trade summary
                 logger.info("📋 Trade Summary:")
                 logger.info(f"   Symbol: {symbol}")
-                logger.info("   Side: SELL/SHORT")
+                logger.info(f"   Side: {side_label}")
                 logger.info(f"   Size: {quantity} {symbol}")
                 logger.info(f"   Entry: ${entry_price:,.2f}")
                 logger.info(f"   Leverage: {leverage}x")
@@ -759,7 +689,7 @@ class TradingConsumer:
                 await self._notify_owner_trade_failed(signal, "Failed to create market order")
                 
         except Exception as e:
-            logger.error(f"❌ Error executing sell signal: {e}")
+            logger.error(f"❌ Error executing {side_label} signal: {e}")
             await self._notify_owner_trade_failed(signal, str(e))
     
     async def _execute_close_signal(self, signal: TradingSignal) -> None:
@@ -776,7 +706,7 @@ class TradingConsumer:
                 return
             
             position = positions[0]
-            logger.info(f"📊 Found position: {position.size} {symbol} ({position.side.value})")
+            logger.info(f"📊 Found position: {position.size} {symbol} ({position.side})")
             
             # Close the position
             close_result = await self.exchange.close_position(symbol)
@@ -804,36 +734,20 @@ class TradingConsumer:
             if not self.telegram_client:
                 return
             
-            # Format signal details
-            signal_details = [
-                "📊 <b>Signal Received</b>",
-                f"🎯 <b>Type:</b> {signal.signal_type.value}",
+            # Optional lines collapse to "" and are filtered out in a single join
+            parts = (
+                _SIGNAL_HEADER,
+                f"🎯 <b>Type:</b> {signal.signal_type}",
                 f"💰 <b>Symbol:</b> {signal.symbol}",
                 f"📈 <b>Confidence:</b> {signal.confidence:.2f}",
-            ]
-            
-            # Add trader conviction if available
-            if signal.trader_conviction:
-                signal_details.append(f"🎲 <b>Conviction:</b> {signal.trader_conviction}")
-            
-            # Add price details if available
-            if signal.price:
-                signal_details.append(f"💵 <b>Price:</b> ${signal.price:.4f}")
-            
-            if signal.leverage:
-                signal_details.append(f"⚡ <b>Leverage:</b> {signal.leverage}x")
-            
-            if signal.take_profit:
-                signal_details.append(f"🎯 <b>Take Profit:</b> ${signal.take_profit:.4f}")
-            
-            if signal.stop_loss:
-                signal_details.append(f"🛑 <b>Stop Loss:</b> ${signal.stop_loss:.4f}")
-            
-            # Add metadata
-            sender = signal.metadata.get("sender", "Unknown")
-            signal_details.append(f"👤 <b>From:</b> {sender}")
-            
-            message = "\n".join(signal_details)
+                f"🎲 <b>Conviction:</b> {signal.trader_conviction}" if signal.trader_conviction else "",
+                f"💵 <b>Price:</b> ${signal.price:.4f}" if signal.price else "",
+                f"⚡ <b>Leverage:</b> {signal.leverage}x" if signal.leverage else "",
+                f"🎯 <b>Take Profit:</b> ${signal.take_profit:.4f}" if signal.take_profit else "",
+                f"🛑 <b>Stop Loss:</b> ${signal.stop_loss:.4f}" if signal.stop_loss else "",
+                f"👤 <b>From:</b> {getattr(signal.metadata, 'sender', 'Unknown')}",
+            )
+            message = "\n".join(p for p in parts if p)
             
             await self.telegram_client.send_owner_notification(message)
             
@@ -858,12 +772,12 @@ class TradingConsumer:
                                   .replace('"', '&quot;')
                                   .replace("'", '&#x27;'))
             
-            message = (
-                f"❌ <b>Trade Failed</b>\n\n"
-                f"🎯 <b>Signal:</b> {signal.signal_type.value} {signal.symbol}\n"
-                f"📈 <b>Confidence:</b> {signal.confidence:.2f}\n"
-                f"💥 <b>Error:</b> {sanitized_error[:200]}..."
-            )
+            message = _FAILURE_TMPL.format_map({
+                'sig': signal.signal_type,
+                'sym': signal.symbol,
+                'confidence': signal.confidence,
+                'error': f"{sanitized_error[:200]}...",
+            })
             
             await self.telegram_client.send_owner_notification(message)
             
@@ -871,12 +785,12 @@ class TradingConsumer:
             logger.error(f"Failed to send failure notification: {e}")
             # Try sending a simple notification without the problematic error details
             try:
-                simple_message = (
-                    f"❌ <b>Trade Failed</b>\n\n"
-                    f"🎯 <b>Signal:</b> {signal.signal_type.value} {signal.symbol}\n"
-                    f"📈 <b>Confidence:</b> {signal.confidence:.2f}\n"
-                    f"💥 <b>Error:</b> Order execution failed (see logs for details)"
-                )
+                simple_message = _FAILURE_TMPL.format_map({
+                    'sig': signal.signal_type,
+                    'sym': signal.symbol,
+                    'confidence': signal.confidence,
+                    'error': "Order execution failed (see logs for details)",
+                })
                 await self.telegram_client.send_owner_notification(simple_message)
             except Exception as e2:
                 logger.error(f"Failed to send simple failure notification: {e2}")
@@ -890,17 +804,17 @@ class TradingConsumer:
             # Calculate entry price
             entry_price = float(signal.price) if signal.price else 0.0
             
-            message = (
-                f"✅ <b>Trade Executed</b>\n\n"
-                f"🎯 <b>Signal:</b> {signal.signal_type.value} {signal.symbol}\n"
-                f"📈 <b>Confidence:</b> {signal.confidence:.2f}\n"
-                f"💰 <b>Order ID:</b> {result.id}\n"
-                f"📊 <b>Status:</b> {result.status.value}\n"
-                f"💵 <b>Entry Price:</b> ${entry_price:.4f}\n"
-                f"🎯 <b>Take Profit:</b> ${tp_price:.4f}\n"
-                f"🛑 <b>Stop Loss:</b> ${sl_price:.4f}\n"
-                f"⚡ <b>Leverage:</b> {signal.leverage or 'Default'}x"
-            )
+            message = _SUCCESS_TMPL.format_map({
+                'sig': signal.signal_type,
+                'sym': signal.symbol,
+                'confidence': signal.confidence,
+                'order_id': result.id,
+                'status': result.status.value,
+                'entry': entry_price,
+                'tp': tp_price,
+                'sl': sl_price,
+                'leverage': signal.leverage or 'Default',
+            })
             
             await self.telegram_client.send_owner_notification(message)
             
@@ -3,7 +3,7 @@ Pydantic models for trading consumer.
 """
 
 from .telegram import TelegramMessage, TelegramUpdate
-from .trading import TradingSignal, TradeOrder, TradeResult, Position
+from .trading import TradingSignal, SignalMetadata, TradeOrder, TradeResult, Position
 from .config import TradingConfig, TelegramConfig, HyperliquidConfig
 
 __all__ = [
@@ -13,6 +13,7 @@ __all__ = [
     
     # Trading models
     "TradingSignal",
+    "SignalMetadata",
     "TradeOrder", 
     "TradeResult",
     "Position",
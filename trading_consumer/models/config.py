@@ -3,7 +3,15 @@ Configuration Pydantic models.
 """
 
 from typing import Optional, List
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+
+# Trader conviction synonym → TradingConfig position size field
+_CONVICTION_SIZE_FIELDS = {
+    **dict.fromkeys(('low', 'weak', 'small', 'light'), 'position_low'),
+    **dict.fromkeys(('medium', 'med', 'moderate', 'normal'), 'position_mid'),
+    **dict.fromkeys(('high', 'strong', 'large', 'heavy', 'confident'), 'position_high'),
+}
 
 
 class TelegramConfig(BaseModel):
@@ -45,6 +53,7 @@ class HyperliquidConfig(BaseModel):
     sandbox: bool = Field(default=False)
     timeout: int = Field(default=30, ge=5)
     rate_limit: int = Field(default=10, ge=1)  # requests per second
+    keep_raw_exchange_data: bool = Field(default=False)  # Attach raw ccxt payloads to orders/positions
     
     @field_validator('wallet_address', 'private_key')
     @classmethod
@@ -75,6 +84,7 @@ class TradingConfig(BaseModel):
     default_sl_percent: float = Field(default=0.02, gt=0, le=1)  # Default stop loss %
     max_leverage: int = Field(default=10, ge=1, le=100)
     min_confidence: float = Field(default=0.5, ge=0, le=1)
+    executor_concurrency: int = Field(default=4, ge=1)  # Parallel signal execution workers
     
     # Trailing stop configuration
     trailing_stop_enabled: bool = Field(default=True)
@@ -82,32 +92,25 @@ class TradingConfig(BaseModel):
     trailing_distance_percent: float = Field(default=0.005, gt=0, le=1)  # Keep SL at 0.5% distance from price
     trailing_update_step_percent: float = Field(default=0.002, gt=0, le=1)  # Only adjust if improves by >=0.2%
     trailing_check_interval_seconds: int = Field(default=15, ge=1)  # Polling interval
+    trailing_max_concurrency: int = Field(default=8, ge=1)  # Positions adjusted in parallel per tick
     
-    @field_validator('min_confidence')
-    @classmethod
-    def validate_percentages(cls, v):
-        """Validate percentage values."""
-        if not 0 < v <= 1:
+    @model_validator(mode='after')
+    def validate_percentages(self):
+        """Validate percentage values in a single pass after field parsing."""
+        if not 0 < self.min_confidence <= 1:
             raise ValueError("Percentages must be between 0 and 1")
-        return v
+        return self
     
     def get_position_size_for_conviction(self, trader_conviction: str) -> float:
         """Get position size based on trader conviction level."""
         if not trader_conviction:
             return self.default_position_size_usd
             
-        conviction_lower = trader_conviction.lower().strip()
-        
-        # Map conviction levels to position sizes
-        if conviction_lower in ['low', 'weak', 'small', 'light']:
-            return self.position_low
-        elif conviction_lower in ['medium', 'med', 'moderate', 'normal']:
-            return self.position_mid
-        elif conviction_lower in ['high', 'strong', 'large', 'heavy', 'confident']:
-            return self.position_high
-        else:
-            # Unknown conviction level, use default
+        # Map conviction levels to position sizes; unknown levels use the default
+        size_field = _CONVICTION_SIZE_FIELDS.get(trader_conviction.lower().strip())
+        if size_field is None:
             return self.default_position_size_usd
+        return getattr(self, size_field)
 
 
 class LoggingConfig(BaseModel):
@@ -16,6 +16,11 @@ class TelegramUser(BaseModel):
     last_name: Optional[str] = None
     username: Optional[str] = None
     language_code: Optional[str] = None
+    
+    model_config = {
+        "frozen": True,
+        "extra": "ignore"
+    }
 
 
 class TelegramChat(BaseModel):
@@ -27,6 +32,11 @@ class TelegramChat(BaseModel):
     username: Optional[str] = None
     first_name: Optional[str] = None
     last_name: Optional[str] = None
+    
+    model_config = {
+        "frozen": True,
+        "extra": "ignore"
+    }
 
 
 class TelegramMessage(BaseModel):
@@ -44,8 +54,9 @@ class TelegramMessage(BaseModel):
     edit_date: Optional[datetime] = None
     
     model_config = {
+        "frozen": True,
         "populate_by_name": True
-        }
+    }
     
     @property
     def content(self) -> str:
@@ -66,6 +77,11 @@ class TelegramMessage(BaseModel):
             name_parts.append(self.from_user.last_name)
         
         return " ".join(name_parts)
+    
+    @classmethod
+    def construct_trusted(cls, **data) -> "TelegramMessage":
+        """Build from already-validated internal data, skipping field validation."""
+        return cls.model_construct(**data)
 
 
 class TelegramUpdate(BaseModel):
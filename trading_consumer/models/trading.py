@@ -2,15 +2,47 @@
 Trading-related Pydantic models.
 """
 
-from datetime import datetime
-from decimal import Decimal
+import sys
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from decimal import Context, Decimal, ROUND_HALF_EVEN
 from enum import Enum
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, field_validator
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Literal, Mapping
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 
-class SignalType(str, Enum):
-    """Trading signal types."""
+def _utcnow() -> datetime:
+    """Timestamp factory for model defaults; only runs when the caller omits one."""
+    return datetime.now(timezone.utc)
+
+
+def with_slots(cls):
+    """Rebuild a dataclass with ``__slots__``, like ``@dataclass(slots=True)``.
+
+    The ``slots`` flag needs Python 3.10; this keeps 3.8/3.9 supported. Field
+    defaults already live in the generated ``__init__``, so the class-level
+    default attributes (which would clash with the slots) are dropped.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = {
+        key: value for key, value in cls.__dict__.items()
+        if key not in names and key not in ('__dict__', '__weakref__')
+    }
+    namespace['__slots__'] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+SignalTypeLit = Literal["buy", "sell", "long", "short", "close"]
+
+
+class SignalType:
+    """Trading signal types.
+    
+    Plain string constants rather than an Enum: model fields are typed as
+    ``SignalTypeLit`` so Pydantic only does a string-set membership check.
+    """
     BUY = "buy"
     SELL = "sell"
     LONG = "long"
@@ -36,21 +68,62 @@ class OrderStatus(str, Enum):
     REJECTED = "rejected"
 
 
+_LONG_SIDES = frozenset({SignalType.LONG, SignalType.BUY})
+_SHORT_SIDES = frozenset({SignalType.SHORT, SignalType.SELL})
+_ACTIVE_STATES = frozenset({OrderStatus.PENDING, OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED})
+_EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+
+class _LazyMetadata:
+    """Read/write helpers for a ``metadata`` dict that is only allocated when written."""
+    
+    @property
+    def metadata_or_empty(self) -> Mapping[str, Any]:
+        """Get metadata, or a shared read-only empty mapping if none was set."""
+        return self.metadata or _EMPTY_METADATA
+    
+    def set_metadata(self, key: str, value: Any) -> None:
+        """Set a metadata entry, creating the dict on first use."""
+        if self.metadata is None:
+            self.metadata = {}
+        self.metadata[key] = value
+
+
+@with_slots
+@dataclass
+class SignalMetadata:
+    """Parser context attached to a trading signal."""
+    
+    sender: str
+    chat_id: int
+    message_id: int
+    timestamp: float  # Message date as POSIX epoch seconds
+    source: str
+    original_symbol: str
+    trade_type: Optional[str] = None
+    asset_name: Optional[str] = None
+    symbol_needs_resolution: bool = True
+    close_percentage: Optional[float] = None
+    execution_type: Optional[str] = None
+    target_price: List[float] = field(default_factory=list)
+
+
 class TradingSignal(BaseModel):
     """Trading signal extracted from message."""
     
-    signal_type: SignalType
+    signal_type: SignalTypeLit
     symbol: str
-    price: Optional[Decimal] = None
-    quantity: Optional[Decimal] = None
-    stop_loss: Optional[Decimal] = None
-    take_profit: Optional[Decimal] = None
+    price: Optional[float] = None
+    quantity: Optional[float] = None
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
     leverage: Optional[int] = Field(None, ge=1, le=100)
     confidence: float = Field(0.0, ge=0.0, le=1.0)
     trader_conviction: Optional[str] = Field(None, description="Trader conviction level: low, medium, high, etc.")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    source_message: str
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    timestamp: datetime = Field(default_factory=_utcnow)
+    source_message: str  # Leading excerpt of the originating message
+    source_message_hash: Optional[str] = None  # blake2b-64 of the full message, for dedup/lookup
+    metadata: Optional[SignalMetadata] = None
     
     @field_validator('symbol')
     @classmethod
@@ -61,40 +134,45 @@ class TradingSignal(BaseModel):
         
         # If it's already properly formatted k-token (from resolver), leave it alone
         if v.startswith('k') and len(v) > 1 and v[1:].isupper():
-            return v
+            return sys.intern(v)
         
-        # Otherwise uppercase normal tokens
-        return v.upper()
+        # Otherwise uppercase normal tokens (interned: the same few symbols repeat)
+        return sys.intern(v.upper())
     
     @field_validator('price', 'stop_loss', 'take_profit')
     @classmethod
     def validate_positive_prices(cls, v):
         """Validate that prices are positive."""
-        if v is not None and v <= 0:
+        if v is not None and v <= 0.0:
             raise ValueError("Prices must be positive")
         return v
+    
+    @classmethod
+    def construct_trusted(cls, **data) -> "TradingSignal":
+        """Build from already-validated internal data, skipping field validation."""
+        return cls.model_construct(**data)
 
 
-class TradeOrder(BaseModel):
+class TradeOrder(_LazyMetadata, BaseModel):
     """Trade order model."""
     
     id: Optional[str] = None
     symbol: str
-    side: SignalType  # buy/sell/long/short
+    side: SignalTypeLit  # buy/sell/long/short
     order_type: OrderType = OrderType.MARKET
-    quantity: Decimal = Field(gt=0)
-    price: Optional[Decimal] = None
-    stop_price: Optional[Decimal] = None
-    stop_loss: Optional[Decimal] = None
-    take_profit: Optional[Decimal] = None
+    quantity: float = Field(gt=0)
+    price: Optional[float] = None
+    stop_price: Optional[float] = None
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
     leverage: Optional[int] = Field(None, ge=1, le=100)
     status: OrderStatus = OrderStatus.PENDING
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
     updated_at: Optional[datetime] = None
-    filled_quantity: Decimal = Field(default=Decimal('0'))
-    average_price: Optional[Decimal] = None
-    fees: Optional[Decimal] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    filled_quantity: float = Field(default=0.0)
+    average_price: Optional[float] = None
+    fees: Optional[float] = None
+    metadata: Optional[Dict[str, Any]] = None  # Allocated on first write
     
     @field_validator('symbol')
     @classmethod
@@ -102,10 +180,10 @@ class TradeOrder(BaseModel):
         """Validate trading symbol format."""
         # If it's already properly formatted k-token (from resolver), leave it alone
         if v.startswith('k') and len(v) > 1 and v[1:].isupper():
-            return v
+            return sys.intern(v)
         
-        # Otherwise uppercase normal tokens
-        return v.upper()
+        # Otherwise uppercase normal tokens (interned: the same few symbols repeat)
+        return sys.intern(v.upper())
     
     @property
     def is_filled(self) -> bool:
@@ -115,25 +193,37 @@ class TradeOrder(BaseModel):
     @property
     def is_active(self) -> bool:
         """Check if order is active (pending or partially filled)."""
-        return self.status in [OrderStatus.PENDING, OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED]
+        return self.status in _ACTIVE_STATES
+    
+    @classmethod
+    def construct_trusted(cls, **data) -> "TradeOrder":
+        """Build from already-validated internal data, skipping field validation."""
+        return cls.model_construct(**data)
 
 
 class Position(BaseModel):
     """Trading position model."""
     
     symbol: str
-    side: SignalType  # long/short
-    size: Decimal
-    entry_price: Decimal = Field(gt=0)
-    current_price: Optional[Decimal] = None
-    unrealized_pnl: Optional[Decimal] = None
-    realized_pnl: Decimal = Field(default=Decimal('0'))
+    side: SignalTypeLit  # long/short
+    size: float
+    entry_price: float = Field(gt=0)
+    current_price: Optional[float] = None
+    unrealized_pnl: Optional[float] = None
+    realized_pnl: float = Field(default=0.0)
     leverage: Optional[int] = Field(None, ge=1, le=100)
-    margin: Optional[Decimal] = None
-    liquidation_price: Optional[Decimal] = None
-    opened_at: datetime = Field(default_factory=datetime.utcnow)
+    margin: Optional[float] = None
+    liquidation_price: Optional[float] = None
+    opened_at: datetime = Field(default_factory=_utcnow)
     updated_at: Optional[datetime] = None
-    metadata: Dict[str, Any] = Field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None  # Set at construction (raw exchange data), if at all
+    
+    # Positions are read-only snapshots of exchange state, so they don't take the
+    # _LazyMetadata mixin: its set_metadata() would assign to a frozen model
+    model_config = {
+        "frozen": True,
+        "extra": "ignore"
+    }
     
     @field_validator('symbol')
     @classmethod
@@ -141,20 +231,25 @@ class Position(BaseModel):
         """Validate trading symbol format."""
         # If it's already properly formatted k-token (from resolver), leave it alone
         if v.startswith('k') and len(v) > 1 and v[1:].isupper():
-            return v
+            return sys.intern(v)
         
-        # Otherwise uppercase normal tokens
-        return v.upper()
+        # Otherwise uppercase normal tokens (interned: the same few symbols repeat)
+        return sys.intern(v.upper())
     
     @property
     def is_long(self) -> bool:
         """Check if position is long."""
-        return self.side in [SignalType.LONG, SignalType.BUY]
+        return self.side in _LONG_SIDES
     
     @property
     def is_short(self) -> bool:
         """Check if position is short."""
-        return self.side in [SignalType.SHORT, SignalType.SELL]
+        return self.side in _SHORT_SIDES
+    
+    @classmethod
+    def construct_trusted(cls, **data) -> "Position":
+        """Build from already-validated internal data, skipping field validation."""
+        return cls.model_construct(**data)
 
 
 class TradeResult(BaseModel):
@@ -164,10 +259,10 @@ class TradeResult(BaseModel):
     order: Optional[TradeOrder] = None
     position: Optional[Position] = None
     error_message: Optional[str] = None
-    execution_time: datetime = Field(default_factory=datetime.utcnow)
+    execution_time: datetime = Field(default_factory=_utcnow)
     exchange_response: Optional[Dict[str, Any]] = None
-    fees: Optional[Decimal] = None
-    slippage: Optional[Decimal] = None
+    fees: Optional[float] = None
+    slippage: Optional[float] = None
     
     @property
     def is_successful(self) -> bool:
@@ -178,4 +273,45 @@ class TradeResult(BaseModel):
 class RiskParameters(BaseModel):
     """Risk management parameters."""
     
-    max_leverage: int = Field(default=10, ge=1, le=100) 
\ No newline at end of file
+    max_leverage: int = Field(default=10, ge=1, le=100)
+
+
+@lru_cache(maxsize=None)
+def _adapter(cls) -> TypeAdapter:
+    """Get a cached TypeAdapter so its compiled schema is reused across calls."""
+    return TypeAdapter(cls)
+
+
+def validate_signal(data: Dict[str, Any]) -> TradingSignal:
+    """Validate a dict of signal fields into a TradingSignal."""
+    return _adapter(TradingSignal).validate_python(data)
+
+
+# 18 significant digits covers any price/size the exchange reports; rounding at
+# construction keeps coefficients small for downstream arithmetic
+_DECIMAL_CONTEXT = Context(prec=18, rounding=ROUND_HALF_EVEN)
+_create_decimal = _DECIMAL_CONTEXT.create_decimal
+
+
+# Decimals are immutable, so parses can be shared: ticker polls repeat the same
+# funding rates, leverage caps and prices many times over
+@lru_cache(maxsize=4096)
+def _decimal_from_str(value: str) -> Decimal:
+    return _create_decimal(value)
+
+
+# typed: 1 and 1.0 hash alike but repr (and so the Decimal exponent) differs
+@lru_cache(maxsize=4096, typed=True)
+def _decimal_from_number(value: Any) -> Decimal:
+    # repr() is the shortest round-tripping form of a float
+    return _create_decimal(repr(value))
+
+
+def to_decimal(value: Any) -> Optional[Decimal]:
+    """Convert a numeric model field to Decimal where an API needs exact values."""
+    if value is None or isinstance(value, Decimal):
+        return value
+    if isinstance(value, str):
+        # Exchange-native decimal strings parse without an intermediate str()
+        return _decimal_from_str(value)
+    return _decimal_from_number(value)
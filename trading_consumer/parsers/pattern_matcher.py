@@ -3,10 +3,55 @@ Pattern matcher utility for signal parsing.
 """
 
 import re
+import string
 from typing import List, Dict, Optional, Pattern
 from loguru import logger
 
 
+# Fixed patterns, compiled once at import
+_NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+_PERCENTAGE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*%')
+_CURRENCY_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\$(\d+(?:\.\d+)?)',  # $100.50
+    r'(\d+(?:\.\d+)?)\s*(?:usd|USDC|dollars?)',  # 100 USD
+    r'(\d+(?:\.\d+)?)\s*\$',  # 100$
+))
+# Indicator word lists are fused into one alternation each so the text is scanned once
+_BULLISH_WORDS = (
+    r'\bbull(?:ish)?\b',
+    r'\bup(?:ward)?\b',
+    r'\brise\b',
+    r'\bpump\b',
+    r'\bmoon\b',
+    r'\bto\s+the\s+moon\b',
+)
+_BEARISH_WORDS = (
+    r'\bbear(?:ish)?\b',
+    r'\bdown(?:ward)?\b',
+    r'\bfall\b',
+    r'\bdump\b',
+    r'\bcrash\b',
+    r'\bdrop\b',
+)
+_BULLISH_RE = re.compile('|'.join(_BULLISH_WORDS), re.IGNORECASE)
+_BEARISH_RE = re.compile('|'.join(_BEARISH_WORDS), re.IGNORECASE)
+# Emoji indicators are plain substrings, so they skip the regex engine entirely
+_BULLISH_EMOJIS = ('📈', '🚀', '⬆️', '💚', '🟢')
+_BEARISH_EMOJIS = ('📉', '💥', '⬇️', '❤️', '🔴')
+_TIME_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'\b(?:in\s+)?(\d+)\s*(?:minutes?|mins?|m)\b',
+    r'\b(?:in\s+)?(\d+)\s*(?:hours?|hrs?|h)\b',
+    r'\b(?:in\s+)?(\d+)\s*(?:days?|d)\b',
+    r'\b(?:in\s+)?(\d+)\s*(?:weeks?|w)\b',
+    r'\b(today|tomorrow|tonight)\b',
+    r'\b(short\s+term|long\s+term)\b',
+))
+# Symbol helpers run on upper-cased input, so these stay case-sensitive.
+# _STRIP_RE fuses prefix, suffix and special-character removal into one pass.
+_STRIP_RE = re.compile(r'^(?:CRYPTO:|COIN:|TOKEN:)|(?:USD|USDC|PERP|FUTURES?)$|[^A-Z0-9]')
+_VALID_SYMBOL_CHARS = frozenset(string.ascii_uppercase + string.digits)
+
+
 class PatternMatcher:
     """Utility class for pattern matching in trading signals."""
     
@@ -25,124 +70,71 @@ class PatternMatcher:
         
         return self._compiled_patterns[name]
     
+    def _lookup_pattern(self, pattern: str) -> Optional[Pattern]:
+        """Return ``pattern`` compiled and cached; an invalid pattern is logged here and gives None."""
+        compiled_pattern = self._compiled_patterns.get(pattern)
+        if compiled_pattern is None:
+            try:
+                compiled_pattern = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                logger.warning(f"Invalid regex pattern '{pattern}': {e}")
+                return None
+            self._compiled_patterns[pattern] = compiled_pattern
+        return compiled_pattern
+    
     def find_matches(self, text: str, patterns: List[str]) -> List[str]:
         """Find all matches for given patterns in text."""
         matches = []
         
         for pattern in patterns:
-            try:
-                compiled_pattern = re.compile(pattern, re.IGNORECASE)
-                found_matches = compiled_pattern.findall(text)
-                matches.extend(found_matches)
-            except re.error as e:
-                logger.warning(f"Invalid regex pattern '{pattern}': {e}")
-                continue
+            compiled_pattern = self._lookup_pattern(pattern)
+            if compiled_pattern is not None:
+                matches.extend(compiled_pattern.findall(text))
         
         return matches
     
     def find_first_match(self, text: str, patterns: List[str]) -> Optional[str]:
         """Find the first match for given patterns in text."""
         for pattern in patterns:
-            try:
-                compiled_pattern = re.compile(pattern, re.IGNORECASE)
-                match = compiled_pattern.search(text)
-                if match:
-                    return match.group(1) if match.groups() else match.group(0)
-            except re.error as e:
-                logger.warning(f"Invalid regex pattern '{pattern}': {e}")
+            compiled_pattern = self._lookup_pattern(pattern)
+            if compiled_pattern is None:
                 continue
+            match = compiled_pattern.search(text)
+            if match:
+                return match.group(1) if match.groups() else match.group(0)
         
         return None
     
     def extract_numbers(self, text: str) -> List[float]:
         """Extract all numbers from text."""
-        number_pattern = r'\d+(?:\.\d+)?'
-        matches = re.findall(number_pattern, text)
-        
-        numbers = []
-        for match in matches:
-            try:
-                numbers.append(float(match))
-            except ValueError:
-                continue
-        
-        return numbers
+        # The pattern only matches digit runs, so float() cannot fail
+        return list(map(float, _NUMBER_PATTERN.findall(text)))
     
     def extract_currency_amounts(self, text: str) -> List[float]:
         """Extract currency amounts from text (e.g., $100, 50 USD)."""
-        currency_patterns = [
-            r'\$(\d+(?:\.\d+)?)',  # $100.50
-            r'(\d+(?:\.\d+)?)\s*(?:usd|USDC|dollars?)',  # 100 USD
-            r'(\d+(?:\.\d+)?)\s*\$',  # 100$
-        ]
-        
         amounts = []
-        for pattern in currency_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                try:
-                    amounts.append(float(match))
-                except ValueError:
-                    continue
+        for pattern in _CURRENCY_PATTERNS:
+            amounts.extend(map(float, pattern.findall(text)))
         
         return amounts
     
     def extract_percentages(self, text: str) -> List[float]:
         """Extract percentages from text."""
-        percentage_pattern = r'(\d+(?:\.\d+)?)\s*%'
-        matches = re.findall(percentage_pattern, text)
-        
-        percentages = []
-        for match in matches:
-            try:
-                percentages.append(float(match))
-            except ValueError:
-                continue
-        
-        return percentages
+        return list(map(float, _PERCENTAGE_PATTERN.findall(text)))
     
     def has_bullish_indicators(self, text: str) -> bool:
         """Check if text contains bullish indicators."""
-        bullish_patterns = [
-            r'\bbull(?:ish)?\b',
-            r'\bup(?:ward)?\b',
-            r'\brise\b',
-            r'\bpump\b',
-            r'\bmoon\b',
-            r'\bto\s+the\s+moon\b',
-            r'📈', r'🚀', r'⬆️', r'💚', r'🟢'
-        ]
-        
-        return any(re.search(pattern, text, re.IGNORECASE) for pattern in bullish_patterns)
+        return any(e in text for e in _BULLISH_EMOJIS) or _BULLISH_RE.search(text) is not None
     
     def has_bearish_indicators(self, text: str) -> bool:
         """Check if text contains bearish indicators."""
-        bearish_patterns = [
-            r'\bbear(?:ish)?\b',
-            r'\bdown(?:ward)?\b',
-            r'\bfall\b',
-            r'\bdump\b',
-            r'\bcrash\b',
-            r'\bdrop\b',
-            r'📉', r'💥', r'⬇️', r'❤️', r'🔴'
-        ]
-        
-        return any(re.search(pattern, text, re.IGNORECASE) for pattern in bearish_patterns)
+        return any(e in text for e in _BEARISH_EMOJIS) or _BEARISH_RE.search(text) is not None
     
     def extract_time_references(self, text: str) -> List[str]:
         """Extract time references from text."""
-        time_patterns = [
-            r'\b(?:in\s+)?(\d+)\s*(?:minutes?|mins?|m)\b',
-            r'\b(?:in\s+)?(\d+)\s*(?:hours?|hrs?|h)\b',
-            r'\b(?:in\s+)?(\d+)\s*(?:days?|d)\b',
-            r'\b(?:in\s+)?(\d+)\s*(?:weeks?|w)\b',
-            r'\b(today|tomorrow|tonight)\b',
-            r'\b(short\s+term|long\s+term)\b',
-        ]
-        
         time_refs = []
-        for pattern in time_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
+        for pattern in _TIME_PATTERNS:
+            matches = pattern.findall(text)
             time_refs.extend(matches)
         
         return time_refs
@@ -152,27 +144,18 @@ class PatternMatcher:
         if not symbol:
             return ""
         
-        # Remove common prefixes/suffixes
-        symbol = symbol.upper().strip()
-        symbol = re.sub(r'^(CRYPTO:|COIN:|TOKEN:)', '', symbol)
-        symbol = re.sub(r'(USD|USDC|PERP|FUTURES?)$', '', symbol)
-        
-        # Remove special characters
-        symbol = re.sub(r'[^A-Z0-9]', '', symbol)
-        
-        return symbol
+        # Remove common prefixes/suffixes and special characters
+        return _STRIP_RE.sub('', symbol.upper().strip())
     
     def is_valid_symbol(self, symbol: str) -> bool:
         """Check if symbol is valid trading symbol format."""
         if not symbol:
             return False
         
-        # Must be 2-10 characters, alphanumeric
-        if not re.match(r'^[A-Z0-9]{2,10}$', symbol.upper()):
-            return False
-        
-        # Should not be all numbers
-        if symbol.isdigit():
-            return False
-        
-        return True 
\ No newline at end of file
+        # Must be 2-10 characters, alphanumeric, and not all numbers
+        upper = symbol.upper()
+        return (
+            2 <= len(upper) <= 10
+            and _VALID_SYMBOL_CHARS.issuperset(upper)
+            and not symbol.isdigit()
+        ) 
\ No newline at end of file
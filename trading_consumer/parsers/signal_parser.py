@@ -2,17 +2,94 @@
 Signal parser for extracting trading signals from Telegram messages.
 """
 
-# Removed regex and Decimal imports - only JSON parsing used
-from typing import Optional
+# Only JSON parsing is used; the decoder is bound once at import time below
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
 from loguru import logger
 
 from ..models.telegram import TelegramMessage
-from ..models.trading import TradingSignal, SignalType
+from ..models.trading import TradingSignal, SignalMetadata, SignalType, validate_signal
 from .pattern_matcher import PatternMatcher
 
+try:
+    # orjson is an optional speedup; its JSONDecodeError subclasses json's
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Characters of the raw payload kept on each signal; the full text is identified by hash
+_SOURCE_PREVIEW_CHARS = 256
+
+# First non-blank character of anything worth handing to the JSON decoder
+_JSON_START_CHARS = frozenset('{`')
+
+# Upper-cased signal type labels for log lines
+_TYPE_LABELS = {t: t.upper() for t in (SignalType.BUY, SignalType.SELL, SignalType.CLOSE)}
+
+# Lowercased trade direction -> signal type for opening trades
+_SIGNAL_MAP = {
+    'long': SignalType.BUY,
+    'short': SignalType.SELL,
+}
+
+
+_NumericFields = Tuple[Optional[float], Optional[float], Optional[float], Optional[int], List[float]]
+
+
+def _as_float(value: Any) -> float:
+    """Convert a decoded JSON value to float, passing floats through untouched."""
+    # The decoder already yields floats for JSON numbers; only strings/ints need float()
+    return value if type(value) is float else float(value)
+
+
+def _extract_numeric_fields(trade: Dict[str, Any], is_close: bool) -> _NumericFields:
+    """Pull price, stop loss, take profit, leverage and target prices out of a trade extraction.
+    
+    Kept free of logging and model construction so it can be compiled (mypyc) on its own.
+    """
+    get = trade.get
+    
+    # Close trades carry an exit_price, open trades an entry_price
+    raw_price = get('exit_price') if is_close else get('entry_price')
+    price: Optional[float] = _as_float(raw_price) if raw_price is not None else None
+    
+    raw_stop_loss = get('stop_loss')
+    stop_loss: Optional[float] = _as_float(raw_stop_loss) if raw_stop_loss is not None else None
+    
+    raw_take_profit = get('take_profit')
+    take_profit: Optional[float] = None
+    if raw_take_profit is not None:
+        # Handle both single value and list
+        if isinstance(raw_take_profit, list) and raw_take_profit:
+            take_profit = _as_float(raw_take_profit[0])  # Use first TP level
+        else:
+            take_profit = _as_float(raw_take_profit)
+    
+    raw_leverage = get('leverage')
+    leverage: Optional[int] = int(_as_float(raw_leverage)) if raw_leverage is not None else None
+    
+    # Normalize target_price to a list of floats (per spec)
+    raw_targets = get('target_price')
+    target_prices: List[float]
+    if raw_targets is None:
+        target_prices = []
+    elif isinstance(raw_targets, list):
+        target_prices = [_as_float(p) for p in raw_targets if p is not None]
+    else:
+        target_prices = [_as_float(raw_targets)]
+    
+    return price, stop_loss, take_profit, leverage, target_prices
+
 
 class SignalParser:
-    """Parser for extracting trading signals from messages."""
+    """Parser for extracting trading signals from messages.
+    
+    One instance is created per consumer and reused for every message; its
+    decoder and pattern tables are set up once. Not thread-safe - it is only
+    driven from the Telegram dispatcher task.
+    """
     
     def __init__(self):
         """Initialize signal parser."""
@@ -21,21 +98,29 @@ class SignalParser:
     def parse_message(self, message: TelegramMessage) -> Optional[TradingSignal]:
         """Parse a Telegram message and extract trading signal from JSON."""
         try:
-            content = message.content.strip()
-            if not content:
+            content = message.content
+            # Only look at the first non-blank character instead of stripping a copy;
+            # the JSON decoder tolerates surrounding whitespace
+            first = next((c for c in content if not c.isspace()), '')
+            if not first:
                 return None
             
-            logger.info(f"📥 Processing message: {content[:200]}...")
+            logger.opt(lazy=True).info("📥 Processing message: {}...", lambda: content[:200])
+            
+            # Trade payloads are JSON objects, optionally wrapped in a markdown fence
+            if first not in _JSON_START_CHARS:
+                logger.debug("📄 Not JSON-shaped, skipping")
+                return None
+            if first == '`':
+                # Fence delimiters are matched exactly, so fenced payloads are stripped
+                content = content.strip()
             
             # Check if this looks like an error message (for informational logging only)
             if "Pipeline Error" in content or "TLObject" in content:
                 logger.warning("🚨 Upstream service error detected in message")
                 return None
-            elif content.startswith("❌") and ("Error:" in content or "Exception:" in content):
-                logger.warning("🚨 Error message format detected")
-                return None
             
-            # Always try to parse - don't filter anything out
+            # JSON-shaped and not an error report - hand it to the decoder
             logger.debug("📥 Attempting to parse as JSON...")
             
             # Parse JSON trade data from message analyzer
@@ -48,23 +133,21 @@ class SignalParser:
     def _parse_from_json(self, content: str, message: TelegramMessage) -> Optional[TradingSignal]:
         """Parse JSON trade data from message analyzer."""
         try:
-            import json
-            
             # Strip markdown code block formatting if present
-            if content.strip().startswith('```json\n') and content.strip().endswith('\n```'):
-                content = content.strip()[8:-4].strip()  # Remove ```json\n and \n```
-            elif content.strip().startswith('```\n') and content.strip().endswith('\n```'):
-                content = content.strip()[4:-4].strip()  # Remove ```\n and \n```
+            if content.startswith('```json\n') and content.endswith('\n```'):
+                content = content[8:-4].strip()  # Remove ```json\n and \n```
+            elif content.startswith('```\n') and content.endswith('\n```'):
+                content = content[4:-4].strip()  # Remove ```\n and \n```
             
             # Try to parse as JSON
-            data = json.loads(content)
+            data = _json_loads(content)
             
-            # Check if it has trade_extractions
-            if not isinstance(data, dict) or 'trade_extractions' not in data:
+            # Check if it has trade_extractions (single lookup; None means missing)
+            trade_extractions = data.get('trade_extractions') if isinstance(data, dict) else None
+            if trade_extractions is None:
                 logger.debug("📄 Valid JSON but no trade_extractions field found")
                 return None
             
-            trade_extractions = data.get('trade_extractions', [])
             if not trade_extractions:
                 logger.debug("📄 JSON has trade_extractions but it's empty")
                 return None
@@ -75,25 +158,28 @@ class SignalParser:
                 logger.debug("📄 Empty trade extraction found")
                 return None
             
-            logger.info(f"🎯 Processing trade extraction: {trade.get('ticker', 'UNKNOWN')}")
+            # Read each field we use exactly once; the rest of the payload is never touched
+            get = trade.get
+            ticker = get('ticker') or ''
+            raw_trade_type = get('trade_type')
+            close_percentage = get('close_percentage')
+            
+            logger.info("🎯 Processing trade extraction: {}", ticker or 'UNKNOWN')
             
             # Extract signal type from direction and trade_type
-            trade_type = trade.get('trade_type', '').lower()
-            direction = trade.get('direction', '').lower()
-            
-            if trade_type == 'close':
-                signal_type = SignalType.CLOSE
-                logger.info(f"🔄 Close signal detected for {trade.get('ticker', 'UNKNOWN')}")
-            elif direction == 'long':
-                signal_type = SignalType.BUY
-            elif direction == 'short':
-                signal_type = SignalType.SELL
-            else:
-                logger.debug(f"❓ Unknown direction/trade_type: {direction}/{trade_type}")
+            trade_type = (raw_trade_type or '').lower()
+            direction = (get('direction') or '').lower()
+            
+            # A close trade_type wins over whatever direction accompanies it
+            signal_type = SignalType.CLOSE if trade_type == 'close' else _SIGNAL_MAP.get(direction)
+            if signal_type is None:
+                logger.debug("❓ Unknown direction/trade_type: {}/{}", direction, trade_type)
                 return None
+            if signal_type == SignalType.CLOSE:
+                logger.info("🔄 Close signal detected for {}", ticker or 'UNKNOWN')
             
             # Extract symbol (handle case properly)
-            raw_symbol = trade.get('ticker', '').strip().upper()
+            raw_symbol = ticker.strip().upper()
             if not raw_symbol:
                 logger.warning("⚠️ No ticker found in JSON trade data - skipping signal")
                 return None
@@ -101,104 +187,64 @@ class SignalParser:
             # Store original symbol - resolution will happen at trade execution time
             symbol = raw_symbol
             
-            # Extract price based on trade type
-            price = None
-            if trade_type == 'close':
-                # For close trades, look for exit_price
-                price = trade.get('exit_price')
-                if price is not None:
-                    price = float(price)
-                else:
-                    # If no exit_price, log close percentage for info
-                    close_pct = trade.get('close_percentage')
-                    if close_pct:
-                        logger.info(f"📊 Closing {close_pct}% of {symbol} position")
-            else:
-                # For open trades, look for entry_price
-                price = trade.get('entry_price')
-                if price is not None:
-                    price = float(price)
-            
-            stop_loss = trade.get('stop_loss')
-            if stop_loss is not None:
-                stop_loss = float(stop_loss)
-            
-            take_profit = trade.get('take_profit')
-            if take_profit is not None:
-                # Handle both single value and list
-                if isinstance(take_profit, list) and take_profit:
-                    take_profit = float(take_profit[0])  # Use first TP level
-                else:
-                    take_profit = float(take_profit)
-            
-            leverage = trade.get('leverage')
-            if leverage is not None:
-                leverage = int(float(leverage))
+            price, stop_loss, take_profit, leverage, target_price_list = _extract_numeric_fields(
+                trade, trade_type == 'close'
+            )
+            if price is None and trade_type == 'close' and close_percentage:
+                # If no exit_price, log close percentage for info
+                logger.info("📊 Closing {}% of {} position", close_percentage, symbol)
             
             # Use confidence from JSON (much higher than text parsing)
-            confidence = trade.get('confidence', 0.9)
+            confidence = get('confidence', 0.9)
             
             # Extract trader conviction level (low, medium, high, etc.)
-            trader_conviction = trade.get('trader_conviction')
+            trader_conviction = get('trader_conviction')
             
             # Create trading signal
-            # Normalize target_price to a list of floats (per spec)
-            raw_targets = trade.get('target_price')
-            if raw_targets is None:
-                target_price_list = []
-            elif isinstance(raw_targets, list):
-                target_price_list = [float(p) for p in raw_targets if p is not None]
-            else:
-                target_price_list = [float(raw_targets)]
-
-            signal = TradingSignal(
-                signal_type=signal_type,
-                symbol=symbol,
-                price=price,
-                quantity=None,  # Not typically provided in JSON
-                stop_loss=stop_loss,
-                take_profit=take_profit,
-                leverage=leverage,
-                confidence=confidence,
-                trader_conviction=trader_conviction,
-                source_message=content,
-                metadata={
-                    "sender": message.sender_name,
-                    "chat_id": message.chat.id,
-                    "message_id": message.message_id,
-                    "timestamp": message.date.isoformat(),
-                    "source": "json",
-                    "trade_type": trade.get('trade_type'),
-                    "asset_name": trade.get('asset_name'),
-                    "original_symbol": raw_symbol,
-                    "symbol_needs_resolution": True,  # Flag for later resolution
-                    "close_percentage": trade.get('close_percentage'),  # Store for close trades
-                    # New: capture execution type and target price(s) as list
-                    "execution_type": trade.get('execution_type'),
-                    "target_price": target_price_list,
-                }
+
+            signal = validate_signal({
+                "signal_type": signal_type,
+                "symbol": symbol,
+                "price": price,
+                "quantity": None,  # Not typically provided in JSON
+                "stop_loss": stop_loss,
+                "take_profit": take_profit,
+                "leverage": leverage,
+                "confidence": confidence,
+                "trader_conviction": trader_conviction,
+                "source_message": content[:_SOURCE_PREVIEW_CHARS],
+                "source_message_hash": hashlib.blake2b(content.encode(), digest_size=8).hexdigest(),
+                "metadata": SignalMetadata(
+                    sender=message.sender_name,
+                    chat_id=message.chat.id,
+                    message_id=message.message_id,
+                    timestamp=message.date.timestamp(),
+                    source="json",
+                    trade_type=raw_trade_type,
+                    asset_name=get('asset_name'),
+                    original_symbol=raw_symbol,
+                    symbol_needs_resolution=True,  # Flag for later resolution
+                    close_percentage=close_percentage,  # Store for close trades
+                    # Capture execution type and target price(s) as list
+                    execution_type=get('execution_type'),
+                    target_price=target_price_list,
+                ),
+            })
+            
+            # The template is only formatted if INFO is enabled
+            logger.info(
+                "✅ Extracted {} signal: {} {} (confidence: {:.2f}{})",
+                _TYPE_LABELS[signal_type],
+                signal.symbol,
+                f"@ ${price}" if price else "market price",
+                signal.confidence,
+                f", conviction: {trader_conviction}" if trader_conviction else "",
             )
             
-            # Enhanced logging based on signal type
-            if signal_type == SignalType.CLOSE:
-                price_info = f"@ ${price}" if price else "market price"
-                conviction_info = f", conviction: {trader_conviction}" if trader_conviction else ""
-                logger.info(
-                    f"✅ Extracted CLOSE signal: {signal.symbol} {price_info} "
-                    f"(confidence: {signal.confidence:.2f}{conviction_info})"
-                )
-            else:
-                price_info = f"@ ${price}" if price else "market price"
-                conviction_info = f", conviction: {trader_conviction}" if trader_conviction else ""
-                logger.info(
-                    f"✅ Extracted {signal.signal_type.value.upper()} signal: {signal.symbol} "
-                    f"{price_info} (confidence: {signal.confidence:.2f}{conviction_info})"
-                )
-            
             return signal
             
         except json.JSONDecodeError as e:
-            logger.debug(f"📄 Not valid JSON (normal for text messages): {str(e)[:100]}")
+            logger.opt(lazy=True).debug("📄 Not valid JSON (normal for text messages): {}", lambda: str(e)[:100])
             return None
         except Exception as e:
             logger.error(f"❌ Error parsing signal: {e}")
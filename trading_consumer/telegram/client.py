@@ -7,7 +7,6 @@ from typing import Optional, Callable
 from telegram import Bot, Update
 from telegram.ext import Application, MessageHandler, filters
 from loguru import logger
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..models.telegram import TelegramMessage, TelegramUser, TelegramChat
 from ..models.config import TelegramConfig
@@ -16,6 +15,15 @@ from ..models.config import TelegramConfig
 class TelegramClient:
     """Telegram client for consuming messages."""
     
+    # Max messages handed to the callback per dispatcher wake-up
+    DISPATCH_BATCH_SIZE = 16
+    # Max accepted messages waiting for the dispatcher; intake waits when it is full
+    INBOX_SIZE = 256
+    # Seconds stop() waits for accepted messages to be dispatched
+    DRAIN_TIMEOUT = 10.0
+    # Long-poll hold time (seconds); getUpdates already returns up to 100 updates per call
+    POLL_TIMEOUT = 30
+    
     def __init__(self, config: TelegramConfig):
         """Initialize Telegram client."""
         self.config = config
@@ -23,6 +31,13 @@ class TelegramClient:
         self.application: Optional[Application] = None
         self.message_callback: Optional[Callable[[TelegramMessage], None]] = None
         self._running = False
+        self._inbox: Optional[asyncio.Queue] = None
+        
+        # Membership sets for the per-message filters
+        self._chat_ids = frozenset(config.chat_ids or ())
+        self._allowed_user_ids = frozenset(config.allowed_user_ids or ())
+        self._allowed_users = frozenset(config.allowed_users or ())
+        self._dispatcher: Optional[asyncio.Task] = None
         
     async def initialize(self) -> None:
         """Initialize the Telegram client."""
@@ -55,6 +70,8 @@ class TelegramClient:
         
         self.message_callback = message_callback
         self._running = True
+        self._inbox = asyncio.Queue(maxsize=self.INBOX_SIZE)
+        self._dispatcher = asyncio.create_task(self._dispatch_messages())
         
         try:
             logger.info("Starting Telegram client...")
@@ -64,6 +81,8 @@ class TelegramClient:
             # Start polling for updates
             logger.info("🔄 Starting Telegram polling...")
             await self.application.updater.start_polling(
+                poll_interval=0.0,
+                timeout=self.POLL_TIMEOUT,
                 drop_pending_updates=True,
                 allowed_updates=["message", "channel_post"]
             )
@@ -102,7 +121,21 @@ class TelegramClient:
                 # Only stop application if it was started  
                 if hasattr(self.application, '_running') and self.application._running:
                     await self.application.stop()
-                
+            except Exception as e:
+                logger.error(f"Error stopping Telegram client: {e}")
+        
+        # No new messages arrive now; deliver the accepted ones before cancelling the dispatcher
+        if self._dispatcher:
+            try:
+                await asyncio.wait_for(self._inbox.join(), self.DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ Dropping {self._inbox.qsize()} undispatched Telegram messages on stop")
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        
+        if self.application:
+            try:
                 await self.application.shutdown()
                 logger.info("Telegram client stopped")
             except Exception as e:
@@ -122,61 +155,80 @@ class TelegramClient:
             user_id = message.from_user.id if message.from_user else "Unknown"
             username = message.from_user.username if message.from_user else "Unknown"
             
-            logger.info(f"📨 Message from User ID: {user_id} (@{username}) in Chat: {chat_id} ({chat_name})")
+            logger.info("📨 Message from User ID: {} (@{}) in Chat: {} ({})", user_id, username, chat_id, chat_name)
             
              # Filter by chat IDs if specified
-            if self.config.chat_ids and message.chat_id not in self.config.chat_ids:
+            if self._chat_ids and message.chat_id not in self._chat_ids:
                 logger.info(
-                    f"🚫 Ignoring message from chat {message.chat_id} ({chat_name}) - "
-                    f"monitoring chats {self.config.chat_ids}"
+                    "🚫 Ignoring message from chat {} ({}) - monitoring chats {}",
+                    message.chat_id, chat_name, self.config.chat_ids
                 )
                 return
             
             # Filter by allowed user IDs if specified (priority over usernames)
-            if self.config.allowed_user_ids and message.from_user:
+            if self._allowed_user_ids and message.from_user:
                 user_id = message.from_user.id
-                if user_id not in self.config.allowed_user_ids:
+                if user_id not in self._allowed_user_ids:
                     logger.info(
-                        f"🚫 Ignoring message from user ID {user_id} "
-                        f"(not in allowed list: {self.config.allowed_user_ids})"
+                        "🚫 Ignoring message from user ID {} (not in allowed list: {})",
+                        user_id, self.config.allowed_user_ids
                     )
                     return
                 else:
-                    logger.info(f"✅ Message from allowed user ID {user_id}")
+                    logger.info("✅ Message from allowed user ID {}", user_id)
             
             # Filter by allowed users (usernames) if specified and no user ID filter
-            elif self.config.allowed_users and message.from_user:
+            elif self._allowed_users and message.from_user:
                 username = message.from_user.username
-                if username not in self.config.allowed_users:
+                if username not in self._allowed_users:
                     logger.info(
-                        f"🚫 Ignoring message from user @{username} "
-                        f"(not in allowed list: {self.config.allowed_users})"
+                        "🚫 Ignoring message from user @{} (not in allowed list: {})",
+                        username, self.config.allowed_users
                     )
                     return
                 else:
-                    logger.info(f"✅ Message from allowed user @{username}")
+                    logger.info("✅ Message from allowed user @{}", username)
             
             # Convert to our message model
             telegram_message = self._convert_message(message)
             
-            logger.info(
-                f"Received message from {telegram_message.sender_name}: "
-                f"{telegram_message.content[:100]}..."
+            logger.opt(lazy=True).info(
+                "Received message from {}: {}...",
+                lambda: telegram_message.sender_name,
+                lambda: telegram_message.content[:100],
             )
             
-            # Call the message callback
-            if self.message_callback:
-                await self._safe_callback(telegram_message)
+            # Hand off to the dispatcher so bursts are drained together; waits while the inbox is full
+            if self.message_callback and self._inbox is not None:
+                await self._inbox.put(telegram_message)
             
         except Exception as e:
             logger.error(f"Error handling Telegram message: {e}")
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
+    async def _dispatch_messages(self) -> None:
+        """Drain queued messages in small batches and pass them to the callback."""
+        while True:
+            batch = [await self._inbox.get()]
+            while len(batch) < self.DISPATCH_BATCH_SIZE and not self._inbox.empty():
+                batch.append(self._inbox.get_nowait())
+            
+            if len(batch) > 1:
+                logger.debug("Dispatching burst of {} messages", len(batch))
+            
+            for telegram_message in batch:
+                try:
+                    await self._safe_callback(telegram_message)
+                except Exception as e:
+                    logger.error(f"Error dispatching Telegram message: {e}")
+                finally:
+                    self._inbox.task_done()
+    
     async def _safe_callback(self, message: TelegramMessage) -> None:
-        """Safely call the message callback with retry logic."""
+        """Call the message callback once.
+        
+        Not retried here: a signal may already have placed orders when the
+        callback fails, so only the consumer can decide whether a retry is safe.
+        """
         try:
             if asyncio.iscoroutinefunction(self.message_callback):
                 await self.message_callback(message)
@@ -186,13 +238,19 @@ class TelegramClient:
             logger.error(f"Error in message callback: {e}")
             raise
     
-    def _convert_message(self, telegram_message) -> TelegramMessage:
-        """Convert python-telegram-bot message to our model."""
+    def _convert_message(self, telegram_message, depth: int = 0) -> TelegramMessage:
+        """Convert python-telegram-bot message to our model.
+        
+        Only the direct reply is converted (``depth`` 0 -> 1); deeper reply
+        chains are dropped since nothing downstream walks them.
+        """
+        # python-telegram-bot has already decoded and typed these objects, so the
+        # message and its user/chat DTOs are built without re-running Pydantic validation.
         
         # Convert user
         from_user = None
         if telegram_message.from_user:
-            from_user = TelegramUser(
+            from_user = TelegramUser.model_construct(
                 id=telegram_message.from_user.id,
                 is_bot=telegram_message.from_user.is_bot,
                 first_name=telegram_message.from_user.first_name,
@@ -202,7 +260,7 @@ class TelegramClient:
             )
         
         # Convert chat
-        chat = TelegramChat(
+        chat = TelegramChat.model_construct(
             id=telegram_message.chat.id,
             type=telegram_message.chat.type,
             title=telegram_message.chat.title,
@@ -211,15 +269,15 @@ class TelegramClient:
             last_name=telegram_message.chat.last_name,
         )
         
-        # Convert reply message if exists
+        # Convert reply message if exists (one level only)
         reply_to_message = None
-        if telegram_message.reply_to_message:
-            reply_to_message = self._convert_message(telegram_message.reply_to_message)
+        if depth == 0 and telegram_message.reply_to_message:
+            reply_to_message = self._convert_message(telegram_message.reply_to_message, depth + 1)
         
         # Convert forward from user
         forward_from = None
         if hasattr(telegram_message, 'forward_from') and telegram_message.forward_from:
-            forward_from = TelegramUser(
+            forward_from = TelegramUser.model_construct(
                 id=telegram_message.forward_from.id,
                 is_bot=telegram_message.forward_from.is_bot,
                 first_name=telegram_message.forward_from.first_name,
@@ -228,7 +286,7 @@ class TelegramClient:
                 language_code=telegram_message.forward_from.language_code,
             )
         
-        return TelegramMessage(
+        return TelegramMessage.construct_trusted(
             message_id=telegram_message.message_id,
             from_user=from_user,
             chat=chat,
@@ -3,7 +3,9 @@ Trading execution and exchange integration.
 """
 
 from .exchange import HyperliquidExchange
+from .rate_limiter import AdaptiveRateLimiter
 
 __all__ = [
     "HyperliquidExchange",
+    "AdaptiveRateLimiter",
 ] 
\ No newline at end of file
@@ -2,29 +2,210 @@
 Hyperliquid exchange integration using CCXT.
 """
 
-import ccxt
-import decimal
+import aiohttp
+import ccxt.async_support as ccxt
 from decimal import Decimal
-from typing import Optional, Dict, Any, List
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple
 from loguru import logger
-from tenacity import retry, stop_after_attempt, wait_exponential
 import asyncio
+import random
+import time
+from functools import lru_cache
+
+try:
+    # WebSocket-capable subclasses of the async clients (bundled with ccxt >= 2)
+    import ccxt.pro as ccxtpro
+except ImportError:
+    ccxtpro = None
 
 from ..models.config import HyperliquidConfig
-from ..models.trading import TradeOrder, Position, OrderStatus, SignalType
+from ..models.trading import TradeOrder, Position, OrderStatus, SignalType, to_decimal
+from .rate_limiter import AdaptiveRateLimiter
+
+
+# Signal side -> ccxt order side
+_SIDE_MAP = {
+    SignalType.BUY: 'buy',
+    SignalType.LONG: 'buy',
+    SignalType.SELL: 'sell',
+    SignalType.SHORT: 'sell',
+}
+
+# Stand-in for a missing ccxt 'info' payload, so misses do not allocate a dict
+_NO_INFO: Mapping[str, Any] = MappingProxyType({})
+
+# Transport-level failures worth resubmitting (RequestTimeout, DDoSProtection and
+# ExchangeNotAvailable are NetworkError subclasses)
+_RETRYABLE_ERRORS = (ccxt.NetworkError,)
+
+# CCXT order status -> our enum
+_STATUS_MAP = {
+    'open': OrderStatus.OPEN,
+    'closed': OrderStatus.FILLED,
+    'canceled': OrderStatus.CANCELLED,
+    'cancelled': OrderStatus.CANCELLED,
+    'rejected': OrderStatus.REJECTED,
+    'expired': OrderStatus.CANCELLED,
+}
+
+
+def _map_status(ccxt_status: str) -> OrderStatus:
+    """Map CCXT order status to our enum."""
+    return _STATUS_MAP.get(ccxt_status, OrderStatus.PENDING)
+
+
+def _single_flight(inflight: Dict[Any, asyncio.Task], key: Any, factory) -> asyncio.Task:
+    """Return the in-flight task for ``key``, starting ``factory(key)`` if there is none."""
+    task = inflight.get(key)
+    if task is None:
+        task = inflight[key] = asyncio.create_task(factory(key))
+        task.add_done_callback(lambda _: inflight.pop(key, None))
+    return task
+
+
+
+def _consume_probe_result(task: asyncio.Task) -> None:
+    """Retrieve the background connection probe's outcome (_test_connection logs failures)."""
+    if not task.cancelled():
+        task.exception()
+
+
+def _log_markets_refresh(task: asyncio.Task) -> None:
+    """Report a failed background market refresh (the stale catalogue stays in use)."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"⚠️ Background market refresh failed: {task.exception()}")
+
+
+def _as_float(value: Any, default: Optional[float] = None) -> Optional[float]:
+    """Float from a ccxt numeric field; ``default`` when missing or unparseable."""
+    if value is None:
+        return default
+    if type(value) is float:
+        # ccxt has already parsed most numeric fields
+        return value
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+@lru_cache(maxsize=512)
+def _format_symbol(symbol: str) -> str:
+    """Convert a base symbol (e.g. "ETH") to the ccxt perp market id "ETH/USDC:USDC"."""
+    return symbol + '/USDC:USDC'
+
+
+@lru_cache(maxsize=512)
+def _base_symbol(market: str) -> str:
+    """Convert a ccxt perp market id ("ETH/USDC:USDC") back to its base symbol."""
+    return market.replace('/USDC:USDC', '')
+
+
+def _position_from_ccxt(pos: Dict[str, Any], keep_raw: bool = False) -> Position:
+    """Build a Position from a ccxt position dict with one lookup per field."""
+    get = pos.get
+    mark_price = get('markPrice')
+    unrealized_pnl = get('unrealizedPnl')
+    liquidation_price = get('liquidationPrice')
+    
+    # Exchange data is already typed; skip validation on this hot path
+    return Position.construct_trusted(
+        symbol=_base_symbol(pos['symbol']),
+        side=SignalType.LONG if pos['side'] == 'long' else SignalType.SHORT,
+        size=abs(float(pos['contracts'])),  # Use absolute value
+        entry_price=float(pos['entryPrice']),
+        current_price=float(mark_price) if mark_price else None,
+        unrealized_pnl=float(unrealized_pnl) if unrealized_pnl else None,
+        leverage=int(get('leverage', 1)),
+        liquidation_price=float(liquidation_price) if liquidation_price else None,
+        # The raw payload is only retained when explicitly requested
+        metadata={'exchange_data': pos} if keep_raw else None
+    )
 
 
 class HyperliquidExchange:
     """Hyperliquid exchange client using CCXT."""
     
+    # Seconds a fetched quote is reused for order pricing
+    QUOTE_TTL = 0.25
+    # How long create_tp_sl_orders waits for a freshly opened position to appear
+    POSITION_WAIT_SECONDS = 15.0
+    # Seconds a per-symbol fetch_positions result is shared between callers
+    POSITIONS_TTL = 0.5
+    # Seconds before the market catalogue is refreshed in the background
+    MARKETS_TTL = 300.0
+    # Longest wait on order-update pushes before re-checking the order over REST
+    ORDER_WATCH_SLICE = 2.0
+    # Seconds a known order status is trusted before asking the exchange again
+    ORDER_STATUS_TTL = 1.0
+    # Cap of the fill-polling backoff; positions are also checked from here on
+    FILL_POLL_MAX_DELAY = 0.5
+    # Submission attempts for create_order on transient network errors
+    ORDER_ATTEMPTS = 3
+    # Idle seconds a pooled HTTPS connection is kept open (aiohttp default is 15)
+    KEEPALIVE_TIMEOUT = 75
+    
     def __init__(self, config: HyperliquidConfig):
         """Initialize Hyperliquid exchange client."""
         self.config = config
         self.exchange: Optional[ccxt.Exchange] = None
         self._connected = False
+        self._quote_cache: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._quote_inflight: Dict[str, asyncio.Task] = {}
+        self._mids: Dict[str, str] = {}
+        self._mids_at = 0.0
+        self._mids_inflight: Dict[str, asyncio.Task] = {}
+        self._positions_cache: Dict[Tuple[str, str], Tuple[List[Dict[str, Any]], float]] = {}
+        self._positions_inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._markets_loaded_at = 0.0
+        self._markets_inflight: Dict[str, asyncio.Task] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._init_task: Optional[asyncio.Task] = None
+        self._order_status_cache: Dict[str, Tuple[OrderStatus, float]] = {}
+        self._watch_positions = False
+        self._watch_orders = False
+        self._watch_tickers = False
+        self._limiter = AdaptiveRateLimiter(1 / config.rate_limit)
+        
+        # Account scope, built once: positions/orders are read for the vault when one is
+        # configured, and orders are placed on its behalf. Shared - copy before mutating.
+        self._user_params: Dict[str, Any] = {"user": config.vault_address or config.wallet_address}
+        self._vault_params: Dict[str, Any] = (
+            {"vaultAddress": config.vault_address} if config.vault_address else {}
+        )
+        self._probe_task: Optional[asyncio.Task] = None
         
     async def initialize(self) -> None:
-        """Initialize the exchange connection."""
+        """Initialize the exchange connection.
+        
+        Idempotent: concurrent callers share one in-flight attempt, and a failed
+        attempt is cleared so the next caller can retry.
+        """
+        if self._connected:
+            return
+        
+        task = self._init_task
+        if task is None:
+            task = self._init_task = asyncio.create_task(self._initialize())
+        try:
+            await asyncio.shield(task)
+        except Exception:
+            if self._init_task is task:
+                self._init_task = None
+            raise
+    
+    async def __aenter__(self) -> "HyperliquidExchange":
+        """Initialize on entry: ``async with HyperliquidExchange(config) as exchange: ...``."""
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the exchange connection on exit."""
+        await self.close()
+    
+    async def _initialize(self) -> None:
+        """Create the client, test the connection and load markets."""
         try:
             logger.info("🔗 Initializing Hyperliquid exchange connection...")
             logger.info(f"📍 Using wallet: {self.config.wallet_address}")
@@ -37,8 +218,22 @@ class HyperliquidExchange:
             else:
                 logger.info("👤 Trading with main wallet address (no vault configured)")
             
+            # Own the HTTP session so pooled connections (TCP + TLS) stay warm between trades
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    keepalive_timeout=self.KEEPALIVE_TIMEOUT,
+                    limit=100,
+                    # Everything goes to one API host; bound the sockets held open to it
+                    limit_per_host=30,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True,
+                )
+            )
+            
             # Create CCXT exchange instance with Hyperliquid configuration
-            self.exchange = ccxt.hyperliquid({
+            client_cls = ccxtpro.hyperliquid if ccxtpro is not None else ccxt.hyperliquid
+            self.exchange = client_cls({
+                'session': self._session,
                 'walletAddress': self.config.wallet_address,
                 'privateKey': self.config.private_key,
                 'timeout': self.config.timeout * 1000,  # CCXT uses milliseconds
@@ -53,11 +248,23 @@ class HyperliquidExchange:
             if self.config.testnet:
                 self.exchange.sandbox = True
             
-            # Test connection
-            logger.info("🔍 Testing Hyperliquid API connection...")
-            await self._test_connection()
+            self._install_rate_limiter()
+            
+            # Position fills can be pushed instead of polled when the client supports it
+            self._watch_positions = bool(self.exchange.has.get('watchPositions'))
+            self._watch_orders = bool(self.exchange.has.get('watchOrders'))
+            self._watch_tickers = bool(self.exchange.has.get('watchTickers'))
+            
+            # Loading the market catalogue is the only request startup waits on (order paths
+            # price off cached quotes); it already proves the API is reachable
+            await self._reload_markets()
             self._connected = True
             
+            # The account probe runs in the background: a bad wallet/vault address is
+            # reported in the logs without delaying startup, and any account call fails anyway
+            self._probe_task = asyncio.create_task(self._test_connection())
+            self._probe_task.add_done_callback(_consume_probe_result)
+            
             # Initialize symbol resolver
             from ..utils.symbol_resolver import get_symbol_resolver
             resolver = get_symbol_resolver()
@@ -69,11 +276,28 @@ class HyperliquidExchange:
             logger.error(f"❌ Failed to initialize Hyperliquid exchange: {e}")
             raise
     
+    def _install_rate_limiter(self) -> None:
+        """Route ccxt's request pacing through the adaptive limiter.
+        
+        ccxt awaits ``exchange.throttle(cost)`` before every REST call, so replacing
+        it keeps a single gate; response codes are fed back through the
+        ``on_rest_response`` hook.
+        """
+        self.exchange.throttle = self._limiter
+        on_rest_response = getattr(self.exchange, 'on_rest_response', None)
+        if on_rest_response is None:
+            return
+        
+        def observe(code, *args):
+            self._limiter.record(code)
+            return on_rest_response(code, *args)
+        
+        self.exchange.on_rest_response = observe
+    
     async def _test_connection(self) -> None:
         """Test the exchange connection."""
         try:
-            logger.info("🔄 Testing Hyperliquid API connection...")
-            self.exchange.fetch_balance()
+            await self.exchange.fetch_balance()
             logger.info("✅ Hyperliquid API connection test successful")
         except Exception as e:
             logger.error(f"❌ Hyperliquid API connection test failed: {e}")
@@ -85,73 +309,70 @@ class HyperliquidExchange:
             await self.initialize()
         
         try:
-            symbol_formatted = f"{symbol}/USDC:USDC"
+            symbol_formatted = _format_symbol(symbol)
             
-            logger.info(f"⚡ Setting {leverage}x leverage for {symbol} with {margin_mode} margin...")
+            logger.info("⚡ Setting {}x leverage for {} with {} margin...", leverage, symbol, margin_mode)
             
             # Use correct Hyperliquid API - set_margin_mode with leverage parameter
-            self.exchange.set_margin_mode(
+            await self.exchange.set_margin_mode(
                 margin_mode, 
                     symbol_formatted, 
                 params={"leverage": leverage}
                 )
             
-            logger.info(
-                f"✅ Leverage set to {leverage}x for {symbol} with {margin_mode} margin"
-            )
+            logger.info("✅ Leverage set to {}x for {} with {} margin", leverage, symbol, margin_mode)
             return True
             
         except Exception as e:
             logger.error(f"❌ Failed to set leverage for {symbol}: {e}")
             return False
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
     async def create_order(self, order: TradeOrder) -> TradeOrder:
-        """Create a new order on the exchange."""
+        """Create a new order on the exchange, retrying transient network errors."""
+        for attempt in range(self.ORDER_ATTEMPTS):
+            try:
+                return await self._submit_order(order)
+            except _RETRYABLE_ERRORS as e:
+                # Exchange rejections (InvalidOrder, InsufficientFunds, ...) are not retried
+                if attempt == self.ORDER_ATTEMPTS - 1:
+                    raise
+                # Jittered 100-500ms so concurrent retries do not hit the API in lockstep
+                delay = random.uniform(0.1, min(0.5, 0.1 * 2 ** (attempt + 1)))
+                logger.warning(
+                    f"🔁 Transient error creating order (attempt {attempt + 1}/{self.ORDER_ATTEMPTS}), "
+                    f"retrying in {delay * 1000:.0f}ms: {e}"
+                )
+                await asyncio.sleep(delay)
+    
+    async def _submit_order(self, order: TradeOrder) -> TradeOrder:
+        """Submit an order once, falling back to LIMIT IOC if a market order cannot match."""
         if not self._connected:
             await self.initialize()
         
         try:
-            symbol = f"{order.symbol}/USDC:USDC"
+            symbol = _format_symbol(order.symbol)
             
-            # Load markets to get current price (for logging/metadata only)
-            markets = self.exchange.load_markets()
-            current_price = float(markets[symbol]["info"]["midPx"])
-            # Fetch ticker for bid/ask to support fallbacks
-            try:
-                ticker = self.exchange.fetch_ticker(symbol)
-                best_bid = float(ticker.get('bid') or 0) or current_price
-                best_ask = float(ticker.get('ask') or 0) or current_price
-            except Exception:
-                best_bid = current_price
-                best_ask = current_price
-            
-            # Map side
-            side_map = {
-                SignalType.BUY: 'buy',
-                SignalType.LONG: 'buy',
-                SignalType.SELL: 'sell',
-                SignalType.SHORT: 'sell',
-            }
-            side = side_map.get(order.side, 'buy')
+            # One (briefly cached) quote gives the mid for slippage and bid/ask for fallbacks
+            ticker = await self._get_quote(symbol)
+            current_price = self._mid_from_quote(symbol, ticker)
+            best_bid = float(ticker.get('bid') or 0) or current_price
+            best_ask = float(ticker.get('ask') or 0) or current_price
+            
+            side = _SIDE_MAP.get(order.side, 'buy')
             
             # Create the order - Hyperliquid requires price for market orders (slippage calc)
-            params = {}
+            params = self._vault_params.copy()
             if self.config.vault_address:
-                params['vaultAddress'] = self.config.vault_address
-                logger.debug(f"🏦 Trading on behalf of vault/subaccount: {self.config.vault_address}")
+                logger.debug("🏦 Trading on behalf of vault/subaccount: {}", self.config.vault_address)
             
             # Add leverage to params if specified in order
             if order.leverage:
                 params['leverage'] = order.leverage
-                logger.debug(f"⚡ Using {order.leverage}x leverage for order")
+                logger.debug("⚡ Using {}x leverage for order", order.leverage)
             
             if order.order_type.value == 'market':
                 # Market orders need price for slippage calculation on Hyperliquid
-                result = self.exchange.create_order(
+                result = await self.exchange.create_order(
                     symbol=symbol,
                     type='market',
                     side=side,
@@ -159,10 +380,10 @@ class HyperliquidExchange:
                     price=current_price,  # Required for slippage calculation
                     params=params
                 )
-                logger.info(f"🚀 Market order created at ~${current_price:.4f}")
+                logger.info("🚀 Market order created at ~${:.4f}", current_price)
             elif order.order_type.value == 'limit':
                 limit_price = float(order.price) if order.price else current_price
-                result = self.exchange.create_order(
+                result = await self.exchange.create_order(
                     symbol=symbol,
                     type='limit',
                     side=side,
@@ -170,37 +391,13 @@ class HyperliquidExchange:
                     price=limit_price,
                     params=params
                 )
-                logger.info(f"📌 Limit order created at ${limit_price:.4f}")
+                logger.info("📌 Limit order created at ${:.4f}", limit_price)
             else:
                 raise ValueError(f"Unsupported order type: {order.order_type}")
             
-            # Update order with exchange response
-            order.id = result['id']
-            order.status = self._map_order_status(result['status'])
+            self._apply_exchange_result(order, result, symbol)
             
-            # Safe decimal conversions with error handling
-            try:
-                avg_price = result.get('average', 0)
-                order.average_price = (
-                    Decimal(str(avg_price)) if avg_price is not None else None
-                )
-            except (ValueError, TypeError, decimal.InvalidOperation):
-                order.average_price = None
-                
-            try:
-                order.filled_quantity = Decimal(str(result.get('filled', 0)))
-            except (ValueError, TypeError, decimal.InvalidOperation):
-                order.filled_quantity = Decimal('0')
-                
-            try:
-                fee_cost = result.get('fee', {}).get('cost', 0) if result.get('fee') else 0
-                order.fees = Decimal(str(fee_cost)) if fee_cost is not None else None
-            except (ValueError, TypeError, decimal.InvalidOperation):
-                order.fees = None
-                
-            order.metadata['exchange_response'] = result
-            
-            logger.info(f"📈 Order created: {order.id} - {order.side.value} {order.quantity} {order.symbol}")
+            logger.info("📈 Order created: {} - {} {} {}", order.id, order.side, order.quantity, order.symbol)
             
             return order
             
@@ -213,102 +410,291 @@ class HyperliquidExchange:
                     'could not immediately match' in error_str.lower() or 'invalidorder' in error_str.lower()
                 ):
                     logger.info("🔁 Falling back to aggressive LIMIT IOC order")
-                    # Recompute side and params
-                    side_map = {
-                        SignalType.BUY: 'buy',
-                        SignalType.LONG: 'buy',
-                        SignalType.SELL: 'sell',
-                        SignalType.SHORT: 'sell',
-                    }
-                    side_fallback = side_map.get(order.side, 'buy')
-                    params_fb = {}
-                    if self.config.vault_address:
-                        params_fb['vaultAddress'] = self.config.vault_address
-                    if order.leverage:
-                        params_fb['leverage'] = order.leverage
+                    # Same side and params as the market attempt (which got as far as the exchange)
                     # Price slightly beyond best to ensure take
                     slippage_buffer = 0.002  # 0.2%
-                    if side_fallback == 'buy':
+                    if side == 'buy':
                         limit_price = best_ask * (1 + slippage_buffer)
                     else:
                         limit_price = best_bid * (1 - slippage_buffer)
                     # IOC to attempt immediate execution
-                    params_fb['timeInForce'] = 'IOC'
-                    result = self.exchange.create_order(
+                    result = await self.exchange.create_order(
                         symbol=symbol,
                         type='limit',
-                        side=side_fallback,
+                        side=side,
                         amount=float(order.quantity),
                         price=float(limit_price),
-                        params=params_fb
+                        params={**params, 'timeInForce': 'IOC'}
                     )
-                    logger.info(f"✅ Fallback LIMIT IOC order created at ${limit_price:.4f}")
-                    # Update order from result
-                    order.id = result['id']
-                    order.status = self._map_order_status(result['status'])
-                    try:
-                        avg_price = result.get('average', 0)
-                        order.average_price = (
-                            Decimal(str(avg_price)) if avg_price is not None else None
-                        )
-                    except (ValueError, TypeError, decimal.InvalidOperation):
-                        order.average_price = None
-                    try:
-                        order.filled_quantity = Decimal(str(result.get('filled', 0)))
-                    except (ValueError, TypeError, decimal.InvalidOperation):
-                        order.filled_quantity = Decimal('0')
-                    try:
-                        fee_cost = result.get('fee', {}).get('cost', 0) if result.get('fee') else 0
-                        order.fees = Decimal(str(fee_cost)) if fee_cost is not None else None
-                    except (ValueError, TypeError, decimal.InvalidOperation):
-                        order.fees = None
-                    order.metadata['exchange_response'] = result
+                    logger.info("✅ Fallback LIMIT IOC order created at ${:.4f}", limit_price)
+                    self._apply_exchange_result(order, result, symbol)
                     return order
             except Exception as fb_e:
                 logger.error(f"❌ Fallback LIMIT IOC also failed: {fb_e}")
             # If fallback not applicable or failed, mark rejected and re-raise
             order.status = OrderStatus.REJECTED
-            order.metadata['error'] = error_str
+            order.set_metadata('error', error_str)
+            raise
+    
+    def _apply_exchange_result(self, order: TradeOrder, result: Dict[str, Any], symbol_formatted: str) -> None:
+        """Copy id, status, fill and fee data from a ccxt order result onto ``order``."""
+        order.id = result['id']
+        order.status = _map_status(result['status'])
+        self._remember_order_status(order.id, order.status)
+        self._invalidate_positions(symbol_formatted)
+        
+        fee = result.get('fee')
+        order.average_price = _as_float(result.get('average', 0))
+        order.filled_quantity = _as_float(result.get('filled'), 0.0) or 0.0
+        order.fees = _as_float(fee.get('cost', 0)) if fee else 0.0
+        
+        if self.config.keep_raw_exchange_data:
+            order.set_metadata('exchange_response', result)
+    
+    async def _get_quote(self, symbol_formatted: str) -> Dict[str, Any]:
+        """Fetch the ticker for a market, reusing one fetched within QUOTE_TTL.
+        
+        Concurrent misses for the same market share a single in-flight request;
+        different markets are fetched independently.
+        """
+        cached = self._quote_cache.get(symbol_formatted)
+        if cached is not None and time.monotonic() - cached[1] < self.QUOTE_TTL:
+            return cached[0]
+        
+        task = _single_flight(self._quote_inflight, symbol_formatted, self._fetch_quote)
+        # Shielded so one cancelled waiter does not abort the fetch for the others
+        return await asyncio.shield(task)
+    
+    async def _fetch_quote(self, symbol_formatted: str) -> Dict[str, Any]:
+        """Fetch a ticker from the exchange and store it in the quote cache."""
+        now = time.monotonic()
+        try:
+            ticker = await self.exchange.fetch_ticker(symbol_formatted)
+        except ccxt.BadSymbol:
+            # Possibly listed after startup: refresh the catalogue once and retry
+            await asyncio.shield(_single_flight(self._markets_inflight, 'markets', self._reload_markets))
+            ticker = await self.exchange.fetch_ticker(symbol_formatted)
+        
+        self._quote_cache[symbol_formatted] = (ticker, now)
+        return ticker
+    
+    async def get_markets(self) -> Dict[str, Any]:
+        """Return the market catalogue, refreshing it once it is MARKETS_TTL old.
+        
+        A stale catalogue is returned as-is while the reload runs in the
+        background; callers only wait when nothing has been loaded yet.
+        """
+        if not self._connected:
+            await self.initialize()
+        
+        if time.monotonic() - self._markets_loaded_at >= self.MARKETS_TTL:
+            task = _single_flight(self._markets_inflight, 'markets', self._reload_markets)
+            if not self.exchange.markets:
+                return await asyncio.shield(task)
+            task.add_done_callback(_log_markets_refresh)
+        return self.exchange.markets
+    
+    async def _reload_markets(self, _key: str = 'markets') -> Dict[str, Any]:
+        """Reload the market catalogue from the exchange."""
+        markets = await self.exchange.load_markets(reload=True)
+        self._markets_loaded_at = time.monotonic()
+        logger.debug("Loaded {} markets", len(markets))
+        return markets
+    
+    async def _get_symbol_positions(self, symbol_formatted: str) -> List[Dict[str, Any]]:
+        """fetch_positions for one market in the configured account scope.
+        
+        Results are shared for POSITIONS_TTL and concurrent callers share one
+        request; order placement on the market invalidates the entry.
+        """
+        key = (symbol_formatted, self._user_params["user"])
+        cached = self._positions_cache.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.POSITIONS_TTL:
+            return cached[0]
+        
+        task = _single_flight(self._positions_inflight, key, self._fetch_symbol_positions)
+        return await asyncio.shield(task)
+    
+    async def _fetch_symbol_positions(self, key: Tuple[str, str]) -> List[Dict[str, Any]]:
+        """Fetch positions for one (market, user) pair and store them in the cache."""
+        now = time.monotonic()
+        symbol_formatted, user = key
+        positions = await self.exchange.fetch_positions([symbol_formatted], params={"user": user})
+        self._positions_cache[key] = (positions, now)
+        return positions
+    
+    def _invalidate_positions(self, symbol_formatted: str) -> None:
+        """Forget cached positions for a market after an order changed them."""
+        for key in [k for k in self._positions_cache if k[0] == symbol_formatted]:
+            del self._positions_cache[key]
+    
+    @staticmethod
+    def _mid_from_quote(symbol_formatted: str, ticker: Dict[str, Any]) -> float:
+        """Mid price from a ticker, falling back to the last trade."""
+        mid = (ticker.get('info') or _NO_INFO).get('midPx') or ticker.get('last') or ticker.get('close')
+        if mid is None:
+            raise ValueError(f"No mid price available for {symbol_formatted}")
+        return float(mid)
+    
+    @property
+    def can_stream_prices(self) -> bool:
+        """Whether watch_mid_prices() can push prices (requires ccxt.pro)."""
+        return self._watch_tickers
+    
+    async def watch_mid_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Wait for the next pushed ticker update for ``symbols``.
+        
+        Returns base symbol -> mid price for the tickers in the update; raises if
+        the stream fails, after which can_stream_prices is False.
+        """
+        if not self._connected:
+            await self.initialize()
+        try:
+            tickers = await self.exchange.watch_tickers([_format_symbol(s) for s in symbols])
+        except Exception:
+            self._watch_tickers = False
             raise
+        prices: Dict[str, float] = {}
+        for market, ticker in (tickers or {}).items():
+            try:
+                prices[_base_symbol(market)] = self._mid_from_quote(market, ticker)
+            except ValueError:
+                continue
+        return prices
+    
+    async def _get_mid_price(self, symbol_formatted: str) -> float:
+        """Current mid price for a market.
+        
+        Read from one batched ``allMids`` snapshot (a few KB covering every coin,
+        shared by all callers for QUOTE_TTL); falls back to the market's ticker if
+        the coin is missing from it or the request fails.
+        """
+        if time.monotonic() - self._mids_at >= self.QUOTE_TTL:
+            try:
+                await asyncio.shield(_single_flight(self._mids_inflight, 'allMids', self._fetch_mids))
+            except Exception as e:
+                logger.debug("allMids fetch failed, using ticker: {}", e)
+        
+        mid = self._mids.get(_base_symbol(symbol_formatted))
+        if mid is not None:
+            return float(mid)
+        return self._mid_from_quote(symbol_formatted, await self._get_quote(symbol_formatted))
+    
+    async def _fetch_mids(self, _key: str = 'allMids') -> Dict[str, str]:
+        """Fetch mid prices for every coin in one /info request."""
+        now = time.monotonic()
+        mids = await self.exchange.public_post_info({'type': 'allMids'})
+        self._mids = mids
+        self._mids_at = now
+        return mids
     
     async def wait_for_order_fill(self, order_id: str, symbol: str, timeout_seconds: int = 30) -> bool:
-        """Wait for an order to be filled with timeout."""
-        symbol_formatted = f"{symbol}/USDC:USDC"
+        """Wait for an order to be filled with timeout.
+        
+        With a WebSocket-capable client the wait blocks on order updates and only
+        re-checks over REST every ORDER_WATCH_SLICE seconds (covering a fill that
+        landed before the subscription). Otherwise fetch_order is polled with
+        backoff from 50ms up to 500ms, since most fills land within a few hundred ms.
+        
+        fetch_order lags behind market fills on Hyperliquid, so positions are checked
+        too: on every REST re-check while watching, and on every poll once the
+        backoff has reached its cap.
+        """
+        symbol_formatted = _format_symbol(symbol)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_seconds
+        delay = 0.05
+        attempt = 0
+        # The first look may be answered by the status recorded at submission
+        lookup = self.get_order_status
 
-        for attempt in range(timeout_seconds):
+        while loop.time() < deadline:
+            attempt += 1
             try:
-                order_status = await self.get_order_status(order_id, symbol)
-                logger.debug(f"Order {order_id} status: {order_status.value} (attempt {attempt + 1}/{timeout_seconds})")
+                order_status = await lookup(order_id, symbol)
+                lookup = self._fetch_order_status
+                logger.debug("Order {} status: {} (attempt {})", order_id, order_status.value, attempt)
                 
                 if order_status == OrderStatus.FILLED:
-                    logger.info(f"✅ Order {order_id} filled successfully")
+                    logger.info("✅ Order {} filled successfully", order_id)
                     return True
                 elif order_status in [OrderStatus.CANCELLED, OrderStatus.REJECTED]:
                     logger.error(f"❌ Order {order_id} failed with status: {order_status.value}")
                     return False
-
-                # Fallback: check positions to detect fill (market orders may not reflect immediately via fetch_order)
-                try:
-                    position_params = {}
-                    if self.config.vault_address:
-                        position_params["user"] = self.config.vault_address
-                    else:
-                        position_params["user"] = self.config.wallet_address
-
-                    positions = self.exchange.fetch_positions([symbol_formatted], params=position_params)
-                    if positions and positions[0].get('contracts', 0) != 0:
-                        logger.info(f"✅ Position detected while waiting: {abs(positions[0]['contracts'])} {symbol}")
+                
+                if self._watch_orders:
+                    pushed = await self._watch_for_order(
+                        order_id, symbol_formatted, min(self.ORDER_WATCH_SLICE, deadline - loop.time())
+                    )
+                    if pushed == OrderStatus.FILLED:
+                        logger.info("✅ Order {} fill pushed", order_id)
                         return True
-                except Exception as e_pos:
-                    logger.debug(f"Position check error while waiting for fill: {e_pos}")
+                    elif pushed in (OrderStatus.CANCELLED, OrderStatus.REJECTED):
+                        logger.error(f"❌ Order {order_id} failed with status: {pushed.value}")
+                        return False
                 
-                await asyncio.sleep(1)
+                # The first polls come too early for a fill to be visible anywhere
+                check_positions = self._watch_orders or delay >= self.FILL_POLL_MAX_DELAY
+                if check_positions and await self._position_detected(symbol_formatted, symbol, "while waiting"):
+                    return True
+                if self._watch_orders:
+                    continue
             except Exception as e:
-                logger.warning(f"Error checking order status (attempt {attempt + 1}): {e}")
-                await asyncio.sleep(1)
+                logger.warning(f"Error checking order status (attempt {attempt}): {e}")
+            
+            await asyncio.sleep(max(min(delay, deadline - loop.time()), 0))
+            delay = min(delay * 2, self.FILL_POLL_MAX_DELAY)
+        
+        # Final check: a market fill can show up in positions before fetch_order reports it
+        if await self._position_detected(symbol_formatted, symbol, "after waiting"):
+            return True
         
         logger.warning(f"⏰ Order {order_id} fill timeout after {timeout_seconds} seconds")
         return False
+    
+    async def _position_detected(self, symbol_formatted: str, symbol: str, when: str) -> bool:
+        """Whether the account holds a position in the market (fill fallback check)."""
+        try:
+            positions = await self._get_symbol_positions(symbol_formatted)
+            if positions and positions[0].get('contracts', 0) != 0:
+                logger.info("✅ Position detected {}: {} {}", when, abs(positions[0]['contracts']), symbol)
+                return True
+        except Exception as e_pos:
+            logger.debug("Position check error {} for fill: {}", when, e_pos)
+        return False
+    
+    async def _watch_for_order(
+        self, order_id: str, symbol_formatted: str, timeout: float
+    ) -> Optional[OrderStatus]:
+        """Wait up to ``timeout`` seconds for a terminal update of one order over WebSocket.
+        
+        Returns None on timeout. On any other failure WebSocket watching is disabled
+        for this client and callers fall back to REST polling.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        params = self._user_params
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                updates = await asyncio.wait_for(
+                    self.exchange.watch_orders(symbol_formatted, params=params), remaining
+                )
+                for update in updates or []:
+                    if update.get('id') != order_id:
+                        continue
+                    status = _map_status(update.get('status'))
+                    self._remember_order_status(order_id, status)
+                    if status in (OrderStatus.FILLED, OrderStatus.CANCELLED, OrderStatus.REJECTED):
+                        return status
+        except asyncio.TimeoutError:
+            return None
+        except Exception as e:
+            logger.warning(f"watch_orders failed, falling back to polling: {e}")
+            self._watch_orders = False
+            return None
 
     async def create_tp_sl_orders(self, symbol: str, tp_price: Optional[float] = None, sl_price: Optional[float] = None) -> List[Dict[str, Any]]:
         """Create TP/SL orders for existing position (following user's examples)."""
@@ -316,51 +702,67 @@ class HyperliquidExchange:
             await self.initialize()
         
         orders = []
-        symbol_formatted = f"{symbol}/USDC:USDC"
+        symbol_formatted = _format_symbol(symbol)
         
         # Setup params for vault trading
-        params = {}
-        if self.config.vault_address:
-            params['vaultAddress'] = self.config.vault_address
+        params = self._vault_params
         
         try:
-            # Wait for position to be established (retry up to 15 times with better logic)
+            # Wait for position to be established: push updates over WebSocket when the
+            # client supports watch_positions, otherwise poll with exponential backoff
+            # (50ms doubling up to 1s) until POSITION_WAIT_SECONDS have elapsed
             position_found = False
             position_size = 0
             position_side: Optional[str] = None  # long or short
             
-            for attempt in range(15):
+            # Use consistent user parameter logic (vault positions if configured, else main wallet)
+            position_params = self._user_params
+            logger.debug("Checking positions for {}", position_params['user'])
+            
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.POSITION_WAIT_SECONDS
+            delay = 0.05
+            attempt = 0
+            while True:
+                attempt += 1
                 try:
-                    # Use consistent user parameter logic
-                    position_params = {}
-                    if self.config.vault_address:
-                        position_params["user"] = self.config.vault_address  # Check vault positions
-                        logger.debug(f"Checking positions for vault: {self.config.vault_address}")
-                    else:
-                        position_params["user"] = self.config.wallet_address  # Check main wallet positions
-                        logger.debug(f"Checking positions for wallet: {self.config.wallet_address}")
+                    positions = await self.exchange.fetch_positions([symbol_formatted], params=position_params)
+                    logger.debug("Fetch positions response: {}", positions)
                     
-                    positions = self.exchange.fetch_positions([symbol_formatted], params=position_params)
-                    logger.debug(f"Fetch positions response: {positions}")
-                    
-                    if positions and len(positions) > 0:
+                    if positions:
                         position = positions[0]
                         contracts = position.get('contracts', 0)
-                        logger.debug(f"Position contracts: {contracts}")
+                        logger.debug("Position contracts: {}", contracts)
                         
                         if contracts != 0:
                             position_size = abs(contracts)
                             position_side = position.get('side')
                             position_found = True
-                            logger.info(f"✅ Position found: {position_size} contracts for {symbol} (side={position_side})")
+                            logger.info("✅ Position found: {} contracts for {} (side={})", position_size, symbol, position_side)
                             break
                     
-                    logger.info(f"⏳ Waiting for position... attempt {attempt + 1}/15")
-                    await asyncio.sleep(1)
-                    
+                    logger.info("⏳ Waiting for position... attempt {}", attempt)
                 except Exception as e:
-                    logger.warning(f"Error checking position (attempt {attempt + 1}): {e}")
-                    await asyncio.sleep(1)
+                    logger.warning(f"Error checking position (attempt {attempt}): {e}")
+                
+                if loop.time() + delay > deadline:
+                    break
+                
+                if self._watch_positions:
+                    # Not there yet: block on the next position push instead of sleeping
+                    position = await self._watch_for_position(
+                        symbol_formatted, position_params, deadline - loop.time()
+                    )
+                    if position is not None:
+                        position_size = abs(position['contracts'])
+                        position_side = position.get('side')
+                        position_found = True
+                        logger.info("✅ Position pushed: {} contracts for {} (side={})", position_size, symbol, position_side)
+                        break
+                    continue
+                
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 1.0)
             
             if not position_found:
                 # Try one more time with all positions to debug
@@ -368,13 +770,14 @@ class HyperliquidExchange:
                     all_positions = await self.get_positions()
                     logger.error(f"All current positions: {[f'{p.symbol}: {p.size}' for p in all_positions]}")
                     
-                    # Check if position exists with different symbol format
-                    for pos in all_positions:
-                        if pos.symbol.upper() == symbol.upper():
-                            position_size = float(pos.size)
-                            position_found = True
-                            logger.info(f"✅ Found position with alternative lookup: {position_size} {pos.symbol}")
-                            break
+                    # Check if position exists with different symbol case
+                    by_symbol = {pos.symbol.upper(): pos for pos in all_positions}
+                    pos = by_symbol.get(symbol.upper())
+                    if pos is not None:
+                        position_size = float(pos.size)
+                        position_side = 'short' if pos.side == SignalType.SHORT else 'long'
+                        position_found = True
+                        logger.info("✅ Found position with alternative lookup: {} {}", position_size, pos.symbol)
                             
                 except Exception as e:
                     logger.error(f"Failed to get all positions for debugging: {e}")
@@ -390,9 +793,7 @@ class HyperliquidExchange:
                     )
                     raise ValueError(error_msg)
         
-            # Load markets to get current price
-            markets = self.exchange.load_markets()
-            current_price = float(markets[symbol_formatted]["info"]["midPx"])
+            current_price = await self._get_mid_price(symbol_formatted)
 
             # Determine the correct close side based on position side
             # long → close with 'sell'; short → close with 'buy'
@@ -400,65 +801,27 @@ class HyperliquidExchange:
             if position_side == 'short':
                 close_side = 'buy'
             
-            # Create Take Profit order (following user's example)
-            if tp_price:
-                try:
-                    tp_order = self.exchange.create_order(
-                        symbol=symbol_formatted,
-                        type='market',
-                        side=close_side,
-                        amount=position_size,
-                        price=current_price,
-                        params={**params, 'takeProfitPrice': tp_price, 'reduceOnly': True}
-                    )
+            if tp_price and sl_price and self.exchange.has.get('createOrders'):
+                # Both legs in one signed request; only legs the batch did not place are retried singly
+                tp_order, sl_order = await self._create_tp_sl_batch(
+                    symbol_formatted, close_side, position_size, current_price, tp_price, sl_price, params
+                )
+                if tp_order is not None:
                     orders.append(tp_order)
-                    logger.info(f"TP order created: {tp_order['id']} @ {tp_price}")
-                except Exception as e:
-                    logger.error(f"Failed to create TP order: {e}")
-                    # Try alternative TP format (limit order)
-                    try:
-                        tp_order_alt = self.exchange.create_order(
-                            symbol=symbol_formatted,
-                            type='limit',
-                            side=close_side,
-                            amount=position_size,
-                            price=tp_price,
-                            params={**params, 'reduceOnly': True}
-                        )
-                        orders.append(tp_order_alt)
-                        logger.info(f"Alternative TP order created: {tp_order_alt['id']} @ {tp_price}")
-                    except Exception as e2:
-                        logger.error(f"Both TP order formats failed: {e}, {e2}")
-        
-            # Create Stop Loss order (following user's example)
-            if sl_price:
-                try:
-                    sl_order = self.exchange.create_order(
-                        symbol=symbol_formatted,
-                        type='market',
-                        side=close_side,
-                        amount=position_size,
-                        price=current_price,
-                        params={**params, 'stopLossPrice': sl_price, 'reduceOnly': True}
-                    )
+                    tp_price = None
+                if sl_order is not None:
                     orders.append(sl_order)
-                    logger.info(f"SL order created: {sl_order['id']} @ {sl_price}")
-                except Exception as e:
-                    logger.error(f"Failed to create SL order: {e}")
-                    # Try alternative SL format (stop_market)
-                    try:
-                        sl_order_alt = self.exchange.create_order(
-                            symbol=symbol_formatted,
-                            type='stop_market',
-                            side=close_side,
-                            amount=position_size,
-                            price=None,
-                            params={**params, 'stopPrice': sl_price, 'reduceOnly': True}
-                        )
-                        orders.append(sl_order_alt)
-                        logger.info(f"Alternative SL order created: {sl_order_alt['id']} @ {sl_price}")
-                    except Exception as e2:
-                        logger.error(f"Both SL order formats failed: {e}, {e2}")
+                    sl_price = None
+            
+            # TP and SL legs are independent, so place them concurrently
+            legs = []
+            if tp_price:
+                legs.append(self._create_tp_leg(symbol_formatted, close_side, position_size, current_price, tp_price, params))
+            if sl_price:
+                legs.append(self._create_sl_leg(symbol_formatted, close_side, position_size, current_price, sl_price, params))
+            for leg in await asyncio.gather(*legs):
+                if leg is not None:
+                    orders.append(leg)
             
             return orders
             
@@ -466,36 +829,153 @@ class HyperliquidExchange:
             logger.error(f"Failed to create TP/SL orders: {e}")
             raise
     
+    async def _watch_for_position(
+        self, symbol_formatted: str, params: Dict[str, Any], timeout: float
+    ) -> Optional[Dict[str, Any]]:
+        """Wait up to ``timeout`` seconds for a non-empty position update over WebSocket.
+        
+        Returns None on timeout. On any other failure WebSocket watching is disabled
+        for this client and callers fall back to REST polling.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                positions = await asyncio.wait_for(
+                    self.exchange.watch_positions([symbol_formatted], params=params), remaining
+                )
+                for position in positions or []:
+                    if position.get('symbol') == symbol_formatted and position.get('contracts'):
+                        return position
+        except asyncio.TimeoutError:
+            return None
+        except Exception as e:
+            logger.warning(f"watch_positions failed, falling back to polling: {e}")
+            self._watch_positions = False
+            return None
+    
+    async def _create_tp_sl_batch(
+        self, symbol_formatted: str, close_side: str, amount: float, current_price: float,
+        tp_price: float, sl_price: float, params: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Place the reduce-only TP and SL in a single create_orders request.
+        
+        Returns the (tp, sl) orders the exchange accepted; a leg is None when the
+        batch failed or the exchange rejected it.
+        """
+        leg = {'symbol': symbol_formatted, 'type': 'market', 'side': close_side, 'amount': amount, 'price': current_price}
+        try:
+            placed = await self.exchange.create_orders([
+                {**leg, 'params': {**params, 'takeProfitPrice': tp_price, 'reduceOnly': True}},
+                {**leg, 'params': {**params, 'stopLossPrice': sl_price, 'reduceOnly': True}},
+            ])
+        except Exception as e:
+            logger.error(f"Failed to create TP/SL batch: {e}")
+            return None, None
+        
+        # Per-leg rejections come back as orders without an id
+        accepted = [o if o and o.get('id') else None for o in placed or []]
+        accepted += [None] * (2 - len(accepted))
+        tp_order, sl_order = accepted[0], accepted[1]
+        if tp_order is not None:
+            logger.info("TP order created: {} @ {}", tp_order['id'], tp_price)
+        if sl_order is not None:
+            logger.info("SL order created: {} @ {}", sl_order['id'], sl_price)
+        return tp_order, sl_order
+    
+    async def _create_tp_leg(
+        self, symbol_formatted: str, close_side: str, amount: float,
+        current_price: float, tp_price: float, params: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Place a reduce-only take-profit, falling back to a plain limit order."""
+        try:
+            tp_order = await self.exchange.create_order(
+                symbol=symbol_formatted,
+                type='market',
+                side=close_side,
+                amount=amount,
+                price=current_price,
+                params={**params, 'takeProfitPrice': tp_price, 'reduceOnly': True}
+            )
+            logger.info("TP order created: {} @ {}", tp_order['id'], tp_price)
+            return tp_order
+        except Exception as e:
+            logger.error(f"Failed to create TP order: {e}")
+            # Try alternative TP format (limit order)
+            try:
+                tp_order_alt = await self.exchange.create_order(
+                    symbol=symbol_formatted,
+                    type='limit',
+                    side=close_side,
+                    amount=amount,
+                    price=tp_price,
+                    params={**params, 'reduceOnly': True}
+                )
+                logger.info("Alternative TP order created: {} @ {}", tp_order_alt['id'], tp_price)
+                return tp_order_alt
+            except Exception as e2:
+                logger.error(f"Both TP order formats failed: {e}, {e2}")
+                return None
+    
+    async def _create_sl_leg(
+        self, symbol_formatted: str, close_side: str, amount: float,
+        current_price: float, sl_price: float, params: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Place a reduce-only stop-loss, falling back to a stop_market order."""
+        try:
+            sl_order = await self.exchange.create_order(
+                symbol=symbol_formatted,
+                type='market',
+                side=close_side,
+                amount=amount,
+                price=current_price,
+                params={**params, 'stopLossPrice': sl_price, 'reduceOnly': True}
+            )
+            logger.info("SL order created: {} @ {}", sl_order['id'], sl_price)
+            return sl_order
+        except Exception as e:
+            logger.error(f"Failed to create SL order: {e}")
+            # Try alternative SL format (stop_market)
+            try:
+                sl_order_alt = await self.exchange.create_order(
+                    symbol=symbol_formatted,
+                    type='stop_market',
+                    side=close_side,
+                    amount=amount,
+                    price=None,
+                    params={**params, 'stopPrice': sl_price, 'reduceOnly': True}
+                )
+                logger.info("Alternative SL order created: {} @ {}", sl_order_alt['id'], sl_price)
+                return sl_order_alt
+            except Exception as e2:
+                logger.error(f"Both SL order formats failed: {e}, {e2}")
+                return None
+    
     async def close_position(self, symbol: str, position_size: Optional[float] = None) -> Dict[str, Any]:
         """Close a position using reduceOnly."""
         if not self._connected:
             await self.initialize()
         
         try:
-            symbol_formatted = f"{symbol}/USDC:USDC"
+            symbol_formatted = _format_symbol(symbol)
             
             # Setup params for vault trading
-            params = {}
-            if self.config.vault_address:
-                params['vaultAddress'] = self.config.vault_address
+            params = self._vault_params
             
             # Get position size if not provided
             if position_size is None:
-                position_params = {"user": self.config.wallet_address}
-                if self.config.vault_address:
-                    position_params["user"] = self.config.vault_address
-                    
-                positions = self.exchange.fetch_positions([symbol_formatted], params=position_params)
+                positions = await self._get_symbol_positions(symbol_formatted)
                 if not positions or positions[0].get('contracts', 0) == 0:
                     raise ValueError(f"No position found for {symbol}")
                 position_size = abs(positions[0]['contracts'])
             
-            # Load markets to get current price
-            markets = self.exchange.load_markets()
-            current_price = float(markets[symbol_formatted]["info"]["midPx"])
+            current_price = await self._get_mid_price(symbol_formatted)
             
             # Create close order (following user's example)
-            result = self.exchange.create_order(
+            result = await self.exchange.create_order(
                 symbol=symbol_formatted,
                 type='market',
                 side='sell',
@@ -503,8 +983,9 @@ class HyperliquidExchange:
                 price=current_price,
                 params={**params, 'reduceOnly': True}
             )
+            self._invalidate_positions(symbol_formatted)
             
-            logger.info(f"Position closed: {result['id']} - {position_size} {symbol}")
+            logger.info("Position closed: {} - {} {}", result['id'], position_size, symbol)
             return result
             
         except Exception as e:
@@ -516,23 +997,41 @@ class HyperliquidExchange:
         if not self._connected:
             await self.initialize()
         
+        cached = self._order_status_cache.get(order_id)
+        if cached is not None and time.monotonic() - cached[1] < self.ORDER_STATUS_TTL:
+            return cached[0]
+        
+        return await self._fetch_order_status(order_id, symbol)
+    
+    async def _fetch_order_status(self, order_id: str, symbol: str) -> OrderStatus:
+        """Ask the exchange for an order's status, bypassing the status cache."""
         try:
             # Include user/vault in params to ensure correct account scope
-            params = {"user": self.config.vault_address or self.config.wallet_address}
-            result = self.exchange.fetch_order(order_id, f"{symbol}/USDC:USDC", params)
-            return self._map_order_status(result['status'])
+            result = await self.exchange.fetch_order(order_id, _format_symbol(symbol), self._user_params)
+            status = _map_status(result['status'])
+            self._remember_order_status(order_id, status)
+            return status
         except Exception as e:
             logger.error(f"Failed to get order status: {e}")
             return OrderStatus.REJECTED
     
+    def _remember_order_status(self, order_id: str, status: OrderStatus) -> None:
+        """Record a freshly observed order status, pruning entries nobody polls anymore."""
+        now = time.monotonic()
+        cache = self._order_status_cache
+        cache[order_id] = (status, now)
+        if len(cache) > 256:
+            for stale_id in [oid for oid, (_, seen) in cache.items() if now - seen > 60]:
+                del cache[stale_id]
+    
     async def cancel_order(self, order_id: str, symbol: str) -> bool:
         """Cancel an order."""
         if not self._connected:
             await self.initialize()
         
         try:
-            self.exchange.cancel_order(order_id, f"{symbol}/USDC:USDC")
-            logger.info(f"Order cancelled: {order_id}")
+            await self.exchange.cancel_order(order_id, _format_symbol(symbol))
+            logger.info("Order cancelled: {}", order_id)
             return True
         except Exception as e:
             logger.error(f"Failed to cancel order {order_id}: {e}")
@@ -544,13 +1043,20 @@ class HyperliquidExchange:
             await self.initialize()
         
         try:
-            balance = self.exchange.fetch_balance()
+            balance = await self.exchange.fetch_balance()
             
-            # Convert to our format
-            formatted_balance = {}
-            for currency, amounts in balance.items():
-                if isinstance(amounts, dict) and 'free' in amounts:
-                    formatted_balance[currency] = Decimal(str(amounts['free']))
+            # Convert to our format from ccxt's unified per-currency 'free' view
+            try:
+                formatted_balance = {
+                    currency: to_decimal(amount) for currency, amount in balance['free'].items()
+                }
+            except (KeyError, TypeError, AttributeError):
+                # Non-standard shape: fall back to scanning the per-currency entries
+                formatted_balance = {
+                    currency: to_decimal(amounts['free'])
+                    for currency, amounts in balance.items()
+                    if isinstance(amounts, dict) and 'free' in amounts
+                }
             
             logger.info("💰 Fetched account balance")
             return formatted_balance
@@ -560,23 +1066,18 @@ class HyperliquidExchange:
             return {}
     
     async def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
-        """Get open positions."""
+        """Get open positions, for one symbol or all of them."""
+        return await self.get_positions_multi([symbol] if symbol else None)
+    
+    async def get_positions_multi(self, symbols: Optional[List[str]] = None) -> List[Position]:
+        """Get open positions for several symbols in one request (all symbols if None)."""
         if not self._connected:
             await self.initialize()
         
         try:
-            # Add user parameter to params for Hyperliquid
-            # Prefer vault address when configured (positions are held under vault)
-            user_scope = self.config.vault_address or self.config.wallet_address
-            params = {"user": user_scope}
-            
-            if symbol:
-                # Fetch positions for specific symbol (like user's examples)
-                symbol_formatted = f"{symbol}/USDC:USDC"
-                positions = self.exchange.fetch_positions([symbol_formatted], params=params)
-            else:
-                # Fetch all positions
-                positions = self.exchange.fetch_positions(params=params)
+            # None fetches every position (vault positions when configured, else main wallet)
+            symbols_formatted = [_format_symbol(s) for s in symbols] if symbols else None
+            positions = await self.exchange.fetch_positions(symbols_formatted, params=self._user_params)
 
             # Fallback: if no positions found and we queried vault, try wallet (or vice versa)
             if (not positions or all(p.get('contracts', 0) == 0 for p in positions)):
@@ -585,45 +1086,28 @@ class HyperliquidExchange:
                 )
                 if alt_user_scope:
                     alt_params = {"user": alt_user_scope}
-                    if symbol:
-                        symbol_formatted = f"{symbol}/USDC:USDC"
-                        positions = self.exchange.fetch_positions([symbol_formatted], params=alt_params)
-                    else:
-                        positions = self.exchange.fetch_positions(params=alt_params)
+                    positions = await self.exchange.fetch_positions(symbols_formatted, params=alt_params)
             
-            formatted_positions = []
-            for pos in positions:
-                if pos.get('contracts', 0) != 0:  # Only positions with size
-                    # Convert symbol back from "ETH/USDC:USDC" to "ETH"
-                    pos_symbol = pos['symbol'].replace('/USDC:USDC', '')
-                    
-                    position = Position(
-                        symbol=pos_symbol,
-                        side=SignalType.LONG if pos['side'] == 'long' else SignalType.SHORT,
-                        size=Decimal(str(abs(pos['contracts']))),  # Use absolute value
-                        entry_price=Decimal(str(pos['entryPrice'])),
-                        current_price=Decimal(str(pos['markPrice'])) if pos.get('markPrice') else None,
-                        unrealized_pnl=Decimal(str(pos['unrealizedPnl'])) if pos.get('unrealizedPnl') else None,
-                        leverage=int(pos.get('leverage', 1)),
-                        liquidation_price=Decimal(str(pos['liquidationPrice'])) if pos.get('liquidationPrice') else None,
-                        metadata={'exchange_data': pos}
-                    )
-                    formatted_positions.append(position)
+            # Only positions with size
+            keep_raw = self.config.keep_raw_exchange_data
+            formatted_positions = [
+                _position_from_ccxt(pos, keep_raw) for pos in positions if pos.get('contracts')
+            ]
             
-            logger.info(f"📊 Fetched {len(formatted_positions)} open positions.")
+            logger.info("📊 Fetched {} open positions.", len(formatted_positions))
             return formatted_positions
             
         except Exception as e:
             logger.error(f"Failed to get positions: {e}")
             return []
     
-    async def get_open_orders(self, symbol: str) -> List[Dict[str, Any]]:
-        """Get open orders for a symbol."""
+    async def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get open orders for a symbol, or for every symbol in one request when omitted."""
         if not self._connected:
             await self.initialize()
         
         try:
-            orders = self.exchange.fetch_open_orders(f"{symbol}/USDC:USDC")
+            orders = await self.exchange.fetch_open_orders(_format_symbol(symbol) if symbol else None)
             return orders
         except Exception as e:
             logger.error(f"Failed to get open orders: {e}")
@@ -639,20 +1123,13 @@ class HyperliquidExchange:
         if not self._connected:
             await self.initialize()
         try:
-            symbol_formatted = f"{symbol}/USDC:USDC"
-            # Determine user scope
-            params_base = {}
-            if self.config.vault_address:
-                params_base['vaultAddress'] = self.config.vault_address
-                user_scope = self.config.vault_address
-            else:
-                user_scope = self.config.wallet_address
+            symbol_formatted = _format_symbol(symbol)
+            params_base = self._vault_params
             
             # Get current position to know side and size
-            position_params = {"user": user_scope}
-            positions = self.exchange.fetch_positions([symbol_formatted], params=position_params)
+            positions = await self._get_symbol_positions(symbol_formatted)
             if not positions or positions[0].get('contracts', 0) == 0:
-                logger.info(f"No open position for {symbol}; skipping SL update")
+                logger.info("No open position for {}; skipping SL update", symbol)
                 return False
             pos = positions[0]
             contracts = abs(pos.get('contracts', 0))
@@ -662,11 +1139,11 @@ class HyperliquidExchange:
             close_side = 'sell' if side == 'long' else 'buy'
             
             # Fetch open orders and try to identify SL order
-            open_orders = self.exchange.fetch_open_orders(symbol_formatted)
+            open_orders = await self.exchange.fetch_open_orders(symbol_formatted)
             sl_order_id = None
             for o in open_orders or []:
                 # Heuristics: reduceOnly and has stop params or type 'stop_market'
-                params = o.get('info') or {}
+                params = o.get('info') or _NO_INFO
                 ro = params.get('reduceOnly') or o.get('reduceOnly')
                 has_stop = ('stopPrice' in params) or ('stopLossPrice' in params)
                 if ro and has_stop:
@@ -676,14 +1153,14 @@ class HyperliquidExchange:
             # Cancel existing SL if present and if price is different/worse than new
             if sl_order_id:
                 try:
-                    self.exchange.cancel_order(sl_order_id, symbol_formatted)
-                    logger.info(f"Cancelled existing SL order {sl_order_id} for {symbol}")
+                    await self.exchange.cancel_order(sl_order_id, symbol_formatted)
+                    logger.info("Cancelled existing SL order {} for {}", sl_order_id, symbol)
                 except Exception as e:
                     logger.warning(f"Failed to cancel existing SL {sl_order_id}: {e}")
             
             # Create new SL as stop_market (preferred) with reduceOnly
             try:
-                order = self.exchange.create_order(
+                order = await self.exchange.create_order(
                     symbol=symbol_formatted,
                     type='stop_market',
                     side=close_side,
@@ -691,13 +1168,13 @@ class HyperliquidExchange:
                     price=None,
                     params={**params_base, 'stopPrice': float(new_sl_price), 'reduceOnly': True}
                 )
-                logger.info(f"🔒 Updated SL for {symbol} at {new_sl_price} (order {order.get('id')})")
+                logger.info("🔒 Updated SL for {} at {} (order {})", symbol, new_sl_price, order.get('id'))
                 return True
             except Exception as e:
                 logger.error(f"Failed to create stop_market SL for {symbol}: {e}")
                 # Fallback to limit as alternative
                 try:
-                    order = self.exchange.create_order(
+                    order = await self.exchange.create_order(
                         symbol=symbol_formatted,
                         type='limit',
                         side=close_side,
@@ -705,7 +1182,7 @@ class HyperliquidExchange:
                         price=float(new_sl_price),
                         params={**params_base, 'reduceOnly': True}
                     )
-                    logger.info(f"🔒 Updated SL (limit) for {symbol} at {new_sl_price} (order {order.get('id')})")
+                    logger.info("🔒 Updated SL (limit) for {} at {} (order {})", symbol, new_sl_price, order.get('id'))
                     return True
                 except Exception as e2:
                     logger.error(f"Both SL update paths failed for {symbol}: {e2}")
@@ -714,52 +1191,148 @@ class HyperliquidExchange:
             logger.error(f"update_stop_loss failed for {symbol}: {e}")
             return False
     
+    async def bulk_update_stop_loss(self, updates: Dict[str, float]) -> Dict[str, bool]:
+        """Move the stop-loss of several symbols with batched cancel/create requests.
+        
+        Same strategy as update_stop_loss() for each symbol, but positions and open
+        orders are read once, stale SLs are cancelled together and the new ones are
+        placed in one create_orders call. Falls back to update_stop_loss() per symbol
+        for a single update, when the exchange has no batch endpoint, or for legs the
+        batch rejected.
+        
+        Returns symbol -> whether its new SL was placed.
+        """
+        if not self._connected:
+            await self.initialize()
+        if len(updates) < 2 or not self.exchange.has.get('createOrders'):
+            placed = await asyncio.gather(*(self.update_stop_loss(s, p) for s, p in updates.items()))
+            return dict(zip(updates, placed))
+        
+        results = {symbol: False for symbol in updates}
+        try:
+            markets = {symbol: _format_symbol(symbol) for symbol in updates}
+            positions, open_orders = await asyncio.gather(
+                self.exchange.fetch_positions(list(markets.values()), params=self._user_params),
+                self.exchange.fetch_open_orders(),
+            )
+            position_by_market = {p.get('symbol'): p for p in positions or [] if p.get('contracts')}
+            
+            # Same heuristic as update_stop_loss: reduce-only with stop params
+            sl_by_market: Dict[str, Any] = {}
+            for o in open_orders or []:
+                params = o.get('info') or _NO_INFO
+                ro = params.get('reduceOnly') or o.get('reduceOnly')
+                if ro and (('stopPrice' in params) or ('stopLossPrice' in params)):
+                    sl_by_market.setdefault(o.get('symbol'), o.get('id'))
+            
+            legs = []
+            leg_symbols = []
+            for symbol, new_sl_price in updates.items():
+                market = markets[symbol]
+                pos = position_by_market.get(market)
+                if pos is None:
+                    logger.info("No open position for {}; skipping SL update", symbol)
+                    continue
+                legs.append({
+                    'symbol': market,
+                    'type': 'stop_market',
+                    'side': 'sell' if pos.get('side') == 'long' else 'buy',
+                    'amount': abs(pos['contracts']),
+                    'price': None,
+                    'params': {**self._vault_params, 'stopPrice': float(new_sl_price), 'reduceOnly': True},
+                })
+                leg_symbols.append(symbol)
+            if not legs:
+                return results
+            
+            stale = [
+                {'id': sl_by_market[markets[s]], 'symbol': markets[s]}
+                for s in leg_symbols if sl_by_market.get(markets[s])
+            ]
+            if stale:
+                try:
+                    if self.exchange.has.get('cancelOrdersForSymbols'):
+                        await self.exchange.cancel_orders_for_symbols(stale)
+                    else:
+                        await asyncio.gather(*(self.exchange.cancel_order(o['id'], o['symbol']) for o in stale))
+                    logger.info("Cancelled {} existing SL orders", len(stale))
+                except Exception as e:
+                    logger.warning(f"Failed to cancel existing SLs: {e}")
+            
+        except Exception as e:
+            logger.error(f"bulk_update_stop_loss failed: {e}")
+            return results
+        
+        try:
+            placed = await self.exchange.create_orders(legs)
+        except Exception as e:
+            # Old SLs may already be cancelled, so every leg goes through the single path
+            logger.error(f"Failed to create SL batch: {e}")
+            placed = []
+        
+        # Per-leg rejections come back as orders without an id; retry those one by one
+        placed = list(placed or [])
+        placed += [None] * (len(leg_symbols) - len(placed))
+        retry = []
+        for symbol, order in zip(leg_symbols, placed):
+            if order and order.get('id'):
+                logger.info("🔒 Updated SL for {} at {} (order {})", symbol, updates[symbol], order['id'])
+                results[symbol] = True
+            else:
+                retry.append(symbol)
+        if retry:
+            retried = await asyncio.gather(*(self.update_stop_loss(s, updates[s]) for s in retry))
+            results.update(zip(retry, retried))
+        return results
+    
     async def get_ticker(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Get ticker information for a symbol."""
         if not self._connected:
             await self.initialize()
         
         try:
-            ticker = self.exchange.fetch_ticker(f"{symbol}/USDC:USDC")
+            # Shared with order pricing, so a quote fetched here can be reused by create_order
+            ticker = await self._get_quote(_format_symbol(symbol))
+            # Falsy values (missing, None, 0) map to None, as before
+            get = ticker.get
+            info = get('info') or _NO_INFO
+            max_leverage = info.get('maxLeverage')
             return {
                 'symbol': symbol,
-                'price': Decimal(str(ticker['close'])) if ticker.get('close') else None,
-                'last': Decimal(str(ticker['last'])) if ticker.get('last') else None,
-                'bid': Decimal(str(ticker['bid'])) if ticker.get('bid') else None,
-                'ask': Decimal(str(ticker['ask'])) if ticker.get('ask') else None,
-                'volume': Decimal(str(ticker['quoteVolume'])) if ticker.get('quoteVolume') else None,
-                'change_24h': ticker.get('percentage'),
-                'previous_close': Decimal(str(ticker['previousClose'])) if ticker.get('previousClose') else None,
-                # Add Hyperliquid-specific fields from the info section
-                'mark_price': Decimal(str(ticker['info']['markPx'])) if ticker.get('info', {}).get('markPx') else None,
-                'mid_price': Decimal(str(ticker['info']['midPx'])) if ticker.get('info', {}).get('midPx') else None,
-                'oracle_price': Decimal(str(ticker['info']['oraclePx'])) if ticker.get('info', {}).get('oraclePx') else None,
-                'funding_rate': Decimal(str(ticker['info']['funding'])) if ticker.get('info', {}).get('funding') else None,
-                'open_interest': Decimal(str(ticker['info']['openInterest'])) if ticker.get('info', {}).get('openInterest') else None,
-                'max_leverage': int(ticker['info']['maxLeverage']) if ticker.get('info', {}).get('maxLeverage') else None,
+                'price': to_decimal(get('close') or None),
+                'last': to_decimal(get('last') or None),
+                'bid': to_decimal(get('bid') or None),
+                'ask': to_decimal(get('ask') or None),
+                'volume': to_decimal(get('quoteVolume') or None),
+                'change_24h': get('percentage'),
+                'previous_close': to_decimal(get('previousClose') or None),
+                # Hyperliquid-specific fields from the info section (exchange-native strings)
+                'mark_price': to_decimal(info.get('markPx') or None),
+                'mid_price': to_decimal(info.get('midPx') or None),
+                'oracle_price': to_decimal(info.get('oraclePx') or None),
+                'funding_rate': to_decimal(info.get('funding') or None),
+                'open_interest': to_decimal(info.get('openInterest') or None),
+                'max_leverage': int(max_leverage) if max_leverage else None,
             }
         except Exception as e:
             logger.error(f"Failed to get ticker for {symbol}: {e}")
             return None
     
-    def _map_order_status(self, ccxt_status: str) -> OrderStatus:
-        """Map CCXT order status to our enum."""
-        status_map = {
-            'open': OrderStatus.OPEN,
-            'closed': OrderStatus.FILLED,
-            'canceled': OrderStatus.CANCELLED,
-            'cancelled': OrderStatus.CANCELLED,
-            'rejected': OrderStatus.REJECTED,
-            'expired': OrderStatus.CANCELLED,
-        }
-        return status_map.get(ccxt_status, OrderStatus.PENDING)
+    # Kept for callers of the old method name
+    _map_order_status = staticmethod(_map_status)
     
     async def close(self) -> None:
         """Close exchange connection."""
+        if self._probe_task is not None and not self._probe_task.done():
+            self._probe_task.cancel()
+        
         if self.exchange:
             try:
-                # CCXT Hyperliquid doesn't have a close() method
-                # Just mark as disconnected
+                await self.exchange.close()
+                # ccxt does not close a session it was handed, so release ours here
+                if self._session:
+                    await self._session.close()
+                    self._session = None
                 self._connected = False
                 logger.info("Exchange connection closed")
             except Exception as e:
@@ -0,0 +1,63 @@
+"""
+Adaptive request pacing for exchange REST calls.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+from loguru import logger
+
+
+class AdaptiveRateLimiter:
+    """Space out requests, backing off on throttling responses and recovering after successes.
+
+    The gap between requests starts at ``min_interval``. A 429 doubles it (capped at
+    ``max_interval``); every ``recover_after`` consecutive successes halve it again,
+    never below ``min_interval``.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float = 2.0, recover_after: int = 10):
+        """Initialize the limiter."""
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.recover_after = recover_after
+        self.interval = min_interval
+        self.successive_errors = 0
+        self._successes = 0
+        self._next_slot = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def __call__(self, cost: Optional[float] = None) -> None:
+        """Alias for throttle() so the limiter can stand in for ccxt's throttler."""
+        await self.throttle(cost)
+
+    async def throttle(self, cost: Optional[float] = None) -> None:
+        """Wait for the next request slot; ``cost`` scales the slot for weighted endpoints."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            if wait > 0:
+                await asyncio.sleep(wait)
+                now = self._next_slot
+            self._next_slot = now + self.interval * (cost or 1)
+
+    def record(self, status_code: Optional[int]) -> None:
+        """Feed back the HTTP status of a completed request."""
+        if status_code == 429:
+            self.successive_errors += 1
+            self._successes = 0
+            widened = min(self.interval * 2, self.max_interval)
+            if widened != self.interval:
+                logger.warning(f"⚠️ Rate limited by exchange, spacing requests {widened * 1000:.0f}ms apart")
+            self.interval = widened
+            return
+
+        self.successive_errors = 0
+        self._successes += 1
+        if self._successes >= self.recover_after and self.interval > self.min_interval:
+            self._successes = 0
+            self.interval = max(self.interval / 2, self.min_interval)
+            logger.debug("Request spacing relaxed to {:.0f}ms", self.interval * 1000)
@@ -5,22 +5,51 @@ Cryptographic utilities for secure storage of sensitive configuration data.
 import os
 import base64
 import getpass
-from typing import Optional, Dict
+import hashlib
+from typing import Optional, Dict, List
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes, padding
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from loguru import logger
 
+try:
+    # PyCryptodome is an optional speedup: a thinner AES wrapper than cryptography's
+    # Cipher/mode/context object graph, producing identical ciphertext
+    from Crypto.Cipher import AES as _AES
+except ImportError:
+    _AES = None
+
+# Marks AES-256-GCM values; '~' is outside the base64 alphabet, so legacy
+# AES-256-CBC values (plain base64) can never start with it
+_GCM_PREFIX = '~'
+# Fernet values are base64(16-byte salt) + ':' + data, so the separator is always here
+_FERNET_SEP_AT = 24
+
 
 class SecretManager:
     """Manages encryption and decryption of sensitive configuration data."""
     
-    def __init__(self, master_password: Optional[str] = None, use_aes256: bool = True):
-        """Initialize SecretManager with master password and encryption method."""
+    # PBKDF2-HMAC-SHA256 rounds (increased from 100,000 for stronger security)
+    KDF_ITERATIONS = 500000
+    
+    def __init__(
+        self,
+        master_password: Optional[str] = None,
+        use_aes256: bool = True,
+        kdf_iterations: Optional[int] = None,
+    ):
+        """Initialize SecretManager with master password and encryption method.
+        
+        ``kdf_iterations`` overrides KDF_ITERATIONS (e.g. to speed up tests); values
+        encrypted with one setting only decrypt with the same setting.
+        """
         self.master_password = master_password
         self.use_aes256 = use_aes256  # Use AES-256 for longer, stronger encryption
+        self.kdf_iterations = kdf_iterations or self.KDF_ITERATIONS
         self._fernet: Optional[Fernet] = None
+        # PBKDF2 is deliberately slow (500k rounds), so each salt is derived once per process
+        self._password_bytes: Optional[bytes] = None
+        self._derived_keys: Dict[bytes, bytes] = {}
     
     def _get_master_password(self) -> str:
         """Get master password from environment or prompt user."""
@@ -35,16 +64,28 @@ class SecretManager:
         # Prompt user if not found
         return getpass.getpass("Enter master password for secret decryption: ")
     
+    def _get_password_bytes(self) -> bytes:
+        """Master password as UTF-8, resolved (and prompted for) only once."""
+        if self._password_bytes is None:
+            self._password_bytes = self._get_master_password().encode('utf-8')
+        return self._password_bytes
+    
+    def _get_aes_key(self, salt: bytes) -> bytes:
+        """Raw 32-byte key for ``salt``, derived from the master password on first use."""
+        key = self._derived_keys.get(salt)
+        if key is None:
+            # hashlib runs the whole loop inside OpenSSL (PKCS5_PBKDF2_HMAC), using its
+            # hardware-accelerated SHA-256 where the CPU has it
+            key = self._derived_keys[salt] = hashlib.pbkdf2_hmac(
+                'sha256', self._get_password_bytes(), salt, self.kdf_iterations, dklen=32
+            )
+        return key
+    
     def _derive_key(self, password: str, salt: bytes) -> bytes:
         """Derive encryption key from password and salt with stronger settings."""
         password_bytes = password.encode('utf-8')
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=500000,  # Increased from 100,000 to 500,000 for stronger security
-        )
-        return base64.urlsafe_b64encode(kdf.derive(password_bytes))
+        key = hashlib.pbkdf2_hmac('sha256', password_bytes, salt, self.kdf_iterations, dklen=32)
+        return base64.urlsafe_b64encode(key)
     
     def _get_fernet(self, salt: Optional[bytes] = None) -> Fernet:
         """Get or create Fernet cipher instance."""
@@ -64,7 +105,8 @@ class SecretManager:
         """
         Encrypt a secret string using AES-256 or Fernet.
         
-        Returns: base64 encoded string in format: salt:encrypted_data
+        Returns: ``~``-prefixed base64 for AES-256-GCM, or ``salt:encrypted_data``
+        for Fernet
         """
         if salt is None:
             salt = os.urandom(16)
@@ -74,41 +116,48 @@ class SecretManager:
         else:
             return self._encrypt_fernet(secret, salt)
     
-    def _encrypt_aes256(self, secret: str, salt: bytes) -> str:
-        """Encrypt using AES-256-CBC for longer, stronger encryption."""
-        # Derive 32-byte key for AES-256
-        password = self._get_master_password()
-        password_bytes = password.encode('utf-8')
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,  # 256 bits
-            salt=salt,
-            iterations=500000,
-        )
-        key = kdf.derive(password_bytes)
+    def encrypt_batch(self, secrets: List[str], salt: Optional[bytes] = None) -> List[str]:
+        """Encrypt several secrets under one salt, so the key is derived only once.
         
-        # Generate random IV
-        iv = os.urandom(16)
+        Each value still gets its own random IV; the output format is the same
+        as encrypt_secret().
+        """
+        if salt is None:
+            salt = os.urandom(16)
+        return [self.encrypt_secret(secret, salt) for secret in secrets]
+    
+    def decrypt_batch(self, encrypted_secrets: List[str]) -> List[str]:
+        """Decrypt several secrets; values sharing a salt share one key derivation."""
+        return [self.decrypt_secret(value) for value in encrypted_secrets]
+    
+    def _encrypt_aes256(self, secret: str, salt: bytes) -> str:
+        """Encrypt using AES-256-GCM (authenticated, no padding)."""
+        # 32-byte key for AES-256
+        return self._encrypt_aes256_with_key(secret, self._get_aes_key(salt), salt)
+    
+    def _encrypt_aes256_with_key(self, secret: str, key: bytes, salt: bytes) -> str:
+        """AES-256-GCM with an already derived key; ``salt`` is only embedded in the output.
         
-        # Pad the secret to block size
-        padder = padding.PKCS7(128).padder()
-        padded_data = padder.update(secret.encode('utf-8'))
-        padded_data += padder.finalize()
+        Returns ``~`` + base64(salt + nonce + ciphertext + tag).
+        """
+        # 96-bit random nonce, the GCM standard size
+        nonce = os.urandom(12)
+        data = secret.encode('utf-8')
         
-        # Encrypt with AES-256-CBC
-        cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
-        encryptor = cipher.encryptor()
-        encrypted_data = encryptor.update(padded_data) + encryptor.finalize()
+        if _AES is not None:
+            encrypted_data, tag = _AES.new(key, _AES.MODE_GCM, nonce=nonce).encrypt_and_digest(data)
+            encrypted_data += tag
+        else:
+            # Ciphertext with the 16-byte tag appended
+            encrypted_data = AESGCM(key).encrypt(nonce, data, None)
         
-        # Combine salt + iv + encrypted_data
-        combined = salt + iv + encrypted_data
-        return base64.b64encode(combined).decode('utf-8')
+        combined = salt + nonce + encrypted_data
+        return _GCM_PREFIX + base64.b64encode(combined).decode('utf-8')
     
     def _encrypt_fernet(self, secret: str, salt: bytes) -> str:
         """Encrypt using Fernet (AES-128) - shorter output."""
-        password = self._get_master_password()
-        key = self._derive_key(password, salt)
-        fernet = Fernet(key)
+        # Same PBKDF2 parameters as _derive_key, so the cached raw key can be reused
+        fernet = Fernet(base64.urlsafe_b64encode(self._get_aes_key(salt)))
         
         encrypted_data = fernet.encrypt(secret.encode('utf-8'))
         
@@ -124,18 +173,45 @@ class SecretManager:
             encrypted_secret: base64 encoded string (AES-256 or Fernet format)
         """
         try:
-            # Check if it's Fernet format (has ':' separator)
-            if ':' in encrypted_secret:
+            # Format is fixed by the first character or the separator position, no scanning
+            if encrypted_secret[:1] == _GCM_PREFIX:
+                return self._decrypt_aes256_gcm(encrypted_secret)
+            if encrypted_secret[_FERNET_SEP_AT:_FERNET_SEP_AT + 1] == ':':
                 return self._decrypt_fernet(encrypted_secret)
-            else:
-                return self._decrypt_aes256(encrypted_secret)
+            return self._decrypt_aes256(encrypted_secret)
                 
         except Exception as e:
             logger.error(f"Failed to decrypt secret: {e}")
             raise ValueError("Failed to decrypt secret - check master password")
     
+    def _decrypt_aes256_gcm(self, encrypted_secret: str) -> str:
+        """Decrypt AES-256-GCM data, verifying its authentication tag."""
+        try:
+            combined = base64.b64decode(encrypted_secret[len(_GCM_PREFIX):].encode('utf-8'))
+            
+            # Extract components
+            salt = combined[:16]           # First 16 bytes
+            nonce = combined[16:28]        # Next 12 bytes
+            encrypted_data = combined[28:]  # Ciphertext + 16-byte tag
+            
+            key = self._get_aes_key(salt)
+            
+            # Both raise on a tag mismatch (wrong password or tampered value)
+            if _AES is not None:
+                data = _AES.new(key, _AES.MODE_GCM, nonce=nonce).decrypt_and_verify(
+                    encrypted_data[:-16], encrypted_data[-16:]
+                )
+            else:
+                data = AESGCM(key).decrypt(nonce, encrypted_data, None)
+            
+            return data.decode('utf-8')
+            
+        except Exception as e:
+            logger.error(f"Failed to decrypt AES-256-GCM data: {e}")
+            raise
+    
     def _decrypt_aes256(self, encrypted_secret: str) -> str:
-        """Decrypt AES-256-CBC encrypted data."""
+        """Decrypt AES-256-CBC encrypted data (legacy format)."""
         try:
             # Decode the combined data
             combined = base64.b64decode(encrypted_secret.encode('utf-8'))
@@ -146,27 +222,17 @@ class SecretManager:
             encrypted_data = combined[32:]  # Rest is encrypted data
             
             # Derive the same key
-            password = self._get_master_password()
-            password_bytes = password.encode('utf-8')
-            kdf = PBKDF2HMAC(
-                algorithm=hashes.SHA256(),
-                length=32,
-                salt=salt,
-                iterations=500000,
-            )
-            key = kdf.derive(password_bytes)
+            key = self._get_aes_key(salt)
             
             # Decrypt
-            cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
-            decryptor = cipher.decryptor()
-            padded_data = decryptor.update(encrypted_data) + decryptor.finalize()
+            if _AES is not None:
+                padded_data = _AES.new(key, _AES.MODE_CBC, iv).decrypt(encrypted_data)
+            else:
+                decryptor = Cipher(algorithms.AES(key), modes.CBC(iv)).decryptor()
+                padded_data = decryptor.update(encrypted_data) + decryptor.finalize()
             
             # Remove padding
-            unpadder = padding.PKCS7(128).unpadder()
-            data = unpadder.update(padded_data)
-            data += unpadder.finalize()
-            
-            return data.decode('utf-8')
+            return _pkcs7_unpad(padded_data).decode('utf-8')
             
         except Exception as e:
             logger.error(f"Failed to decrypt AES-256 data: {e}")
@@ -175,15 +241,12 @@ class SecretManager:
     def _decrypt_fernet(self, encrypted_secret: str) -> str:
         """Decrypt Fernet encrypted data (legacy format)."""
         try:
-            # Split salt and encrypted data
-            salt_b64, data_b64 = encrypted_secret.split(':', 1)
-            salt = base64.b64decode(salt_b64.encode('utf-8'))
-            encrypted_data = base64.b64decode(data_b64.encode('utf-8'))
+            # Salt and encrypted data sit either side of the fixed-position separator
+            salt = base64.b64decode(encrypted_secret[:_FERNET_SEP_AT])
+            encrypted_data = base64.b64decode(encrypted_secret[_FERNET_SEP_AT + 1:])
             
             # Create Fernet instance with the salt
-            password = self._get_master_password()
-            key = self._derive_key(password, salt)
-            fernet = Fernet(key)
+            fernet = Fernet(base64.urlsafe_b64encode(self._get_aes_key(salt)))
             
             # Decrypt the data
             decrypted_data = fernet.decrypt(encrypted_data)
@@ -197,34 +260,25 @@ class SecretManager:
         """Check if a value is encrypted (detects both AES-256 and Fernet formats)."""
         if not value:
             return False
-        
-        try:
-            # Check for Fernet format (has ':' separator)
-            if ':' in value:
-                parts = value.split(':', 1)
-                if len(parts) != 2:
-                    return False
-                # Try to decode both parts as base64
-                base64.b64decode(parts[0])
-                base64.b64decode(parts[1])
-                return True
-            else:
-                # Check for AES-256 format (single base64 string, minimum length)
-                decoded = base64.b64decode(value)
-                # AES-256 format: 16 bytes salt + 16 bytes IV + at least 16 bytes data = 48+ bytes
-                return len(decoded) >= 48
-        except:
-            return False
+        return _looks_encrypted(value)
     
     def encrypt_config_dict(self, config_dict: Dict[str, str], sensitive_keys: list) -> Dict[str, str]:
         """Encrypt sensitive keys in a configuration dictionary."""
         encrypted_config = config_dict.copy()
         
+        # One salt for the whole dict: a single key derivation covers every value
+        salt = os.urandom(16)
+        aes_key = self._get_aes_key(salt) if self.use_aes256 else None
+        
         for key in sensitive_keys:
-            if key in encrypted_config and encrypted_config[key]:
-                if not self.is_encrypted(encrypted_config[key]):
+            value = encrypted_config.get(key)
+            if value:
+                if not self.is_encrypted(value):
                     logger.info(f"🔐 Encrypting {key}")
-                    encrypted_config[key] = self.encrypt_secret(encrypted_config[key])
+                    if aes_key is not None:
+                        encrypted_config[key] = self._encrypt_aes256_with_key(value, aes_key, salt)
+                    else:
+                        encrypted_config[key] = self.encrypt_secret(value, salt)
                 else:
                     logger.debug(f"🔓 {key} already encrypted")
         
@@ -243,6 +297,51 @@ class SecretManager:
         return decrypted_config
 
 
+def _pkcs7_unpad(data: bytes) -> bytes:
+    """Strip PKCS7 padding, rejecting malformed padding (e.g. from a wrong key)."""
+    pad = data[-1] if data else 0
+    if not 1 <= pad <= 16 or len(data) % 16 or data[-pad:] != bytes((pad,)) * pad:
+        raise ValueError("Invalid padding bytes.")
+    return data[:-pad]
+
+
+def _looks_encrypted(value: str) -> bool:
+    """Format check behind SecretManager.is_encrypted.
+    
+    Deliberately not memoized: the values checked include plaintext keys, which
+    must not be kept alive as cache keys.
+    """
+    if value[:1] == _GCM_PREFIX:
+        return _is_gcm_token(value)
+    # Strict decoding: plain base64 would silently skip non-alphabet characters
+    # and accept arbitrary plaintext of the right length
+    try:
+        # Fernet format: base64 salt, ':' at a fixed offset, base64 token
+        if value[_FERNET_SEP_AT:_FERNET_SEP_AT + 1] == ':':
+            return (
+                len(base64.b64decode(value[:_FERNET_SEP_AT], validate=True)) == 16
+                and bool(base64.b64decode(value[_FERNET_SEP_AT + 1:], validate=True))
+            )
+        # Check for AES-256 format (single base64 string, minimum length)
+        decoded = base64.b64decode(value, validate=True)
+        # AES-256 format: 16 bytes salt + 16 bytes IV + at least 16 bytes data = 48+ bytes
+        return len(decoded) >= 48
+    except:
+        return False
+
+
+def _is_gcm_token(value: str) -> bool:
+    """Whether ``value`` parses as an AES-256-GCM token written by this module."""
+    if value[:1] != _GCM_PREFIX:
+        return False
+    try:
+        combined = base64.b64decode(value[1:], validate=True)
+    except ValueError:
+        return False
+    # 16 bytes salt + 12 bytes nonce + 16 bytes tag (+ ciphertext, empty for an empty secret)
+    return len(combined) >= 44
+
+
 # Global instance
 _secret_manager: Optional[SecretManager] = None
 
@@ -3,47 +3,63 @@ Dynamic symbol resolver for Hyperliquid exchange.
 Replaces hardcoded symbol mappings with live symbol checking.
 """
 
-from typing import Optional, Set
+import time
+from typing import Dict, FrozenSet, Optional
 from loguru import logger
 
+_PERP_SUFFIX = '/USDC:USDC'
+
 
 class SymbolResolver:
     """Dynamic symbol resolver that checks symbol existence on exchange."""
     
+    # Seconds the symbol set is reused before markets are reloaded
+    CACHE_TTL = 60.0
+    
     def __init__(self, exchange=None):
         """Initialize with exchange instance."""
         self.exchange = exchange
-        self._available_symbols: Optional[Set[str]] = None
+        self._available_symbols: Optional[FrozenSet[str]] = None
+        # Upper-case signal symbol -> listed symbol (itself, or its kilo-token kXXX/KXXX form)
+        self._resolution: Dict[str, str] = {}
+        self._cache_expiry = 0.0
     
     def set_exchange(self, exchange):
         """Set the exchange instance."""
+        if exchange is self.exchange:
+            return
         self.exchange = exchange
         self._available_symbols = None  # Reset cache when exchange changes
+        self._cache_expiry = 0.0
     
-    async def get_available_symbols(self) -> Set[str]:
-        """Get all available symbols from exchange."""
+    async def get_available_symbols(self, refresh: bool = False) -> FrozenSet[str]:
+        """Get all available symbols from exchange.
+        
+        The set is cached for CACHE_TTL seconds; ``refresh`` forces a market reload
+        (e.g. to pick up a coin listed since the last load).
+        """
         if not self.exchange:
             logger.warning("⚠️ No exchange set, cannot check symbols")
-            return set()
+            return frozenset()
+        
+        if not refresh and self._available_symbols is not None and time.monotonic() < self._cache_expiry:
+            return self._available_symbols
         
         try:
             logger.debug("🔍 Loading markets from exchange...")
-            markets = self.exchange.load_markets()
+            markets = await self.exchange.load_markets(reload=self._available_symbols is not None)
             logger.debug(f"📊 Found {len(markets)} total markets")
             
             # Look for k-markets specifically in raw markets (case insensitive)
-            k_markets = [m for m in markets.keys() if m.upper().startswith('K') and '/USDC:USDC' in m]
+            k_markets = [m for m in markets.keys() if m.upper().startswith('K') and m.endswith(_PERP_SUFFIX)]
             if k_markets:
                 logger.info(f"🔍 Raw k-markets found: {k_markets[:5]}...")
             else:
                 logger.warning("⚠️ No k-markets found in raw markets!")
             
             # Extract symbols (remove /USDC:USDC suffix)
-            symbols = set()
-            for market_symbol in markets.keys():
-                if '/USDC:USDC' in market_symbol:
-                    symbol = market_symbol.split('/')[0]
-                    symbols.add(symbol)
+            cut = -len(_PERP_SUFFIX)
+            symbols = frozenset(m[:cut] for m in markets if m.endswith(_PERP_SUFFIX))
             
             logger.info(f"✅ Extracted {len(symbols)} perpetual symbols")
             
@@ -61,11 +77,13 @@ class SymbolResolver:
                 logger.warning("⚠️ No symbols extracted from markets!")
             
             self._available_symbols = symbols
+            self._resolution = _build_resolution(symbols)
+            self._cache_expiry = time.monotonic() + self.CACHE_TTL
             return symbols
             
         except Exception as e:
             logger.error(f"❌ Failed to get available symbols: {e}")
-            return set()
+            return frozenset()
     
     async def resolve_symbol(self, symbol: str) -> Optional[str]:
         """
@@ -79,10 +97,11 @@ class SymbolResolver:
         if not symbol:
             return None
         
-        symbol = symbol.upper().strip()
+        symbol = _canonical(symbol)
         logger.info(f"🔍 Resolving symbol: {symbol}")
         
-        # Get available symbols (fresh each time - no caching due to new coins)
+        # Cached for CACHE_TTL; a miss below forces one reload in case the coin is new
+        fresh = self._available_symbols is None or time.monotonic() >= self._cache_expiry
         available_symbols = await self.get_available_symbols()
         
         if not available_symbols:
@@ -94,24 +113,21 @@ class SymbolResolver:
         
         logger.info(f"📋 Checking against {len(available_symbols)} available symbols")
         
-        # Step 1: Check if original symbol exists
-        if symbol in available_symbols:
+        # Steps 1-2: the symbol as-is or its k-prefixed form, in one lookup
+        resolved = self._resolution.get(symbol)
+        if resolved is None and not fresh:
+            logger.info(f"🔄 {symbol} not in cached markets, reloading")
+            available_symbols = await self.get_available_symbols(refresh=True)
+            resolved = self._resolution.get(symbol)
+        if resolved == symbol:
             logger.info(f"✅ Symbol exists as-is: {symbol}")
             return symbol
-        
-        # Step 2: Check if k-prefixed version exists (try both cases)
-        k_symbol_lower = f"k{symbol}"  # kPEPE
-        k_symbol_upper = f"K{symbol}"  # KPEPE
-        
-        if k_symbol_lower in available_symbols:
-            logger.info(f"🔄 Mapped symbol {symbol} → {k_symbol_lower}")
-            return k_symbol_lower
-        elif k_symbol_upper in available_symbols:
-            logger.info(f"🔄 Mapped symbol {symbol} → {k_symbol_upper}")
-            return k_symbol_upper
+        if resolved is not None:
+            logger.info(f"🔄 Mapped symbol {symbol} → {resolved}")
+            return resolved
         
         # Step 3: Symbol not found - log available symbols for debugging
-        logger.warning(f"❌ Symbol not found: {symbol} (checked {symbol}, {k_symbol_lower}, and {k_symbol_upper})")
+        logger.warning(f"❌ Symbol not found: {symbol} (checked {symbol}, k{symbol}, and K{symbol})")
         logger.debug(f"🔍 Available symbols: {sorted(list(available_symbols))[:20]}...")  # Show first 20
         return None
     
@@ -121,6 +137,32 @@ class SymbolResolver:
         return resolved is not None
 
 
+def _canonical(symbol: str) -> str:
+    """Upper-cased, stripped symbol; already-canonical input (the usual case) is returned as-is."""
+    if symbol.isupper() and not symbol[0].isspace() and not symbol[-1].isspace():
+        return symbol
+    return symbol.upper().strip()
+
+
+def _build_resolution(symbols: FrozenSet[str]) -> Dict[str, str]:
+    """Map each resolvable upper-case symbol to the listed market symbol.
+    
+    Precedence matches the original lookup order: the symbol as-is, then the
+    kilo-token form with a lowercase 'k' (kPEPE), then with an uppercase 'K'.
+    """
+    resolution: Dict[str, str] = {}
+    # Lowest precedence first so later passes overwrite
+    for prefix in ('K', 'k'):
+        for listed in symbols:
+            base = listed[1:]
+            if listed[:1] == prefix and base and base == base.upper():
+                resolution[base] = listed
+    for listed in symbols:
+        if listed == listed.upper():
+            resolution[listed] = listed
+    return resolution
+
+
 # Global resolver instance
 _global_resolver = SymbolResolver()
 
@@ -3,24 +3,97 @@ Background trailing stop service.
 """
 
 import asyncio
+import re
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 from loguru import logger
 
 from ..models.config import TradingConfig
 from ..trading import HyperliquidExchange
-from ..models.trading import SignalType
+from ..models.trading import Position, SignalType, with_slots
 
+# Position sides trailed from below (stop under price)
+_LONG_SIDES = frozenset((SignalType.LONG, SignalType.BUY))
 
+# Decimal/exponent strings float() accepts (exchange prices are plain decimal strings)
+_NUMERIC_RE = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+
+
+@with_slots
 @dataclass
 class TrailingState:
     highest_price: float
     lowest_price: float
 
 
+def _compute_desired_sl(
+    is_long: bool, entry: float, current: float, extreme: float,
+    activation_pct: float, distance_pct: float,
+) -> Tuple[float, float, Optional[float]]:
+    """Pure per-position trailing math, kept free of I/O and logging.
+
+    ``extreme`` is the highest price seen for a long (lowest for a short).
+    Returns ``(extreme, activation, desired_sl)`` with the extreme updated for
+    ``current``; ``desired_sl`` is None until the activation threshold is reached.
+    """
+    # +1 for longs, -1 for shorts: multiplying by sign turns every short comparison
+    # into the long one (lowest price == highest of the negated prices)
+    sign = 1.0 if is_long else -1.0
+    if sign * current > sign * extreme:
+        extreme = current
+    # Only activate trailing after activation threshold in profit
+    activation = entry * (1 + sign * activation_pct)
+    if sign * current < sign * activation:
+        return extreme, activation, None
+    # Desired SL = extreme, pulled back by distance towards entry
+    return extreme, activation, extreme * (1 - sign * distance_pct)
+
+
+def _scan_stops(open_orders: Optional[List[Dict[str, Any]]]) -> Tuple[Optional[float], Optional[float]]:
+    """Existing (SL, TP) from a symbol's open orders, to compare and enforce monotonic move.
+
+    The last stop order wins for the SL and the first one for the TP, so every order
+    has to be scanned.
+    """
+    current_sl: Optional[float] = None
+    current_tp: Optional[float] = None
+    for o in open_orders or ():
+        info = o.get('info')
+        if not info:
+            continue
+        # Identify SL
+        sl_val = info.get('stopPrice') or info.get('stopLossPrice')
+        if sl_val:
+            current_sl = _safe_float(sl_val)
+        # Identify TP (may be set via takeProfitPrice)
+        if current_tp is None:
+            current_tp = _safe_float(info.get('takeProfitPrice'))
+    return current_sl, current_tp
+
+
+def _safe_float(value: Any) -> Optional[float]:
+    """``value`` as a float, or None when missing, zero or not numeric."""
+    if not value:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and _NUMERIC_RE.fullmatch(value):
+        # Validated up front, so float() can't raise on this path
+        return float(value)
+    return None
+
+
 class TrailingStopService:
     """Polls positions and adjusts stop-loss upwards (or downwards for shorts)."""
 
+    # Seconds a known SL/TP is trusted before open orders are scanned again
+    # (catches stops moved or cancelled outside this service)
+    SL_CACHE_TTL = 60.0
+    # Poll interval floor while prices are streamed; ticks then only reconcile
+    # positions and catch anything the stream missed
+    RECONCILE_INTERVAL = 30.0
+
     def __init__(self, exchange: HyperliquidExchange, config: TradingConfig):
         self.exchange = exchange
         self.config = config
@@ -28,6 +101,19 @@ class TrailingStopService:
         self._running = False
         # Symbol → state to track recent extremes
         self._state: dict[str, TrailingState] = {}
+        # Symbol → (current SL, current TP, monotonic time seen) from the last scan or update
+        self._last_sl: Dict[str, Tuple[Optional[float], Optional[float], float]] = {}
+        self._update_slots: Optional[asyncio.Semaphore] = None
+        self._update_lock: Optional[asyncio.Lock] = None
+        # Open positions from the last tick, by symbol
+        self._positions: Dict[str, Position] = {}
+        self._stream_task: Optional[asyncio.Task] = None
+        self._streaming = False
+        # SL batch in flight; shielded, since cancelling it between the cancel of the
+        # old stops and the create of the new ones would leave positions unprotected
+        self._sl_update: Optional[asyncio.Future] = None
+        # Set to run the next tick right away instead of at the end of the interval
+        self._wakeup: Optional[asyncio.Event] = None
 
     def start(self) -> None:
         if not self.config.trailing_stop_enabled:
@@ -37,126 +123,297 @@ class TrailingStopService:
             return
         self._running = True
         self._task = asyncio.create_task(self._run())
-        logger.info("📈 TrailingStopService started")
+        self._streaming = self.exchange.can_stream_prices
+        if self._streaming:
+            self._stream_task = asyncio.create_task(self._stream_prices())
+        logger.info("📈 TrailingStopService started (price stream: {})", self._streaming)
 
     async def stop(self) -> None:
+        """Stop both loops; returns once no exchange call of this service is left running."""
         self._running = False
         if self._task:
-            try:
-                await asyncio.wait_for(self._task, timeout=2)
-            except Exception:
-                pass
+            # Cancel right away instead of waiting out an in-flight tick; CancelledError
+            # is a BaseException on 3.8+, so _run's error handling doesn't swallow it
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._stream_task:
+            self._stream_task.cancel()
+            await asyncio.gather(self._stream_task, return_exceptions=True)
+            self._stream_task = None
+        # Cancellation does not reach a shielded SL batch, so let one that started finish
+        if self._sl_update is not None:
+            await asyncio.gather(self._sl_update, return_exceptions=True)
+            self._sl_update = None
         logger.info("🛑 TrailingStopService stopped")
 
+    def notify_position_change(self) -> None:
+        """Wake the loop for an immediate tick, e.g. after a signal opened or closed a position."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
     async def _run(self) -> None:
-        interval = self.config.trailing_check_interval_seconds
+        loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        stalled = False
         while self._running:
+            interval = self.config.trailing_check_interval_seconds
+            if self._streaming:
+                interval = max(interval, self.RECONCILE_INTERVAL)
+            started = loop.time()
             try:
                 await self._tick()
             except Exception as e:
                 logger.error(f"TrailingStopService tick error: {e}")
-            await asyncio.sleep(interval)
+                self._last_sl.clear()
+            # Sleep only the rest of the interval so ticks keep the configured cadence;
+            # notify_position_change() cuts the wait short
+            elapsed = loop.time() - started
+            if elapsed < interval:
+                stalled = False
+                wait = interval - elapsed
+            elif not stalled:
+                # First overrun: one catch-up tick right away, warned once per stall
+                logger.warning(f"[Trailing] tick took {elapsed:.2f}s (interval {interval}s), running one catch-up tick")
+                stalled = True
+                wait = 0.0
+            else:
+                # Still stalled: rest a full interval rather than firing ticks back-to-back
+                wait = interval
+            if wait > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(0)
+            self._wakeup.clear()
 
     async def _tick(self) -> None:
-        positions = await self.exchange.get_positions()
+        orders_by_symbol: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        if any(self._known_stops(symbol) is None for symbol in self._positions):
+            # Open orders will be needed for a known position: fetch them alongside
+            # the positions rather than after them
+            positions, orders_by_symbol = await asyncio.gather(
+                self.exchange.get_positions(), self._fetch_open_orders_by_symbol(),
+            )
+        else:
+            positions = await self.exchange.get_positions()
+        # A closed position's stops are gone with it; a new one starts from a fresh scan
+        open_symbols = {pos.symbol for pos in positions}
+        for symbol in [s for s in self._last_sl if s not in open_symbols]:
+            del self._last_sl[symbol]
+        # Remembered so streamed prices can be matched to entry and side between ticks
+        self._positions = {pos.symbol: pos for pos in positions}
+        # Config read once per tick, not per position
+        activation_pct = self.config.trailing_activation_percent
+        distance_pct = self.config.trailing_distance_percent
+        todo: List[Tuple[str, float, bool, float]] = []
         for pos in positions:
-            symbol = pos.symbol
-            entry = float(pos.entry_price)
-            current = float(pos.current_price or pos.entry_price)
-
-            if symbol not in self._state:
-                self._state[symbol] = TrailingState(highest_price=current, lowest_price=current)
-            state = self._state[symbol]
-
-            if pos.side in [SignalType.LONG, SignalType.BUY]:
-                # Update highest
-                if current > state.highest_price:
-                    state.highest_price = current
-                # Only activate trailing after activation threshold in profit
-                activation = entry * (1 + self.config.trailing_activation_percent)
-                if current < activation:
-                    logger.info(
-                        f"[Trailing] {symbol} LONG | price={current:.6f} | entry={entry:.6f} | "
-                        f"activation>={activation:.6f} | highest={state.highest_price:.6f} | decision=not_activated"
-                    )
-                    continue
-                # Desired SL = highest - distance
-                desired_sl = state.highest_price * (1 - self.config.trailing_distance_percent)
-                logger.info(
-                    f"[Trailing] {symbol} LONG | price={current:.6f} | entry={entry:.6f} | "
-                    f"highest={state.highest_price:.6f} | desired_sl={desired_sl:.6f}"
-                )
-                # Only move SL up in steps
-                await self._maybe_update_sl(symbol, desired_sl, is_long=True, current_price=current)
-            else:
-                # SHORT: track lowest
-                if current < state.lowest_price:
-                    state.lowest_price = current
-                activation = entry * (1 - self.config.trailing_activation_percent)
-                if current > activation:
-                    logger.info(
-                        f"[Trailing] {symbol} SHORT | price={current:.6f} | entry={entry:.6f} | "
-                        f"activation<={activation:.6f} | lowest={state.lowest_price:.6f} | decision=not_activated"
+            item = self._advance(
+                pos, float(pos.current_price or pos.entry_price), activation_pct, distance_pct,
+            )
+            if item is not None:
+                todo.append(item)
+        await self._process(todo, orders_by_symbol)
+
+    async def _stream_prices(self) -> None:
+        """React to pushed mid prices between ticks, for positions whose extreme advanced."""
+        while self._running:
+            positions = self._positions
+            if not positions:
+                # Nothing to trail until a tick finds open positions
+                await asyncio.sleep(self.config.trailing_check_interval_seconds)
+                continue
+            try:
+                prices = await self.exchange.watch_mid_prices(list(positions))
+            except Exception as e:
+                logger.warning(f"[Trailing] price stream failed, polling only: {e}")
+                self._streaming = False
+                return
+            activation_pct = self.config.trailing_activation_percent
+            distance_pct = self.config.trailing_distance_percent
+            todo: List[Tuple[str, float, bool, float]] = []
+            for symbol, price in prices.items():
+                pos = positions.get(symbol)
+                if pos is not None:
+                    item = self._advance(pos, price, activation_pct, distance_pct, moved_only=True)
+                    if item is not None:
+                        todo.append(item)
+            try:
+                await self._process(todo)
+            except Exception as e:
+                logger.error(f"TrailingStopService stream update error: {e}")
+                self._last_sl.clear()
+
+    def _advance(
+        self, pos: Position, current: float, activation_pct: float, distance_pct: float,
+        moved_only: bool = False,
+    ) -> Optional[Tuple[str, float, bool, float]]:
+        """Track ``current`` in the position's extremes and return its SL target, if activated.
+
+        Returns ``(symbol, desired_sl, is_long, current)``; with ``moved_only`` the
+        target is returned only when the extreme advanced (otherwise it can't move).
+        """
+        symbol = pos.symbol
+        entry = float(pos.entry_price)
+
+        if symbol not in self._state:
+            self._state[symbol] = TrailingState(highest_price=current, lowest_price=current)
+        state = self._state[symbol]
+
+        is_long = pos.side in _LONG_SIDES
+        previous = state.highest_price if is_long else state.lowest_price
+        extreme, activation, desired_sl = _compute_desired_sl(
+            is_long, entry, current, previous, activation_pct, distance_pct,
+        )
+        if is_long:
+            state.highest_price = extreme
+            side, reached, label = 'LONG', '>=', 'highest'
+        else:
+            state.lowest_price = extreme
+            side, reached, label = 'SHORT', '<=', 'lowest'
+        if moved_only and extreme == previous:
+            return None
+        if desired_sl is None:
+            logger.info(
+                "[Trailing] {} {} | price={:.6f} | entry={:.6f} | "
+                "activation{}{:.6f} | {}={:.6f} | decision=not_activated",
+                symbol, side, current, entry, reached, activation, label, extreme,
+            )
+            return None
+        logger.info(
+            "[Trailing] {} {} | price={:.6f} | entry={:.6f} | {}={:.6f} | desired_sl={:.6f}",
+            symbol, side, current, entry, label, extreme, desired_sl,
+        )
+        # Only move SL towards profit (up for longs, down for shorts) in steps
+        return symbol, desired_sl, is_long, current
+
+    async def _process(
+        self, todo: List[Tuple[str, float, bool, float]],
+        orders_by_symbol: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    ) -> None:
+        """Step-gate the activated positions and push every due SL in one batch.
+
+        ``orders_by_symbol`` is an already fetched open-orders snapshot, if any.
+        """
+        if not todo:
+            return
+        # Ticks and streamed prices must not move the same stop at once
+        if self._update_lock is None:
+            self._update_lock = asyncio.Lock()
+        async with self._update_lock:
+            # One bulk open-orders request covers every symbol whose stops aren't cached
+            if orders_by_symbol is None and any(self._known_stops(t[0]) is None for t in todo):
+                orders_by_symbol = await self._fetch_open_orders_by_symbol()
+            # Positions are independent, so their SL checks run concurrently
+            results = await asyncio.gather(
+                *(
+                    self._maybe_update_sl(
+                        symbol, desired_sl, is_long, current,
+                        open_orders=orders_by_symbol.get(symbol, []) if orders_by_symbol is not None else None,
                     )
-                    continue
-                desired_sl = state.lowest_price * (1 + self.config.trailing_distance_percent)
-                logger.info(
-                    f"[Trailing] {symbol} SHORT | price={current:.6f} | entry={entry:.6f} | "
-                    f"lowest={state.lowest_price:.6f} | desired_sl={desired_sl:.6f}"
-                )
-                await self._maybe_update_sl(symbol, desired_sl, is_long=False, current_price=current)
-
-    async def _maybe_update_sl(self, symbol: str, desired_sl: float, is_long: bool, current_price: float) -> None:
+                    for symbol, desired_sl, is_long, current in todo
+                ),
+                return_exceptions=True,
+            )
+            pending: Dict[str, float] = {}
+            for (symbol, *_), result in zip(todo, results):
+                if isinstance(result, Exception):
+                    logger.error(f"TrailingStopService update error: {result}")
+                elif result is not None:
+                    pending[symbol] = result
+            if pending:
+                self._sl_update = asyncio.ensure_future(self._apply_sl_updates(pending))
+                await asyncio.shield(self._sl_update)
+
+    def _known_stops(self, symbol: str) -> Optional[Tuple[Optional[float], Optional[float]]]:
+        """Cached (SL, TP) for ``symbol`` if still within SL_CACHE_TTL, else None."""
+        known = self._last_sl.get(symbol)
+        if known is not None and time.monotonic() - known[2] < self.SL_CACHE_TTL:
+            return known[0], known[1]
+        return None
+
+    async def _fetch_open_orders_by_symbol(self) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """All open orders in one request, bucketed by base symbol; None if the fetch fails."""
+        try:
+            orders = await self.exchange.get_open_orders()
+        except Exception as e:
+            logger.warning(f"[Trailing] bulk open-orders fetch failed, falling back per symbol: {e}")
+            return None
+        by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+        for o in orders or []:
+            # ccxt market id "ETH/USDC:USDC" -> position symbol "ETH"
+            base = (o.get('symbol') or '').split('/', 1)[0]
+            by_symbol.setdefault(base, []).append(o)
+        return by_symbol
+
+    async def _maybe_update_sl(
+        self, symbol: str, desired_sl: float, is_long: bool, current_price: float,
+        open_orders: Optional[List[Dict[str, Any]]] = None,
+    ) -> Optional[float]:
+        """Step-gate ``desired_sl`` against the current SL; returns it if the SL should move."""
+        if self._update_slots is None:
+            self._update_slots = asyncio.Semaphore(self.config.trailing_max_concurrency)
+        async with self._update_slots:
+            return await self._check_sl(symbol, desired_sl, is_long, current_price, open_orders)
+
+    async def _check_sl(
+        self, symbol: str, desired_sl: float, is_long: bool, current_price: float,
+        open_orders: Optional[List[Dict[str, Any]]],
+    ) -> Optional[float]:
         try:
-            # Fetch existing SL via open orders to compare and enforce monotonic move
-            open_orders = await self.exchange.get_open_orders(symbol)
-            current_sl: Optional[float] = None
-            current_tp: Optional[float] = None
-            for o in open_orders or []:
-                params = o.get('info') or {}
-                # Identify SL
-                sl_val = params.get('stopPrice') or params.get('stopLossPrice')
-                if sl_val:
-                    try:
-                        current_sl = float(sl_val)
-                    except Exception:
-                        current_sl = None
-                # Identify TP (may be set via takeProfitPrice)
-                tp_val = params.get('takeProfitPrice')
-                if tp_val and current_tp is None:
-                    try:
-                        current_tp = float(tp_val)
-                    except Exception:
-                        current_tp = None
+            known = self._known_stops(symbol)
+            if known is not None:
+                current_sl, current_tp = known
+            else:
+                if open_orders is None:
+                    open_orders = await self.exchange.get_open_orders(symbol)
+                current_sl, current_tp = _scan_stops(open_orders)
+                self._last_sl[symbol] = (current_sl, current_tp, time.monotonic())
             logger.info(
-                f"[Trailing] {symbol} | price={current_price:.6f} | current_sl={current_sl} | "
-                f"current_tp={current_tp} | desired_sl={desired_sl:.6f}"
+                "[Trailing] {} | price={:.6f} | current_sl={} | current_tp={} | desired_sl={:.6f}",
+                symbol, current_price, current_sl, current_tp, desired_sl,
             )
             # Step gating
             step = self.config.trailing_update_step_percent
             if current_sl is not None:
+                # Move only up for longs, only down for shorts (SL above price), and only
+                # if improved by step
                 if is_long:
-                    # Move only up and if improved by step
-                    if desired_sl <= current_sl * (1 + step):
-                        logger.info(
-                            f"[Trailing] {symbol} decision=keep | reason=step_too_small | "
-                            f"desired_sl={desired_sl:.6f} <= current_sl*step={current_sl*(1+step):.6f}"
-                        )
-                        return
+                    threshold = current_sl * (1.0 + step)
+                    improved = desired_sl > threshold
                 else:
-                    # Move only down and if improved by step (for shorts SL is above price, so lower is improvement)
-                    if desired_sl >= current_sl * (1 - step):
-                        logger.info(
-                            f"[Trailing] {symbol} decision=keep | reason=step_too_small | "
-                            f"desired_sl={desired_sl:.6f} >= current_sl*step={current_sl*(1-step):.6f}"
-                        )
-                        return
-            # Apply update
-            ok = await self.exchange.update_stop_loss(symbol, desired_sl)
-            if not ok:
-                logger.warning(f"[Trailing] {symbol} decision=update_failed | desired_sl={desired_sl:.6f}")
-            else:
-                logger.info(f"[Trailing] {symbol} decision=updated_sl | new_sl={desired_sl:.6f}")
+                    threshold = current_sl * (1.0 - step)
+                    improved = desired_sl < threshold
+                if not improved:
+                    logger.info(
+                        "[Trailing] {} decision=keep | reason=step_too_small | "
+                        "desired_sl={:.6f} {} current_sl*step={:.6f}",
+                        symbol, desired_sl, '<=' if is_long else '>=', threshold,
+                    )
+                    return None
+            return desired_sl
         except Exception as e:
             logger.error(f"_maybe_update_sl error for {symbol}: {e}")
+            # Don't gate the next tick on a value that may no longer match the exchange
+            self._last_sl.pop(symbol, None)
+            return None
+
+    async def _apply_sl_updates(self, pending: Dict[str, float]) -> None:
+        """Move every due SL in one exchange batch and record the outcome per symbol."""
+        try:
+            results = await self.exchange.bulk_update_stop_loss(pending)
+        except Exception as e:
+            logger.error(f"_apply_sl_updates error: {e}")
+            results = {}
+        for symbol, desired_sl in pending.items():
+            if not results.get(symbol):
+                logger.warning(f"[Trailing] {symbol} decision=update_failed | desired_sl={desired_sl:.6f}")
+                # State on the exchange is unknown now; rescan next tick
+                self._last_sl.pop(symbol, None)
+            else:
+                logger.info("[Trailing] {} decision=updated_sl | new_sl={:.6f}", symbol, desired_sl)
+                known = self._last_sl.get(symbol)
+                self._last_sl[symbol] = (desired_sl, known[1] if known else None, time.monotonic())
 